@@ -13,6 +13,9 @@ HOURS_IN_DAY = 24
 HOUR_INDEX_MIN = 0
 HOUR_INDEX_MAX = 23
 
+QUARTERS_IN_YEAR = 4
+ISO_WEEKS_MAX = 53
+
 # Figure dimensions
 FIGURE_WIDTH_LARGE = 12
 FIGURE_WIDTH_STANDARD = 10
@@ -22,12 +25,23 @@ FIGURE_SIZE_SQUARE = 6
 # Output settings
 SAVE_DPI_HIGH = 300
 SAVE_DPI_STANDARD = 150
+SAVE_DPI_WEB = 100
+SAVE_DPI_THUMBNAIL = 50
 PIE_START_ANGLE = 90
 GRID_ALPHA = 0.7
 XLABEL_ROTATION = 45
 
+# Churn charts
+CHURN_ADDED_COLOR = '#59a14f'
+CHURN_REMOVED_COLOR = '#e15759'
+CHURN_TOP_N = 15
+HEATMAP_CMAP = 'YlOrRd'
+
 # WordCloud settings
 WORDCLOUD_WIDTH = 1200
 WORDCLOUD_HEIGHT = 600
 WORDCLOUD_MAX_FONT_SIZE = 120
 WORDCLOUD_PREFER_HORIZONTAL = 0.7
+
+# Commit distribution buckets (commits per day); None marks an open upper bound
+COMMIT_BUCKETS = ((1, 5), (6, 10), (11, 15), (16, 20), (21, 25), (26, 30), (31, None))
@@ -0,0 +1,382 @@
+"""Per-author and per-directory line churn from one streamed ``git log --numstat``.
+
+Every file change row (lines added and removed in one file by one commit)
+is buffered in compact integer arrays and folded, ``CHUNK_ROWS`` rows at a
+time, into lines added/removed per (author, top-level directory) and per
+calendar month. Memory is bounded by the number of authors, directories
+and months, never by the number of rows, so histories with millions of
+file changes stream through in constant space.
+
+Rename detection is off by default: it makes git compare deleted and added
+files for every commit, which can dominate the scan. Without it a renamed
+file counts as all of its lines removed from the old path and added to the
+new one.
+"""
+import argparse
+import logging
+import subprocess
+import sys
+from array import array
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from git_log import FIELD_SEPARATOR, LOG_DATE_OPTION, parse_tz_offset
+from time_buckets import TZ_AUTHOR, epoch_days, local_seconds, parse_time_zone
+
+logger = logging.getLogger(__name__)
+
+RECORD_SEPARATOR = '\x1e'
+# record separator, author epoch, author tz offset (+HHMM), author name
+NUMSTAT_FORMAT = '%x1e%at%x1f%ad%x1f%an'
+RENAME_ARROW = ' => '
+# Bucket for files at the top of the repository
+ROOT_DIRECTORY = '.'
+# File change rows buffered before they are folded into the totals
+CHUNK_ROWS = 1 << 16
+
+
+class CommitChanges(NamedTuple):
+    """One commit's file changes as read from ``git log --numstat``.
+
+    Attributes:
+        timestamp: Author time in seconds since the Unix epoch
+        tz_offset: Author time zone offset from UTC in minutes
+        author: Author name
+        changes: (lines added, lines removed, path) per file; binary files
+            count as zero lines
+    """
+    timestamp: int
+    tz_offset: int
+    author: str
+    changes: list[tuple[int, int, str]]
+
+
+def renamed_path(path: str) -> str:
+    """Return the new path of a numstat rename such as ``src/{a => b}/f.py``."""
+    if RENAME_ARROW not in path:
+        return path
+    if '{' in path:
+        prefix, rest = path.split('{', 1)
+        inner, suffix = rest.split('}', 1)
+        # "{ => sub}/f" and "{sub => }/f" leave a doubled or leading slash
+        return (prefix + inner.split(RENAME_ARROW, 1)[1] + suffix).replace('//', '/').lstrip('/')
+    return path.split(RENAME_ARROW, 1)[1]
+
+
+def top_directory(path: str) -> str:
+    """Return the first path component, or ``ROOT_DIRECTORY`` for top-level files."""
+    head, sep, _ = path.lstrip('"').partition('/')
+    return head if sep else ROOT_DIRECTORY
+
+
+def iter_numstat(
+    repo_path: str = '.',
+    revisions: Sequence[str] = (),
+    renames: bool = False
+) -> Iterator[CommitChanges]:
+    """Stream commits with their per-file line counts from ``git log --numstat``.
+
+    Merge commits have no numstat rows and are skipped.
+
+    Args:
+        repo_path: Path to the git repository
+        revisions: Revision arguments (defaults to HEAD)
+        renames: Detect renames so a moved file counts only its edited lines
+
+    Raises:
+        subprocess.CalledProcessError: If git exits with an error
+    """
+    cmd = [
+        'git', '-C', str(repo_path), '-c', 'core.quotePath=false', 'log', '--numstat',
+        f'--format={NUMSTAT_FORMAT}', LOG_DATE_OPTION, '-M' if renames else '--no-renames',
+        *revisions, '--'
+    ]
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        text=True, encoding='utf-8', errors='replace'
+    )
+    try:
+        commit = None
+        for line in proc.stdout:
+            if line.startswith(RECORD_SEPARATOR):
+                if commit is not None and commit.changes:
+                    yield commit
+                commit = None
+                parts = line[1:].rstrip('\n').split(FIELD_SEPARATOR, 2)
+                if len(parts) == 3:
+                    try:
+                        commit = CommitChanges(int(parts[0]), parse_tz_offset(parts[1]), parts[2], [])
+                    except ValueError:
+                        pass
+                continue
+            fields = line.rstrip('\n').split('\t', 2)
+            if commit is None or len(fields) != 3:
+                continue
+            added, removed, path = fields
+            commit.changes.append((
+                int(added) if added != '-' else 0,
+                int(removed) if removed != '-' else 0,
+                renamed_path(path) if renames else path
+            ))
+        if commit is not None and commit.changes:
+            yield commit
+        stderr = proc.stderr.read()
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        proc.stderr.close()
+
+
+def _months(timestamps: np.ndarray, tz_offsets: np.ndarray, tz: str | int) -> np.ndarray:
+    """Months since January 1970 in time zone ``tz``."""
+    days = epoch_days(local_seconds(timestamps, tz_offsets, tz))
+    return days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+
+
+def _grow(matrix: np.ndarray, shape: tuple[int, ...]) -> np.ndarray:
+    """Zero-pad ``matrix`` up to ``shape``."""
+    return np.pad(matrix, [(0, new - old) for old, new in zip(matrix.shape, shape)])
+
+
+def _add_sparse(
+    keys: np.ndarray, totals: np.ndarray, new_keys: np.ndarray, new_totals: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Add rows of ``new_totals`` keyed by sorted ``new_keys`` into sorted ``keys``."""
+    merged = np.union1d(keys, new_keys)
+    result = np.zeros((len(merged), *totals.shape[1:]), dtype=np.int64)
+    np.add.at(result, np.searchsorted(merged, keys), totals)
+    np.add.at(result, np.searchsorted(merged, new_keys), new_totals)
+    return merged, result
+
+
+@dataclass
+class ChurnStats:
+    """Lines added and removed per author, top-level directory and month.
+
+    Attributes:
+        authors: Author names, in order of first appearance
+        directories: Top-level directories, in order of first appearance
+        commits: Commits with file changes per author
+        churn: Lines (added, removed) with shape (2, len(authors), len(directories))
+        months: Sorted months since January 1970 with changes
+        month_churn: Lines (added, removed) per entry of ``months``, shape (len(months), 2)
+    """
+    authors: list[str]
+    directories: list[str]
+    commits: np.ndarray
+    churn: np.ndarray
+    months: np.ndarray
+    month_churn: np.ndarray
+
+    @property
+    def by_author(self) -> np.ndarray:
+        """Lines (added, removed) per author, shape (len(authors), 2)."""
+        return self.churn.sum(axis=2).T
+
+    @property
+    def by_directory(self) -> np.ndarray:
+        """Lines (added, removed) per directory, shape (len(directories), 2)."""
+        return self.churn.sum(axis=1).T
+
+    @property
+    def total(self) -> np.ndarray:
+        """Total lines (added, removed)."""
+        return self.churn.sum(axis=(1, 2))
+
+    def top(self, axis: str, n: int) -> np.ndarray:
+        """Indices of the ``n`` authors or directories with the most lines changed.
+
+        Args:
+            axis: "authors" or "directories"
+            n: Number of entries to return
+        """
+        totals = (self.by_author if axis == 'authors' else self.by_directory).sum(axis=1)
+        return np.argsort(-totals, kind='stable')[:n]
+
+    def month_labels(self) -> list[str]:
+        """``months`` formatted as YYYY-MM."""
+        return [str(month) for month in self.months.astype('datetime64[M]')]
+
+    def merge(self, other: 'ChurnStats') -> 'ChurnStats':
+        """Combine two sets of churn, matching authors and directories by name."""
+        author_ids = {name: i for i, name in enumerate(self.authors)}
+        directory_ids = {name: i for i, name in enumerate(self.directories)}
+        for name in other.authors:
+            author_ids.setdefault(name, len(author_ids))
+        for name in other.directories:
+            directory_ids.setdefault(name, len(directory_ids))
+        authors, directories = list(author_ids), list(directory_ids)
+        author_rows = np.array([author_ids[name] for name in other.authors], dtype=np.intp)
+        directory_cols = np.array([directory_ids[name] for name in other.directories], dtype=np.intp)
+
+        churn = _grow(self.churn, (2, len(authors), len(directories)))
+        churn[np.ix_([0, 1], author_rows, directory_cols)] += other.churn
+        commits = _grow(self.commits, (len(authors),))
+        commits[author_rows] += other.commits
+        months, month_churn = _add_sparse(self.months, self.month_churn, other.months, other.month_churn)
+        return ChurnStats(authors, directories, commits, churn, months, month_churn)
+
+
+class ChurnAggregator:
+    """Fold file change rows into ``ChurnStats`` in fixed-size chunks."""
+
+    def __init__(self, tz: str | int = TZ_AUTHOR) -> None:
+        self.tz = tz
+        self._author_ids: dict[str, int] = {}
+        self._directory_ids: dict[str, int] = {}
+        self._commits = array('q')
+        self._churn = np.zeros((2, 0, 0), dtype=np.int64)
+        self._months = np.zeros(0, dtype=np.int64)
+        self._month_churn = np.zeros((0, 2), dtype=np.int64)
+        self._rows = {
+            'author': array('I'), 'directory': array('I'), 'timestamp': array('q'),
+            'tz_offset': array('i'), 'added': array('q'), 'removed': array('q'),
+        }
+
+    def add(self, commit: CommitChanges) -> None:
+        """Count one commit's file changes."""
+        author = self._author_ids.get(commit.author)
+        if author is None:
+            author = self._author_ids[commit.author] = len(self._author_ids)
+            self._commits.append(0)
+        self._commits[author] += 1
+        rows = self._rows
+        for added, removed, path in commit.changes:
+            directory = top_directory(path)
+            directory_id = self._directory_ids.get(directory)
+            if directory_id is None:
+                directory_id = self._directory_ids[directory] = len(self._directory_ids)
+            rows['author'].append(author)
+            rows['directory'].append(directory_id)
+            rows['timestamp'].append(commit.timestamp)
+            rows['tz_offset'].append(commit.tz_offset)
+            rows['added'].append(added)
+            rows['removed'].append(removed)
+        if len(rows['author']) >= CHUNK_ROWS:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Fold the buffered rows into the totals and empty the buffers."""
+        rows = {name: np.frombuffer(values, dtype=values.typecode) for name, values in self._rows.items()}
+        if len(rows['author']):
+            shape = (len(self._author_ids), len(self._directory_ids))
+            self._churn = _grow(self._churn, (2, *shape))
+            cells = rows['author'].astype(np.int64) * shape[1] + rows['directory']
+            month_keys, month_rows = np.unique(
+                _months(rows['timestamp'], rows['tz_offset'], self.tz), return_inverse=True
+            )
+            month_churn = np.zeros((len(month_keys), 2), dtype=np.int64)
+            for i, name in enumerate(('added', 'removed')):
+                # Integer weights: np.add.at keeps exact int64 sums
+                np.add.at(self._churn[i].reshape(-1), cells, rows[name])
+                np.add.at(month_churn[:, i], month_rows, rows[name])
+            self._months, self._month_churn = _add_sparse(
+                self._months, self._month_churn, month_keys, month_churn
+            )
+        del rows
+        for values in self._rows.values():
+            del values[:]
+
+    def result(self) -> ChurnStats:
+        """Return the aggregated churn."""
+        self._flush()
+        return ChurnStats(
+            authors=list(self._author_ids),
+            directories=list(self._directory_ids),
+            commits=np.array(self._commits, dtype=np.int64),
+            churn=_grow(self._churn, (2, len(self._author_ids), len(self._directory_ids))),
+            months=self._months,
+            month_churn=self._month_churn
+        )
+
+
+def aggregate_churn(
+    repo_path: str = '.',
+    revisions: Sequence[str] = (),
+    renames: bool = False,
+    tz: str | int = TZ_AUTHOR
+) -> ChurnStats:
+    """Aggregate line churn by streaming ``git log --numstat`` in a single pass.
+
+    Args:
+        repo_path: Path to the git repository
+        revisions: Revision arguments passed to ``git log`` (defaults to HEAD)
+        renames: Enable rename detection (slower; see the module docstring)
+        tz: Time zone months are counted in (see ``time_buckets.local_seconds``)
+
+    Raises:
+        subprocess.CalledProcessError: If git exits with an error
+    """
+    aggregator = ChurnAggregator(tz)
+    for commit in iter_numstat(repo_path, revisions, renames):
+        aggregator.add(commit)
+    return aggregator.result()
+
+
+def write_churn_files(stats: ChurnStats, output_dir: str = '.') -> None:
+    """Write tab-separated churn tables.
+
+    ``churn_by_author.txt`` ("author added removed commits"),
+    ``churn_by_directory.txt`` ("directory added removed") and
+    ``churn_by_month.txt`` ("YYYY-MM added removed"), largest first except
+    for months, which are chronological.
+    """
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    by_author = stats.by_author
+    with open(out / 'churn_by_author.txt', 'w') as f:
+        f.writelines(
+            f"{stats.authors[i]}\t{by_author[i, 0]}\t{by_author[i, 1]}\t{stats.commits[i]}\n"
+            for i in stats.top('authors', len(stats.authors))
+        )
+    by_directory = stats.by_directory
+    with open(out / 'churn_by_directory.txt', 'w') as f:
+        f.writelines(
+            f"{stats.directories[i]}\t{by_directory[i, 0]}\t{by_directory[i, 1]}\n"
+            for i in stats.top('directories', len(stats.directories))
+        )
+    with open(out / 'churn_by_month.txt', 'w') as f:
+        f.writelines(
+            f"{label}\t{added}\t{removed}\n"
+            for label, (added, removed) in zip(stats.month_labels(), stats.month_churn)
+        )
+
+
+def main() -> int:
+    """Aggregate churn for a repository and write the churn tables."""
+    parser = argparse.ArgumentParser(description='Aggregate line churn per author, directory and month')
+    parser.add_argument('--repo', default='.', help='Path to the git repository (default: .)')
+    parser.add_argument('--output-dir', default='.', help='Directory for the churn tables')
+    parser.add_argument('--renames', action='store_true',
+                        help='Detect renames (slower); otherwise a move counts as delete plus add')
+    parser.add_argument('--tz', type=parse_time_zone, default=TZ_AUTHOR,
+                        help="Time zone to count months in: 'author' (default), 'utc' or +HHMM")
+    parser.add_argument('revisions', nargs='*', help='Revisions to scan (default: HEAD)')
+    args = parser.parse_args()
+
+    try:
+        stats = aggregate_churn(args.repo, args.revisions, args.renames, args.tz)
+    except subprocess.CalledProcessError as e:
+        logger.error("git log failed: %s", (e.stderr or '').strip())
+        return 1
+
+    write_churn_files(stats, args.output_dir)
+    added, removed = stats.total
+    logger.info(
+        "%d lines added and %d removed by %d authors in %d directories",
+        added, removed, len(stats.authors), len(stats.directories)
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
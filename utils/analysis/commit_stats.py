@@ -0,0 +1,425 @@
+"""Single-pass commit aggregation engine.
+
+Replaces the per-chart shell pipelines (commits_by_hour.sh,
+commits_by_day_of_week.sh, commits_by_month.sh, average_commits.sh,
+commit_distribution.sh) with one scan of the log that fills every histogram
+at the same time. Commits are streamed straight from ``git log`` (see
+git_log.py); legacy logs.txt dumps are still accepted. Commit times are
+collected as epoch seconds plus UTC offsets and binned in one vectorized
+step (see time_buckets.py), in the author's, UTC or a fixed time zone.
+``aggregate_repo_parallel`` splits one large history into disjoint commit
+ranges and scans them in separate ``git log`` processes.
+"""
+import argparse
+import logging
+import os
+import subprocess
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'config'))
+
+logger = logging.getLogger(__name__)
+from constants import HOURS_IN_DAY, DAYS_IN_WEEK, MONTHS_IN_YEAR, COMMIT_BUCKETS
+from git_log import iter_commits, partition_revisions
+from time_buckets import (
+    BUCKET_SCHEMES, TZ_AUTHOR, count_buckets, day_hour_counts, day_of_week,
+    local_seconds, month_of_year, parse_time_zone, rolling_counts, scheme_counts
+)
+
+LOG_DATE_PREFIX = 'Date:'
+LOG_DATE_FORMAT = '%a %b %d %H:%M:%S %Y %z'
+UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# Extra bucket schemes written by --buckets, beyond the legacy count files
+EXTRA_SCHEMES = ('quarter', 'week_of_year', 'hour_weekday')
+
+
+def _bucket_label(low: int, high: int | None) -> str:
+    """Format a commit bucket as "1-5" or "31+"."""
+    return f"{low}+" if high is None else f"{low}-{high}"
+
+
+@dataclass
+class CommitStats:
+    """Commit counts per calendar day and hour of day.
+
+    Every chart histogram is derived from this sparse day x hour matrix, so
+    stats from separate scans can be merged without losing information.
+
+    Attributes:
+        days: Sorted proleptic Gregorian ordinals of days with commits.
+        day_hour: Commit counts with shape (len(days), 24).
+    """
+    days: np.ndarray
+    day_hour: np.ndarray
+
+    @classmethod
+    def empty(cls) -> 'CommitStats':
+        """Return stats for a repository with no commits."""
+        return cls(
+            days=np.zeros(0, dtype=np.int64),
+            day_hour=np.zeros((0, HOURS_IN_DAY), dtype=np.int64)
+        )
+
+    @classmethod
+    def from_epochs(
+        cls,
+        timestamps: np.ndarray,
+        tz_offsets: np.ndarray,
+        tz: str | int = TZ_AUTHOR
+    ) -> 'CommitStats':
+        """Bin raw commit times into stats without a per-commit Python loop.
+
+        Args:
+            timestamps: Author times in seconds since the Unix epoch
+            tz_offsets: Author UTC offsets in minutes
+            tz: Time zone the days and hours are counted in (see
+                ``time_buckets.local_seconds``)
+        """
+        days, day_hour = day_hour_counts(local_seconds(timestamps, tz_offsets, tz))
+        return cls(days=days + UNIX_EPOCH_ORDINAL, day_hour=day_hour)
+
+    @property
+    def total_commits(self) -> int:
+        """Total number of commits counted."""
+        return int(self.day_hour.sum())
+
+    @property
+    def by_hour(self) -> np.ndarray:
+        """Commit counts indexed by hour of day (0-23)."""
+        return self.day_hour.sum(axis=0)
+
+    @property
+    def per_day(self) -> np.ndarray:
+        """Commit counts for each entry in ``days``."""
+        return self.day_hour.sum(axis=1)
+
+    @property
+    def by_weekday(self) -> np.ndarray:
+        """Commit counts indexed by day of week (0: Sun, ..., 6: Sat)."""
+        return count_buckets(
+            day_of_week(self.days - UNIX_EPOCH_ORDINAL), DAYS_IN_WEEK, self.per_day
+        )
+
+    @property
+    def by_month(self) -> np.ndarray:
+        """Commit counts indexed by month (0: Jan, ..., 11: Dec)."""
+        return count_buckets(
+            month_of_year(self.days - UNIX_EPOCH_ORDINAL), MONTHS_IN_YEAR, self.per_day
+        )
+
+    def buckets(self, scheme: str) -> np.ndarray:
+        """Commit counts for any ``time_buckets.BUCKET_SCHEMES`` scheme.
+
+        Every (day, hour) cell is binned once, weighted by its count, so
+        schemes such as "quarter", "week_of_year" and "hour_weekday" work on
+        merged and cached stats as well as on fresh scans.
+
+        Raises:
+            KeyError: If ``scheme`` is unknown
+        """
+        return scheme_counts(self.days - UNIX_EPOCH_ORDINAL, self.day_hour, scheme)
+
+    def rolling(self, window: int) -> tuple[int, np.ndarray]:
+        """Commits in a trailing ``window``-day window for every calendar day.
+
+        Returns:
+            Tuple of (ordinal of the first day, rolling sums per consecutive day).
+        """
+        first, counts = rolling_counts(self.days - UNIX_EPOCH_ORDINAL, window, self.per_day)
+        return first + UNIX_EPOCH_ORDINAL, counts
+
+    @property
+    def avg_by_hour(self) -> np.ndarray:
+        """Average commits per hour over the days with a commit in that hour."""
+        active_days = np.count_nonzero(self.day_hour, axis=0)
+        return self.by_hour / np.maximum(active_days, 1)
+
+    def bucket_distribution(self) -> tuple[list[str], list[int]]:
+        """Count days by number of commits using ``COMMIT_BUCKETS``.
+
+        Returns:
+            Tuple of (categories, days) for the non-empty buckets, in the
+            format accepted by ``plot_avg_commits.plot_bar_chart``.
+        """
+        per_day = self.per_day
+        categories: list[str] = []
+        days: list[int] = []
+        for low, high in COMMIT_BUCKETS:
+            in_bucket = per_day >= low if high is None else (per_day >= low) & (per_day <= high)
+            count = int(np.count_nonzero(in_bucket))
+            if count:
+                categories.append(_bucket_label(low, high))
+                days.append(count)
+        return categories, days
+
+    def merge(self, other: 'CommitStats') -> 'CommitStats':
+        """Combine two sets of stats into a new one."""
+        days = np.union1d(self.days, other.days)
+        day_hour = np.zeros((len(days), HOURS_IN_DAY), dtype=np.int64)
+        np.add.at(day_hour, np.searchsorted(days, self.days), self.day_hour)
+        np.add.at(day_hour, np.searchsorted(days, other.days), other.day_hour)
+        return CommitStats(days=days, day_hour=day_hour)
+
+
+class CommitAggregator:
+    """Collect commit times in one pass, then bin them into a ``CommitStats``.
+
+    Times are buffered as compact integer arrays and binned in a single
+    vectorized step by ``result``.
+    """
+
+    def __init__(self, tz: str | int = TZ_AUTHOR) -> None:
+        self.tz = tz
+        self._timestamps = array('q')
+        self._offsets = array('i')
+
+    def add(self, when: datetime) -> None:
+        """Count one commit at the given time.
+
+        Naive datetimes are taken as wall-clock time with a zero UTC offset.
+        """
+        offset = when.utcoffset()
+        if offset is None:
+            self.add_epoch(int(when.replace(tzinfo=timezone.utc).timestamp()), 0)
+        else:
+            self.add_epoch(int(when.timestamp()), offset // timedelta(minutes=1))
+
+    def add_epoch(self, timestamp: int, tz_offset: int) -> None:
+        """Count one commit at ``timestamp`` (epoch seconds) with a UTC offset in minutes."""
+        self._timestamps.append(timestamp)
+        self._offsets.append(tz_offset)
+
+    def result(self) -> CommitStats:
+        """Return the aggregated stats."""
+        return CommitStats.from_epochs(
+            np.frombuffer(self._timestamps, dtype=np.int64),
+            np.frombuffer(self._offsets, dtype=np.intc),
+            self.tz
+        )
+
+
+def iter_log_dates(filepath: str) -> Iterator[datetime]:
+    """Yield commit dates from the ``Date:`` lines of a ``git log`` dump.
+
+    Args:
+        filepath: Path to the log file written by commit_history.sh.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+    """
+    with open(filepath, 'r') as f:
+        for line in f:
+            if not line.startswith(LOG_DATE_PREFIX):
+                continue
+            try:
+                yield datetime.strptime(line[len(LOG_DATE_PREFIX):].strip(), LOG_DATE_FORMAT)
+            except ValueError:
+                logger.warning("Skipping unparseable date line: %s", line.strip())
+
+
+def aggregate_commits(dates: Iterable[datetime], tz: str | int = TZ_AUTHOR) -> CommitStats:
+    """Aggregate commit dates into a ``CommitStats`` counted in time zone ``tz``."""
+    aggregator = CommitAggregator(tz)
+    for when in dates:
+        aggregator.add(when)
+    return aggregator.result()
+
+
+def aggregate_repo(
+    repo_path: str = '.',
+    revisions: Sequence[str] = (),
+    tz: str | int = TZ_AUTHOR
+) -> CommitStats:
+    """Aggregate every histogram by streaming ``git log`` in a single pass.
+
+    Args:
+        repo_path: Path to the git repository
+        revisions: Revision arguments passed to ``git log`` (defaults to HEAD)
+        tz: Time zone mode (see ``time_buckets.local_seconds``)
+
+    Raises:
+        subprocess.CalledProcessError: If git exits with an error
+    """
+    aggregator = CommitAggregator(tz)
+    for record in iter_commits(repo_path, revisions):
+        aggregator.add_epoch(record.timestamp, record.tz_offset)
+    return aggregator.result()
+
+
+def aggregate_repo_parallel(
+    repo_path: str = '.',
+    jobs: int | None = None,
+    revision: str = 'HEAD',
+    tz: str | int = TZ_AUTHOR
+) -> CommitStats:
+    """Aggregate the history of ``revision`` with ``jobs`` concurrent scans.
+
+    ``git log`` walks history on one core, so the history is split into
+    disjoint ranges along the first-parent chain (see
+    ``git_log.partition_revisions``), each range is streamed and binned in
+    its own process and the partial stats are merged. Every commit is
+    counted exactly once, and the result equals ``aggregate_repo``'s.
+
+    Args:
+        repo_path: Path to the git repository
+        jobs: Concurrent scans (default: CPU count); 1 scans serially
+        revision: Tip commit whose history is aggregated
+        tz: Time zone mode (see ``time_buckets.local_seconds``)
+
+    Raises:
+        subprocess.CalledProcessError: If git exits with an error
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs < 2:
+        return aggregate_repo(repo_path, [revision], tz)
+    ranges = partition_revisions(repo_path, jobs, revision)
+    with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+        partials = pool.map(
+            aggregate_repo, [repo_path] * len(ranges), ranges, [tz] * len(ranges)
+        )
+        stats = CommitStats.empty()
+        for partial in partials:
+            stats = stats.merge(partial)
+    return stats
+
+
+def aggregate_repo_messages(
+    repo_path: str = '.',
+    revisions: Sequence[str] = (),
+    tz: str | int = TZ_AUTHOR
+) -> tuple[CommitStats, str]:
+    """Aggregate every histogram and collect commit subjects in the same pass.
+
+    Returns:
+        Tuple of (stats, newline-separated commit subjects).
+
+    Raises:
+        subprocess.CalledProcessError: If git exits with an error
+    """
+    aggregator = CommitAggregator(tz)
+    subjects: list[str] = []
+    for record in iter_commits(repo_path, revisions):
+        aggregator.add_epoch(record.timestamp, record.tz_offset)
+        subjects.append(record.subject)
+    return aggregator.result(), '\n'.join(subjects)
+
+
+def aggregate_log_file(filepath: str = 'logs.txt', tz: str | int = TZ_AUTHOR) -> CommitStats:
+    """Aggregate every histogram from a ``git log`` dump in a single pass.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+    """
+    return aggregate_commits(iter_log_dates(filepath), tz)
+
+
+def write_count_files(stats: CommitStats, output_dir: str = '.') -> None:
+    """Write the count files previously produced by the shell scripts.
+
+    Args:
+        stats: Aggregated commit stats
+        output_dir: Directory to write commit_counts*.txt and average_commits.txt
+    """
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    with open(out / 'commit_counts.txt', 'w') as f:
+        f.writelines(f"{h:02d} {c}\n" for h, c in enumerate(stats.by_hour))
+    with open(out / 'commit_counts_day.txt', 'w') as f:
+        f.writelines(f"{d} {c}\n" for d, c in enumerate(stats.by_weekday))
+    with open(out / 'commit_counts_month.txt', 'w') as f:
+        f.writelines(f"{m} {c}\n" for m, c in enumerate(stats.by_month, start=1))
+    categories, days = stats.bucket_distribution()
+    with open(out / 'average_commits.txt', 'w') as f:
+        f.writelines(f"Commits {cat}: {n} days\n" for cat, n in zip(categories, days))
+
+
+def write_bucket_files(
+    stats: CommitStats,
+    schemes: Sequence[str] = EXTRA_SCHEMES,
+    output_dir: str = '.',
+    rolling_window: int | None = None
+) -> None:
+    """Write count files for additional bucket schemes.
+
+    One-dimensional schemes go to ``commit_counts_<scheme>.txt`` as
+    "index count" lines (weeks numbered from 1, the rest from 0);
+    "hour_weekday" writes "weekday hour count" lines. A rolling window
+    writes ``commit_counts_rolling_<N>d.txt`` as "YYYY-MM-DD count" lines.
+
+    Args:
+        stats: Aggregated commit stats
+        schemes: ``time_buckets.BUCKET_SCHEMES`` names
+        output_dir: Directory to write the files to
+        rolling_window: Trailing window in days; no rolling file if None
+    """
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    for scheme in schemes:
+        counts = stats.buckets(scheme)
+        with open(out / f'commit_counts_{scheme}.txt', 'w') as f:
+            if counts.ndim == 2:
+                f.writelines(
+                    f"{d} {h:02d} {c}\n" for (d, h), c in np.ndenumerate(counts)
+                )
+            else:
+                start = 1 if scheme == 'week_of_year' else 0
+                f.writelines(f"{i} {c}\n" for i, c in enumerate(counts, start=start))
+    if rolling_window is not None:
+        first, counts = stats.rolling(rolling_window)
+        with open(out / f'commit_counts_rolling_{rolling_window}d.txt', 'w') as f:
+            f.writelines(
+                f"{date.fromordinal(first + i).isoformat()} {c}\n" for i, c in enumerate(counts)
+            )
+
+
+def main() -> int:
+    """Aggregate the git history and write all count files in one pass."""
+    parser = argparse.ArgumentParser(description='Aggregate commit histograms in a single pass')
+    parser.add_argument('--repo', default='.', help='Path to the git repository (default: .)')
+    parser.add_argument('--log', help='Read a legacy git log dump instead of streaming from git')
+    parser.add_argument('--output-dir', default='.', help='Directory for the count files')
+    parser.add_argument('--tz', type=parse_time_zone, default=TZ_AUTHOR,
+                        help="Time zone to count in: 'author' (each commit's own, default), "
+                             "'utc' or a fixed offset such as +0530")
+    parser.add_argument('--buckets', nargs='*', choices=list(BUCKET_SCHEMES),
+                        help=f"Also write these bucket schemes (default if given bare: {' '.join(EXTRA_SCHEMES)})")
+    parser.add_argument('--rolling', type=int, metavar='DAYS',
+                        help='Also write commit counts over a trailing window of DAYS days')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Scan the history in this many concurrent git processes '
+                             '(0: one per CPU; default: 1)')
+    args = parser.parse_args()
+
+    try:
+        if args.log:
+            stats = aggregate_log_file(args.log, args.tz)
+        elif args.jobs != 1:
+            stats = aggregate_repo_parallel(args.repo, args.jobs or None, tz=args.tz)
+        else:
+            stats = aggregate_repo(args.repo, tz=args.tz)
+    except FileNotFoundError:
+        logger.error("File not found: %s", args.log)
+        return 1
+    except subprocess.CalledProcessError as e:
+        logger.error("git log failed: %s", (e.stderr or '').strip())
+        return 1
+
+    write_count_files(stats, args.output_dir)
+    if args.buckets is not None or args.rolling is not None:
+        schemes = EXTRA_SCHEMES if args.buckets == [] else args.buckets or ()
+        write_bucket_files(stats, schemes, args.output_dir, args.rolling)
+    logger.info("Aggregated %d commits over %d days", stats.total_commits, len(stats.days))
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
@@ -0,0 +1,409 @@
+"""Columnar, memory-mapped store of commit metadata.
+
+Each repository's history is kept as one NumPy ``.npy`` file per column,
+oldest commit first:
+
+    timestamp.npy     uint32  author time, seconds since the Unix epoch
+    tz_offset.npy     int16   author UTC offset in minutes
+    author.npy        uint32  index into authors.json
+    subject_end.npy   uint64  end offset of the commit's subject in subjects.bin
+
+``subjects.bin`` holds the subjects as newline-terminated UTF-8, so the
+whole blob is the word cloud's input text. ``meta.json`` records the
+commit the store is current at and how many rows are valid.
+
+Columns open with ``mmap_mode='r'``: nothing is parsed and only the pages a
+query touches are read. Queries scan the columns in ``CHUNK_ROWS`` blocks,
+so their working memory does not grow with history length (mapped pages
+are file-backed and can be dropped by the OS at any time).
+
+New commits are appended in place: rows are written past the valid end,
+then the ``.npy`` headers (which NumPy pads so their shape can grow) and
+finally ``meta.json``. An interrupted update leaves rows beyond the
+recorded count, which readers ignore and the next update overwrites. If
+history was rewritten so that the stored commit is no longer an ancestor
+of HEAD, the store is rebuilt. Only one process should update a store at
+a time.
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from commit_stats import CommitStats
+from git_log import CommitRecord, iter_commits
+from stats_cache import get_head_sha, is_ancestor
+from time_buckets import TZ_AUTHOR, parse_time_zone
+
+logger = logging.getLogger(__name__)
+
+STORE_DIRNAME = 'commit-store'
+STORE_VERSION = 1
+META_FILENAME = 'meta.json'
+AUTHORS_FILENAME = 'authors.json'
+SUBJECTS_FILENAME = 'subjects.bin'
+# Column name -> (array typecode used while streaming, stored dtype)
+COLUMNS = {
+    'timestamp': ('I', np.dtype('<u4')),
+    'tz_offset': ('h', np.dtype('<i2')),
+    'author': ('I', np.dtype('<u4')),
+    'subject_end': ('Q', np.dtype('<u8')),
+}
+# Rows per block when appending and scanning
+CHUNK_ROWS = 1 << 20
+_TIMESTAMP_MAX = np.iinfo(np.uint32).max
+
+
+def default_store_path(repo_path: str = '.') -> Path:
+    """Return the store location inside the repository's git directory."""
+    result = subprocess.run(
+        ['git', '-C', str(repo_path), 'rev-parse', '--absolute-git-dir'],
+        capture_output=True, text=True
+    )
+    result.check_returncode()
+    return Path(result.stdout.strip()) / STORE_DIRNAME
+
+
+def _npy_header(dtype: np.dtype, rows: int) -> bytes:
+    """Encode the ``.npy`` header for a one-dimensional column."""
+    buffer = io.BytesIO()
+    np.lib.format.write_array_header_1_0(buffer, {
+        'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (rows,)
+    })
+    return buffer.getvalue()
+
+
+def _write_json(path: Path, value) -> None:
+    """Atomically replace ``path`` with ``value`` as JSON."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.json.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(value, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _read_json(path: Path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class CommitStore:
+    """Read-only view of a store directory.
+
+    Attributes:
+        path: Store directory
+        head: Commit the store is current at
+        timestamps: Author times (uint32 epoch seconds), oldest commit first
+        tz_offsets: Author UTC offsets in minutes (int16)
+        author_ids: Indices into ``authors`` (uint32)
+        subject_ends: End offsets of each subject in the subject blob (uint64)
+        authors: Author names in order of first appearance
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Memory-map the store at ``path``.
+
+        Raises:
+            FileNotFoundError: If there is no store at ``path``
+            ValueError: If the store was written by an incompatible version
+        """
+        self.path = Path(path)
+        meta = _read_json(self.path / META_FILENAME)
+        if meta.get('version') != STORE_VERSION:
+            raise ValueError(f"Unsupported commit store version {meta.get('version')!r}")
+        self.head: str = meta['head']
+        rows = meta['commits']
+        # Rows past the recorded count belong to an interrupted update
+        columns = {name: np.load(self.path / f'{name}.npy', mmap_mode='r')[:rows] for name in COLUMNS}
+        self.timestamps = columns['timestamp']
+        self.tz_offsets = columns['tz_offset']
+        self.author_ids = columns['author']
+        self.subject_ends = columns['subject_end']
+        self.authors: list[str] = _read_json(self.path / AUTHORS_FILENAME)
+        self._subject_bytes = meta['subject_bytes']
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def _blob(self) -> np.ndarray:
+        """Memory-map the valid part of the subject blob."""
+        if self._subject_bytes == 0:
+            return np.zeros(0, dtype=np.uint8)
+        return np.memmap(self.path / SUBJECTS_FILENAME, dtype=np.uint8, mode='r', shape=(self._subject_bytes,))
+
+    def _chunks(self, mask: np.ndarray | None) -> Iterator[tuple[slice, np.ndarray | None]]:
+        """Yield (row slice, mask for that slice) blocks of ``CHUNK_ROWS`` rows."""
+        for start in range(0, len(self), CHUNK_ROWS):
+            rows = slice(start, start + CHUNK_ROWS)
+            yield rows, None if mask is None else mask[rows]
+
+    def select(
+        self,
+        since: int | None = None,
+        until: int | None = None,
+        authors: Sequence[str] = ()
+    ) -> np.ndarray:
+        """Return a boolean row mask for commits matching every given filter.
+
+        Args:
+            since: Earliest author time (epoch seconds, inclusive)
+            until: Latest author time (epoch seconds, exclusive)
+            authors: Author names to keep; unknown names match nothing
+        """
+        wanted = set(authors)
+        ids = np.array([i for i, name in enumerate(self.authors) if name in wanted], dtype=np.uint32)
+        mask = np.ones(len(self), dtype=bool)
+        for rows, _ in self._chunks(None):
+            block = mask[rows]
+            if since is not None:
+                block &= self.timestamps[rows] >= since
+            if until is not None:
+                block &= self.timestamps[rows] < until
+            if authors:
+                block &= np.isin(self.author_ids[rows], ids)
+        return mask
+
+    def stats(self, mask: np.ndarray | None = None, tz: str | int = TZ_AUTHOR) -> CommitStats:
+        """Aggregate the selected commits into a ``CommitStats``.
+
+        Args:
+            mask: Row mask from ``select``; all commits if None
+            tz: Time zone mode (see ``time_buckets.local_seconds``)
+        """
+        stats = CommitStats.empty()
+        for rows, keep in self._chunks(mask):
+            timestamps, offsets = self.timestamps[rows], self.tz_offsets[rows]
+            if keep is not None:
+                timestamps, offsets = timestamps[keep], offsets[keep]
+            stats = stats.merge(CommitStats.from_epochs(timestamps, offsets, tz))
+        return stats
+
+    def author_counts(self, mask: np.ndarray | None = None) -> np.ndarray:
+        """Commits per author, indexed like ``authors``."""
+        counts = np.zeros(len(self.authors), dtype=np.int64)
+        for rows, keep in self._chunks(mask):
+            ids = self.author_ids[rows]
+            counts += np.bincount(ids if keep is None else ids[keep], minlength=len(self.authors))
+        return counts
+
+    def subject(self, row: int) -> str:
+        """Subject of the commit in ``row``."""
+        row = range(len(self))[row]
+        start = int(self.subject_ends[row - 1]) if row else 0
+        return bytes(self._blob()[start:int(self.subject_ends[row]) - 1]).decode('utf-8', errors='replace')
+
+    def subjects_text(self, mask: np.ndarray | None = None) -> str:
+        """Newline-separated subjects of the selected commits (for the word cloud)."""
+        blob = self._blob()
+        if mask is None:
+            return bytes(blob).decode('utf-8', errors='replace')
+        parts = []
+        for rows, keep in self._chunks(mask):
+            ends = self.subject_ends[rows].astype(np.int64)
+            starts = np.empty_like(ends)
+            starts[0] = self.subject_ends[rows.start - 1] if rows.start else 0
+            starts[1:] = ends[:-1]
+            parts.extend(bytes(blob[start:end]) for start, end in zip(starts[keep].tolist(), ends[keep].tolist()))
+        return b''.join(parts).decode('utf-8', errors='replace')
+
+
+def _create(path: Path) -> None:
+    """Create an empty store directory at ``path``."""
+    path.mkdir(parents=True)
+    for name, (_, dtype) in COLUMNS.items():
+        (path / f'{name}.npy').write_bytes(_npy_header(dtype, 0))
+    (path / SUBJECTS_FILENAME).touch()
+    _write_json(path / AUTHORS_FILENAME, [])
+    _write_json(path / META_FILENAME, {'version': STORE_VERSION, 'head': '', 'commits': 0, 'subject_bytes': 0})
+
+
+def append_commits(path: str | Path, records: Iterable[CommitRecord], head: str) -> int:
+    """Append commits, oldest first, to the store at ``path``.
+
+    Rows are streamed to disk in ``CHUNK_ROWS`` blocks, so memory use does
+    not depend on how many commits are added. Author times outside the
+    uint32 range are clamped.
+
+    Args:
+        path: Existing store directory
+        records: Commits in chronological (``git log --reverse``) order
+        head: Commit the store is current at afterwards
+
+    Returns:
+        Number of commits appended.
+    """
+    path = Path(path)
+    meta = _read_json(path / META_FILENAME)
+    authors: list[str] = _read_json(path / AUTHORS_FILENAME)
+    author_ids = {name: i for i, name in enumerate(authors)}
+    rows, subject_bytes = meta['commits'], meta['subject_bytes']
+
+    files = {}
+    try:
+        for name, (_, dtype) in COLUMNS.items():
+            f = files[name] = open(path / f'{name}.npy', 'r+b')
+            f.seek(len(_npy_header(dtype, rows)) + rows * dtype.itemsize)
+            f.truncate()
+        subjects = files[SUBJECTS_FILENAME] = open(path / SUBJECTS_FILENAME, 'r+b')
+        subjects.seek(subject_bytes)
+        subjects.truncate()
+
+        added = 0
+        buffers = {name: array(typecode) for name, (typecode, _) in COLUMNS.items()}
+        for record in records:
+            author = author_ids.get(record.author)
+            if author is None:
+                author = author_ids[record.author] = len(authors)
+                authors.append(record.author)
+            subject = record.subject.encode('utf-8', errors='replace') + b'\n'
+            subject_bytes += len(subject)
+            subjects.write(subject)
+            buffers['timestamp'].append(min(max(record.timestamp, 0), _TIMESTAMP_MAX))
+            buffers['tz_offset'].append(record.tz_offset)
+            buffers['author'].append(author)
+            buffers['subject_end'].append(subject_bytes)
+            added += 1
+            if len(buffers['timestamp']) == CHUNK_ROWS:
+                _flush(buffers, files)
+        _flush(buffers, files)
+
+        # Data first, then headers, then meta: readers trust meta's count
+        rows += added
+        for name, (_, dtype) in COLUMNS.items():
+            files[name].seek(0)
+            files[name].write(_npy_header(dtype, rows))
+    finally:
+        for f in files.values():
+            f.close()
+    _write_json(path / AUTHORS_FILENAME, authors)
+    _write_json(path / META_FILENAME, {
+        'version': STORE_VERSION, 'head': head, 'commits': rows, 'subject_bytes': subject_bytes
+    })
+    return added
+
+
+def _flush(buffers: dict[str, array], files: dict) -> None:
+    """Write buffered rows to the column files and empty the buffers."""
+    for name, (_, dtype) in COLUMNS.items():
+        files[name].write(np.frombuffer(buffers[name], dtype=buffers[name].typecode).astype(dtype).tobytes())
+        del buffers[name][:]
+
+
+def build_store(repo_path: str, path: str | Path, head: str) -> None:
+    """Write a fresh store for the history of ``head``, replacing any store at ``path``.
+
+    The new store is built beside the old one and swapped in when complete.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = Path(tempfile.mkdtemp(dir=path.parent, prefix=f'{path.name}.tmp-'))
+    try:
+        tmp_path.rmdir()
+        _create(tmp_path)
+        append_commits(tmp_path, iter_commits(repo_path, [head], ['--reverse']), head)
+        old_path = path.with_name(f'{tmp_path.name}.old')
+        if path.exists():
+            os.replace(path, old_path)
+        os.replace(tmp_path, path)
+        shutil.rmtree(old_path, ignore_errors=True)
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def load_store(
+    repo_path: str = '.',
+    store_path: str | Path | None = None,
+    rebuild: bool = False
+) -> CommitStore:
+    """Return an up-to-date store for HEAD, appending only new commits.
+
+    Args:
+        repo_path: Path to the git repository
+        store_path: Store directory (default: inside the git directory)
+        rebuild: Discard any existing store and rescan the full history
+
+    Raises:
+        subprocess.CalledProcessError: If git fails
+    """
+    head = get_head_sha(repo_path)
+    path = Path(store_path) if store_path else default_store_path(repo_path)
+    last_sha = None
+    if not rebuild:
+        try:
+            last_sha = _read_json(path / META_FILENAME)
+            last_sha = last_sha['head'] if last_sha.get('version') == STORE_VERSION else None
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable commit store %s: %s", path, e)
+            last_sha = None
+
+    if last_sha == head:
+        return CommitStore(path)
+    if last_sha and is_ancestor(repo_path, last_sha, head):
+        logger.info("Appending %s..%s to the commit store", last_sha[:12], head[:12])
+        append_commits(path, iter_commits(repo_path, [f'{last_sha}..{head}'], ['--reverse']), head)
+        return CommitStore(path)
+    if last_sha:
+        logger.info("Stored commit %s is not an ancestor of HEAD; rebuilding", last_sha[:12])
+    build_store(repo_path, path, head)
+    return CommitStore(path)
+
+
+def parse_date(value: str) -> int:
+    """Parse an ISO 8601 date or date-time (UTC unless it has an offset) into epoch seconds."""
+    when = datetime.fromisoformat(value)
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return int(when.timestamp())
+
+
+def main() -> int:
+    """Refresh a repository's commit store and summarize a query over it."""
+    parser = argparse.ArgumentParser(description='Update and query the columnar commit store')
+    parser.add_argument('--repo', default='.', help='Path to the git repository (default: .)')
+    parser.add_argument('--store', help=f'Store directory (default: <git-dir>/{STORE_DIRNAME})')
+    parser.add_argument('--rebuild', action='store_true', help='Rescan the full history')
+    parser.add_argument('--since', type=parse_date, help='Only commits at or after this date (ISO 8601)')
+    parser.add_argument('--until', type=parse_date, help='Only commits before this date (ISO 8601)')
+    parser.add_argument('--author', action='append', default=[], help='Only commits by this author (repeatable)')
+    parser.add_argument('--tz', type=parse_time_zone, default=TZ_AUTHOR,
+                        help="Time zone to count weekdays in: 'author' (default), 'utc' or +HHMM")
+    parser.add_argument('--top', type=int, default=10, help='Number of authors to list')
+    args = parser.parse_args()
+
+    try:
+        store = load_store(args.repo, args.store, rebuild=args.rebuild)
+    except subprocess.CalledProcessError as e:
+        logger.error("git failed: %s", (e.stderr or '').strip())
+        return 1
+
+    filtered = args.since is not None or args.until is not None or args.author
+    mask = store.select(args.since, args.until, args.author) if filtered else None
+    stats = store.stats(mask, args.tz)
+    logger.info("%d of %d commits selected", stats.total_commits, len(store))
+    logger.info("By weekday (Sun-Sat): %s", ' '.join(str(c) for c in stats.by_weekday))
+    counts = store.author_counts(mask)
+    for author in np.argsort(counts, kind='stable')[::-1][:args.top]:
+        if counts[author]:
+            logger.info("%8d  %s", counts[author], store.authors[author])
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""Multi-repository fleet analysis with parallel workers.
+
+Aggregates the commit history of many repositories in a process pool and
+produces per-repo and merged fleet-level histograms, plus a throughput
+report (commits/sec per worker).
+
+Usage:
+    python fleet.py '~/code/services/*' --workers 8 --output-dir fleet-report
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from commit_stats import CommitStats, aggregate_repo, write_count_files
+from repo_utils import get_repo_name
+from stats_cache import load_stats
+
+logger = logging.getLogger(__name__)
+
+FLEET_DIRNAME = '_fleet'
+
+
+@dataclass
+class RepoResult:
+    """Aggregation outcome for one repository.
+
+    Attributes:
+        path: Repository path
+        name: Repository name (from 'origin', else the directory name)
+        stats: Aggregated stats, or None if the repository failed
+        seconds: Wall time spent aggregating
+        worker: PID of the worker process that handled the repository
+        error: Error message if aggregation failed
+    """
+    path: str
+    name: str
+    stats: CommitStats | None
+    seconds: float
+    worker: int
+    error: str | None = None
+
+
+@dataclass
+class FleetReport:
+    """Per-repo results and merged fleet-level stats."""
+    results: list[RepoResult]
+    merged: CommitStats
+    wall_seconds: float
+    throughput: dict[int, float] = field(default_factory=dict)
+
+
+def is_git_repo(path: Path) -> bool:
+    """Return True if ``path`` is the top level of a git working tree or a bare repo."""
+    return (path / '.git').exists() or ((path / 'HEAD').is_file() and (path / 'objects').is_dir())
+
+
+def expand_repo_paths(patterns: list[str]) -> list[Path]:
+    """Expand paths and glob patterns into a sorted list of unique repositories."""
+    repos: set[Path] = set()
+    for pattern in patterns:
+        matches = glob.glob(os.path.expanduser(pattern)) or [os.path.expanduser(pattern)]
+        for match in matches:
+            path = Path(match).resolve()
+            if path.is_dir() and is_git_repo(path):
+                repos.add(path)
+            else:
+                logger.debug("Skipping non-repository %s", match)
+    return sorted(repos)
+
+
+def analyze_repo(repo_path: str, use_cache: bool = True) -> RepoResult:
+    """Aggregate one repository (runs inside a worker process).
+
+    Failures are recorded in ``RepoResult.error`` rather than raised.
+
+    Args:
+        repo_path: Path to the git repository
+        use_cache: Update and reuse the repository's incremental stats cache
+    """
+    start = time.perf_counter()
+    name = Path(repo_path).name
+    try:
+        # Falling back to the directory name is normal here, so no error log
+        name = get_repo_name(repo_path, log_level=logging.DEBUG) or name
+        stats = load_stats(repo_path) if use_cache else aggregate_repo(repo_path)
+        error = None
+    except subprocess.CalledProcessError as e:
+        stats, error = None, (e.stderr or str(e)).strip()
+    except Exception as e:
+        # One broken repository (unwritable or corrupt cache, undecodable
+        # output, ...) must not abort the rest of the fleet
+        stats, error = None, f'{type(e).__name__}: {e}'
+    return RepoResult(
+        str(repo_path), name, stats, time.perf_counter() - start, os.getpid(), error
+    )
+
+
+def analyze_fleet(
+    repo_paths: list[Path],
+    max_workers: int | None = None,
+    use_cache: bool = True
+) -> FleetReport:
+    """Aggregate every repository in a process pool and merge the results.
+
+    Args:
+        repo_paths: Repositories to analyze
+        max_workers: Pool size (default: CPU count)
+        use_cache: Use each repository's incremental stats cache
+
+    Returns:
+        Report with per-repo results, merged stats and per-worker throughput.
+    """
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(
+            analyze_repo, [str(p) for p in repo_paths], [use_cache] * len(repo_paths)
+        ))
+
+    merged = CommitStats.empty()
+    busy: dict[int, tuple[int, float]] = {}
+    for result in results:
+        if result.stats is None:
+            continue
+        merged = merged.merge(result.stats)
+        commits, seconds = busy.get(result.worker, (0, 0.0))
+        busy[result.worker] = (commits + result.stats.total_commits, seconds + result.seconds)
+
+    throughput = {
+        worker: commits / seconds if seconds else 0.0
+        for worker, (commits, seconds) in busy.items()
+    }
+    return FleetReport(results, merged, time.perf_counter() - start, throughput)
+
+
+def _histograms(stats: CommitStats) -> dict:
+    """Return the JSON-serializable histograms for a set of stats."""
+    return {
+        'total_commits': stats.total_commits,
+        'by_hour': stats.by_hour.tolist(),
+        'by_weekday': stats.by_weekday.tolist(),
+        'by_month': stats.by_month.tolist(),
+    }
+
+
+def write_report(report: FleetReport, output_dir: str) -> None:
+    """Write count files per repo and for the fleet, plus a JSON summary.
+
+    Args:
+        report: Fleet analysis result
+        output_dir: Directory receiving ``<repo>/``, ``_fleet/`` and ``fleet.json``
+    """
+    out = Path(output_dir)
+    summary = {'repos': {}, 'fleet': _histograms(report.merged)}
+    for result in report.results:
+        # Forks and mirrors can share a name; keep their outputs apart
+        name, n = result.name, 1
+        while name in summary['repos'] or name == FLEET_DIRNAME:
+            n += 1
+            name = f"{result.name}-{n}"
+        if result.stats is None:
+            summary['repos'][name] = {'path': result.path, 'error': result.error}
+            continue
+        write_count_files(result.stats, out / name)
+        summary['repos'][name] = {
+            'path': result.path, 'seconds': round(result.seconds, 3),
+            **_histograms(result.stats)
+        }
+    write_count_files(report.merged, out / FLEET_DIRNAME)
+    with open(out / 'fleet.json', 'w') as f:
+        json.dump(summary, f, indent=2)
+
+
+def main() -> int:
+    """Analyze a fleet of repositories and report throughput."""
+    parser = argparse.ArgumentParser(description='Aggregate commit histograms across many repositories')
+    parser.add_argument('repos', nargs='+', help='Repository paths or glob patterns')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--output-dir', default='fleet-report', help='Directory for per-repo and fleet output')
+    parser.add_argument('--no-cache', action='store_true', help='Rescan full history instead of using stats caches')
+    args = parser.parse_args()
+
+    repo_paths = expand_repo_paths(args.repos)
+    if not repo_paths:
+        logger.error("No git repositories matched %s", ' '.join(args.repos))
+        return 1
+
+    report = analyze_fleet(repo_paths, args.workers, use_cache=not args.no_cache)
+    write_report(report, args.output_dir)
+
+    failed = [r for r in report.results if r.stats is None]
+    for result in failed:
+        logger.error("%s: %s", result.path, result.error)
+    logger.info(
+        "Analyzed %d repositories (%d commits) in %.2fs",
+        len(report.results) - len(failed), report.merged.total_commits, report.wall_seconds
+    )
+    for worker, rate in sorted(report.throughput.items()):
+        logger.info("  worker %d: %.0f commits/sec", worker, rate)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""Streaming reader for ``git log`` using a compact machine-parseable format.
+
+Records are parsed straight from the subprocess pipe, so memory stays
+constant regardless of history length and no intermediate logs.txt is
+written. ``partition_revisions`` splits one history into disjoint revision
+ranges that separate ``git log`` processes can walk concurrently.
+"""
+import subprocess
+from collections.abc import Iterator, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+FIELD_SEPARATOR = '\x1f'
+# sha, author epoch, author tz offset (+HHMM), author name, subject
+LOG_FORMAT = '%H%x1f%at%x1f%ad%x1f%an%x1f%s'
+LOG_DATE_OPTION = '--date=format:%z'
+_FIELD_COUNT = 5
+
+
+class CommitRecord(NamedTuple):
+    """A single commit as read from ``git log``.
+
+    Attributes:
+        sha: Full commit hash
+        timestamp: Author time in seconds since the Unix epoch
+        tz_offset: Author time zone offset from UTC in minutes
+        author: Author name
+        subject: First line of the commit message
+    """
+    sha: str
+    timestamp: int
+    tz_offset: int
+    author: str
+    subject: str
+
+    @property
+    def local_time(self) -> datetime:
+        """Author time in the author's own time zone."""
+        tz = timezone(timedelta(minutes=self.tz_offset))
+        return datetime.fromtimestamp(self.timestamp, tz)
+
+
+def parse_tz_offset(value: str) -> int:
+    """Convert a ``+HHMM``/``-HHMM`` offset into minutes east of UTC."""
+    sign = -1 if value.startswith('-') else 1
+    digits = value.lstrip('+-')
+    return sign * (int(digits[:2]) * 60 + int(digits[2:4]))
+
+
+def parse_record(line: str) -> CommitRecord | None:
+    """Parse one line of ``LOG_FORMAT`` output.
+
+    Returns:
+        The parsed record, or None if the line is malformed.
+    """
+    parts = line.rstrip('\n').split(FIELD_SEPARATOR, _FIELD_COUNT - 1)
+    if len(parts) != _FIELD_COUNT:
+        return None
+    sha, timestamp, offset, author, subject = parts
+    try:
+        return CommitRecord(sha, int(timestamp), parse_tz_offset(offset), author, subject)
+    except ValueError:
+        return None
+
+
+def iter_commits(
+    repo_path: str = '.',
+    revisions: Sequence[str] = (),
+    extra_args: Sequence[str] = ()
+) -> Iterator[CommitRecord]:
+    """Stream commits from ``git log`` one record at a time.
+
+    Args:
+        repo_path: Path to the git repository
+        revisions: Revision arguments (e.g. ``['abc123..HEAD']``); defaults to HEAD
+        extra_args: Additional ``git log`` options (e.g. ``['--no-merges']``)
+
+    Yields:
+        One ``CommitRecord`` per commit, newest first.
+
+    Raises:
+        subprocess.CalledProcessError: If git exits with an error
+    """
+    cmd = [
+        'git', '-C', str(repo_path), 'log', f'--format={LOG_FORMAT}', LOG_DATE_OPTION,
+        *extra_args, *revisions, '--'
+    ]
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        text=True, encoding='utf-8', errors='replace'
+    )
+    try:
+        for line in proc.stdout:
+            record = parse_record(line)
+            if record is not None:
+                yield record
+        stderr = proc.stderr.read()
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        proc.stderr.close()
+
+
+def _git_bytes(repo_path: str, *args: str) -> bytes:
+    """Run a git command and return its raw standard output.
+
+    Raises:
+        subprocess.CalledProcessError: If git exits with an error
+    """
+    cmd = ['git', '-C', str(repo_path), *args]
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        raise subprocess.CalledProcessError(
+            result.returncode, cmd, stderr=result.stderr.decode('utf-8', errors='replace')
+        )
+    return result.stdout
+
+
+def partition_revisions(repo_path: str = '.', parts: int = 2, revision: str = 'HEAD') -> list[list[str]]:
+    """Split the history of ``revision`` into up to ``parts`` disjoint ranges.
+
+    Boundaries b1, b2, ... are picked at even steps along the first-parent
+    chain of the tip, newest first. The ranges are ``b1..tip``,
+    ``b2..b1``, ... and finally ``bN`` itself. Each boundary is an
+    ancestor of the previous one, so every commit reachable from the tip,
+    including commits merged in from side branches, falls in exactly one
+    range.
+
+    Listing the chain parses every first-parent commit unless the
+    repository has a commit-graph file (``git commit-graph write``), which
+    makes it several times faster.
+
+    Args:
+        repo_path: Path to the git repository
+        parts: Number of ranges wanted; short histories give fewer
+        revision: Tip commit to partition
+
+    Returns:
+        Revision arguments for ``iter_commits``, one list per range.
+
+    Raises:
+        subprocess.CalledProcessError: If git exits with an error
+    """
+    tip = _git_bytes(repo_path, 'rev-parse', '--verify', f'{revision}^{{commit}}').decode().strip()
+    if parts < 2:
+        return [[tip]]
+    chain = _git_bytes(repo_path, 'rev-list', '--first-parent', tip)
+    # One fixed-width hash per line, so boundaries are found by offset
+    width = chain.index(b'\n') + 1
+    length = len(chain) // width
+    boundaries: list[str] = []
+    for k in range(1, parts):
+        index = k * length // parts
+        if index == 0:
+            continue
+        sha = chain[index * width:(index + 1) * width - 1].decode()
+        if not boundaries or boundaries[-1] != sha:
+            boundaries.append(sha)
+
+    ranges = []
+    newer = tip
+    for sha in boundaries:
+        ranges.append([f'{sha}..{newer}'])
+        newer = sha
+    ranges.append([newer])
+    return ranges
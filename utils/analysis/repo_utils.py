@@ -1,21 +1,39 @@
 """Shared utility functions for repository operations."""
 import logging
+import re
 import subprocess
 
 logger = logging.getLogger(__name__)
 
+# Last path component of an HTTPS or SSH remote URL, minus any .git suffix
+REMOTE_NAME_PATTERN = re.compile(r'([^/:]+?)(?:\.git)?/?$')
 
-def get_repo_name() -> str | None:
-    """Run get_repo_name.sh to get the current GitHub repository name.
+
+def get_repo_name(repo_path: str = '.', log_level: int = logging.ERROR) -> str | None:
+    """Get the GitHub repository name from the 'origin' remote.
+
+    Mirrors get_repo_name.sh but works for any repository path, so callers
+    are not tied to the current working directory.
+
+    Args:
+        repo_path: Path to the git repository
+        log_level: Level to log a missing or unparsable remote at; callers
+            with their own fallback can pass ``logging.DEBUG``
 
     Returns:
         The repository name, or None if an error occurs.
     """
     try:
-        result = subprocess.check_output(["./get_repo_name.sh"], text=True)
-        # Extract repo name from "Repository name: <name>"
-        repo_name = result.split(": ")[1].strip()
-        return repo_name
-    except (subprocess.CalledProcessError, IndexError):
-        logger.error("Could not get repository name from get_repo_name.sh")
+        remote_url = subprocess.check_output(
+            ['git', '-C', str(repo_path), 'remote', 'get-url', 'origin'],
+            text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        logger.log(log_level, "Could not get 'origin' remote for %s", repo_path)
+        return None
+
+    match = REMOTE_NAME_PATTERN.search(remote_url)
+    if not match:
+        logger.log(log_level, "Could not parse repository name from %s", remote_url)
         return None
+    return match.group(1)
@@ -0,0 +1,149 @@
+"""Persistent incremental commit-stats cache keyed by HEAD.
+
+Stores the aggregated ``CommitStats`` together with the commit they were
+computed at. Later calls only fold in ``last_sha..HEAD``; if history was
+rewritten (force-push, rebase) so that the cached commit is no longer an
+ancestor of HEAD, the stats are rebuilt from scratch.
+"""
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from commit_stats import CommitStats, aggregate_repo
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = 'commit-stats-cache.npz'
+CACHE_VERSION = 1
+
+
+def _git(repo_path: str, *args: str) -> subprocess.CompletedProcess:
+    """Run a git command in ``repo_path`` and capture its output."""
+    return subprocess.run(
+        ['git', '-C', str(repo_path), *args], capture_output=True, text=True
+    )
+
+
+def get_head_sha(repo_path: str = '.') -> str:
+    """Return the commit SHA that HEAD points to.
+
+    Raises:
+        subprocess.CalledProcessError: If HEAD cannot be resolved
+    """
+    result = _git(repo_path, 'rev-parse', '--verify', 'HEAD')
+    result.check_returncode()
+    return result.stdout.strip()
+
+
+def is_ancestor(repo_path: str, ancestor: str, descendant: str) -> bool:
+    """Return True if ``ancestor`` is reachable from ``descendant``.
+
+    Unknown commits (e.g. garbage-collected after a rewrite) count as not
+    being ancestors.
+    """
+    return _git(repo_path, 'merge-base', '--is-ancestor', ancestor, descendant).returncode == 0
+
+
+def default_cache_path(repo_path: str = '.') -> Path:
+    """Return the cache location inside the repository's git directory."""
+    result = _git(repo_path, 'rev-parse', '--absolute-git-dir')
+    result.check_returncode()
+    return Path(result.stdout.strip()) / CACHE_FILENAME
+
+
+def read_cache(cache_path: Path) -> tuple[str, CommitStats] | None:
+    """Load cached stats.
+
+    Returns:
+        Tuple of (head_sha, stats), or None if the cache is missing or unreadable.
+    """
+    try:
+        with np.load(cache_path, allow_pickle=False) as data:
+            if int(data['version']) != CACHE_VERSION:
+                return None
+            return str(data['head']), CommitStats(days=data['days'], day_hour=data['day_hour'])
+    except FileNotFoundError:
+        return None
+    except (OSError, KeyError, ValueError) as e:
+        logger.warning("Ignoring unreadable stats cache %s: %s", cache_path, e)
+        return None
+
+
+def write_cache(cache_path: Path, head_sha: str, stats: CommitStats) -> None:
+    """Atomically write stats for ``head_sha`` to ``cache_path``."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.npz.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(
+                f, version=CACHE_VERSION, head=np.array(head_sha),
+                days=stats.days, day_hour=stats.day_hour
+            )
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_stats(
+    repo_path: str = '.',
+    cache_path: str | Path | None = None,
+    rebuild: bool = False
+) -> CommitStats:
+    """Return up-to-date stats for HEAD, updating the cache incrementally.
+
+    Args:
+        repo_path: Path to the git repository
+        cache_path: Cache file location (default: inside the git directory)
+        rebuild: Ignore any cached stats and rescan the full history
+
+    Raises:
+        subprocess.CalledProcessError: If git fails
+    """
+    head = get_head_sha(repo_path)
+    path = Path(cache_path) if cache_path else default_cache_path(repo_path)
+    cached = None if rebuild else read_cache(path)
+
+    if cached is not None:
+        last_sha, stats = cached
+        if last_sha == head:
+            return stats
+        if is_ancestor(repo_path, last_sha, head):
+            logger.info("Folding in %s..%s", last_sha[:12], head[:12])
+            stats = stats.merge(aggregate_repo(repo_path, [f'{last_sha}..{head}']))
+            write_cache(path, head, stats)
+            return stats
+        logger.info("Cached commit %s is not an ancestor of HEAD; rebuilding", last_sha[:12])
+
+    stats = aggregate_repo(repo_path, [head])
+    write_cache(path, head, stats)
+    return stats
+
+
+def main() -> int:
+    """Refresh the stats cache for a repository."""
+    parser = argparse.ArgumentParser(description='Update the incremental commit-stats cache')
+    parser.add_argument('--repo', default='.', help='Path to the git repository (default: .)')
+    parser.add_argument('--cache', help='Cache file (default: <git-dir>/commit-stats-cache.npz)')
+    parser.add_argument('--rebuild', action='store_true', help='Rescan the full history')
+    args = parser.parse_args()
+
+    try:
+        stats = load_stats(args.repo, args.cache, rebuild=args.rebuild)
+    except subprocess.CalledProcessError as e:
+        logger.error("git failed: %s", (e.stderr or '').strip())
+        return 1
+
+    logger.info("%d commits over %d days", stats.total_commits, len(stats.days))
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""Vectorized time bucketing of commit timestamps.
+
+Commits are handled as integer arrays: seconds since the Unix epoch plus
+the author's UTC offset in minutes. Shifting by a time zone and binning
+with ``np.bincount`` replaces per-commit ``datetime`` work, so tens of
+millions of commits bucket in well under a second.
+
+Functions that take ``days`` expect whole days since 1970-01-01 in the
+chosen time zone (see ``epoch_days``); an optional ``weights`` array
+counts several commits per entry. Named schemes are evaluated on a
+compact day x hour matrix (the one ``CommitStats`` stores), so calendar
+conversions run once per active day rather than once per commit.
+"""
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'config'))
+
+from constants import HOURS_IN_DAY, DAYS_IN_WEEK, MONTHS_IN_YEAR, QUARTERS_IN_YEAR, ISO_WEEKS_MAX
+from git_log import parse_tz_offset
+
+TZ_AUTHOR = 'author'
+TZ_UTC = 'utc'
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+# 1970-01-01 was a Thursday: Sunday-first index 4, Monday-first index 3
+_EPOCH_WEEKDAY_SUN = 4
+_EPOCH_WEEKDAY_MON = 3
+# Above this many day x hour cells per commit, day_hour_counts compacts days first
+DENSE_CELLS_PER_COMMIT = 8
+DENSE_CELLS_MIN = 1 << 22
+
+
+def parse_time_zone(value: str) -> str | int:
+    """Parse a time zone mode: "author", "utc" or a fixed "+HHMM"/"-HHMM" offset.
+
+    Returns:
+        ``TZ_AUTHOR``, ``TZ_UTC`` or the fixed offset in minutes east of UTC.
+
+    Raises:
+        ValueError: If ``value`` is none of these
+    """
+    lowered = value.strip().lower()
+    if lowered in (TZ_AUTHOR, TZ_UTC):
+        return lowered
+    digits = lowered.lstrip('+-')
+    if lowered[:1] in '+-' and len(digits) == 4 and digits.isdigit():
+        return parse_tz_offset(lowered)
+    raise ValueError(f"Invalid time zone {value!r} (use 'author', 'utc' or +HHMM)")
+
+
+def local_seconds(timestamps: np.ndarray, tz_offsets: np.ndarray, tz: str | int = TZ_AUTHOR) -> np.ndarray:
+    """Shift epoch timestamps into the wall-clock time of ``tz``.
+
+    Args:
+        timestamps: Seconds since the Unix epoch
+        tz_offsets: Author UTC offsets in minutes, same length as ``timestamps``
+        tz: ``TZ_AUTHOR`` (each commit's own offset), ``TZ_UTC`` or fixed
+            minutes east of UTC
+
+    Returns:
+        int64 seconds since 1970-01-01 00:00 local time.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    if tz == TZ_UTC:
+        return timestamps
+    if tz == TZ_AUTHOR:
+        return timestamps + np.asarray(tz_offsets, dtype=np.int64) * 60
+    return timestamps + int(tz) * 60
+
+
+def epoch_days(local: np.ndarray) -> np.ndarray:
+    """Whole days since 1970-01-01 (floor division, so pre-1970 days are negative)."""
+    return local // SECONDS_PER_DAY
+
+
+def hour_of_day(local: np.ndarray) -> np.ndarray:
+    """Hour of day, 0-23."""
+    return local % SECONDS_PER_DAY // SECONDS_PER_HOUR
+
+
+def day_of_week(days: np.ndarray) -> np.ndarray:
+    """Day of week, 0: Sun, ..., 6: Sat."""
+    return (days + _EPOCH_WEEKDAY_SUN) % DAYS_IN_WEEK
+
+
+def month_of_year(days: np.ndarray) -> np.ndarray:
+    """Month, 0: Jan, ..., 11: Dec."""
+    return days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64) % MONTHS_IN_YEAR
+
+
+def quarter_of_year(days: np.ndarray) -> np.ndarray:
+    """Quarter, 0: Jan-Mar, ..., 3: Oct-Dec."""
+    return month_of_year(days) // 3
+
+
+def iso_week(days: np.ndarray) -> np.ndarray:
+    """ISO 8601 week number, 1-53.
+
+    A week belongs to the year holding its Thursday, so early January days
+    can fall in week 52/53 and late December days in week 1.
+    """
+    thursdays = days - (days + _EPOCH_WEEKDAY_MON) % DAYS_IN_WEEK + 3
+    year_start = thursdays.astype('datetime64[D]').astype('datetime64[Y]').astype('datetime64[D]')
+    return (thursdays - year_start.astype(np.int64)) // DAYS_IN_WEEK + 1
+
+
+def count_buckets(indices: np.ndarray, size: int, weights: np.ndarray | None = None) -> np.ndarray:
+    """Count entries per bucket index in ``range(size)`` as int64."""
+    counts = np.bincount(indices, weights=weights, minlength=size)
+    return counts.astype(np.int64) if weights is not None else counts
+
+
+def _by_hour(local, days, weights):
+    return count_buckets(hour_of_day(local), HOURS_IN_DAY, weights)
+
+
+def _by_weekday(local, days, weights):
+    return count_buckets(day_of_week(days), DAYS_IN_WEEK, weights)
+
+
+def _by_month(local, days, weights):
+    return count_buckets(month_of_year(days), MONTHS_IN_YEAR, weights)
+
+
+def _by_quarter(local, days, weights):
+    return count_buckets(quarter_of_year(days), QUARTERS_IN_YEAR, weights)
+
+
+def _by_week_of_year(local, days, weights):
+    return count_buckets(iso_week(days) - 1, ISO_WEEKS_MAX, weights)
+
+
+def _by_hour_weekday(local, days, weights):
+    cells = day_of_week(days) * HOURS_IN_DAY + hour_of_day(local)
+    return count_buckets(cells, DAYS_IN_WEEK * HOURS_IN_DAY, weights).reshape(DAYS_IN_WEEK, HOURS_IN_DAY)
+
+
+# Scheme name -> counter taking (local seconds, epoch days, weights)
+BUCKET_SCHEMES: dict[str, Callable[..., np.ndarray]] = {
+    'hour': _by_hour,
+    'weekday': _by_weekday,
+    'month': _by_month,
+    'quarter': _by_quarter,
+    'week_of_year': _by_week_of_year,
+    'hour_weekday': _by_hour_weekday,
+}
+
+
+def day_hour_counts(local: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Count commits per (day, hour) cell for the days that have commits.
+
+    Args:
+        local: Local seconds (see ``local_seconds``)
+
+    Returns:
+        Tuple of (sorted epoch days, counts with shape (len(days), 24)).
+    """
+    if len(local) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, HOURS_IN_DAY), dtype=np.int64)
+    days = epoch_days(local)
+    hours = hour_of_day(local)
+    first = int(days.min())
+    span = int(days.max()) - first + 1
+    if span * HOURS_IN_DAY <= max(DENSE_CELLS_PER_COMMIT * len(local), DENSE_CELLS_MIN):
+        day_hour = np.bincount(
+            (days - first) * HOURS_IN_DAY + hours, minlength=span * HOURS_IN_DAY
+        ).reshape(span, HOURS_IN_DAY)
+        active = np.flatnonzero(day_hour.any(axis=1))
+        return active + first, day_hour[active]
+    # A few outlying dates (e.g. bogus 1970 or far-future commits) would
+    # make the dense matrix huge; number the distinct days instead
+    unique_days, rows = np.unique(days, return_inverse=True)
+    day_hour = np.bincount(
+        rows * HOURS_IN_DAY + hours, minlength=len(unique_days) * HOURS_IN_DAY
+    ).reshape(len(unique_days), HOURS_IN_DAY)
+    return unique_days, day_hour
+
+
+def scheme_counts(days: np.ndarray, day_hour: np.ndarray, scheme: str) -> np.ndarray:
+    """Evaluate a ``BUCKET_SCHEMES`` scheme on a day x hour matrix.
+
+    Args:
+        days: Epoch days of the matrix rows
+        day_hour: Commit counts with shape (len(days), 24)
+        scheme: Key into ``BUCKET_SCHEMES``
+
+    Raises:
+        KeyError: If ``scheme`` is unknown
+    """
+    counter = BUCKET_SCHEMES[scheme]
+    local = days[:, None] * SECONDS_PER_DAY + np.arange(HOURS_IN_DAY) * SECONDS_PER_HOUR
+    return counter(local.ravel(), np.repeat(days, HOURS_IN_DAY), day_hour.ravel())
+
+
+def bucket_counts(
+    timestamps: np.ndarray,
+    tz_offsets: np.ndarray,
+    scheme: str,
+    tz: str | int = TZ_AUTHOR
+) -> np.ndarray:
+    """Count commits per bucket of a named scheme.
+
+    Args:
+        timestamps: Seconds since the Unix epoch
+        tz_offsets: Author UTC offsets in minutes
+        scheme: Key into ``BUCKET_SCHEMES``: "hour" (24), "weekday" (7, Sun
+            first), "month" (12), "quarter" (4), "week_of_year" (53, ISO week
+            1 first) or "hour_weekday" (7 x 24 heatmap)
+        tz: Time zone mode (see ``local_seconds``)
+
+    Raises:
+        KeyError: If ``scheme`` is unknown
+    """
+    if scheme not in BUCKET_SCHEMES:
+        raise KeyError(scheme)
+    days, day_hour = day_hour_counts(local_seconds(timestamps, tz_offsets, tz))
+    return scheme_counts(days, day_hour, scheme)
+
+
+def daily_counts(days: np.ndarray, weights: np.ndarray | None = None) -> tuple[int, np.ndarray]:
+    """Count commits for every calendar day from the first to the last.
+
+    Returns:
+        Tuple of (first epoch day, counts per consecutive day); days without
+        commits are zero.
+    """
+    if len(days) == 0:
+        return 0, np.zeros(0, dtype=np.int64)
+    first = int(days.min())
+    return first, count_buckets(days - first, int(days.max()) - first + 1, weights)
+
+
+def rolling_counts(
+    days: np.ndarray,
+    window: int,
+    weights: np.ndarray | None = None
+) -> tuple[int, np.ndarray]:
+    """Commits in a trailing window of ``window`` days, for every calendar day.
+
+    Returns:
+        Tuple of (first epoch day, rolling sums); entry ``i`` covers days
+        ``first + i - window + 1`` through ``first + i``.
+
+    Raises:
+        ValueError: If ``window`` is not positive
+    """
+    if window < 1:
+        raise ValueError(f"Rolling window must be at least one day, got {window}")
+    first, counts = daily_counts(days, weights)
+    totals = np.cumsum(counts)
+    rolling = totals.copy()
+    rolling[window:] -= totals[:-window]
+    return first, rolling
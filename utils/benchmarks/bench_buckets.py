@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Benchmark vectorized time bucketing on large synthetic histories.
+
+Generates ``--commits`` random author timestamps spread over 20 years with
+a mix of UTC offsets, then times ``CommitStats.from_epochs`` and every
+``time_buckets`` scheme in each time zone mode. For reference, the
+per-commit ``datetime`` aggregation is timed on a ``--sample`` of the same
+commits and extrapolated.
+
+Usage:
+    python bench_buckets.py --commits 10000000
+"""
+import argparse
+import logging
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'analysis'))
+
+logger = logging.getLogger(__name__)
+from commit_stats import CommitStats
+from time_buckets import BUCKET_SCHEMES, TZ_AUTHOR, TZ_UTC, bucket_counts, epoch_days, local_seconds, rolling_counts
+
+START = int(datetime(2005, 1, 1, tzinfo=timezone.utc).timestamp())
+YEARS = 20
+OFFSETS = np.array([-480, -420, -300, -240, 0, 60, 120, 330, 480, 540, 600])
+
+
+def per_commit_baseline(timestamps: np.ndarray, offsets: np.ndarray) -> float:
+    """Bucket commits the old way, one ``datetime`` per commit; return seconds."""
+    start = time.perf_counter()
+    day_hour: dict[int, list[int]] = defaultdict(lambda: [0] * 24)
+    for ts, offset in zip(timestamps.tolist(), offsets.tolist()):
+        when = datetime.fromtimestamp(ts, timezone(timedelta(minutes=offset)))
+        day_hour[when.toordinal()][when.hour] += 1
+    return time.perf_counter() - start
+
+
+def timed(fn, *args) -> float:
+    """Return the best of three wall times of ``fn(*args)`` in seconds."""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    """Time stats construction and every bucket scheme."""
+    parser = argparse.ArgumentParser(description='Benchmark vectorized time bucketing')
+    parser.add_argument('--commits', type=int, default=10_000_000, help='Synthetic commits')
+    parser.add_argument('--sample', type=int, default=200_000,
+                        help='Commits timed with the per-commit datetime baseline')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    timestamps = rng.integers(START, START + YEARS * 365 * 86400, args.commits, dtype=np.int64)
+    offsets = rng.choice(OFFSETS, args.commits).astype(np.int32)
+
+    sample = min(args.sample, args.commits)
+    baseline = per_commit_baseline(timestamps[:sample], offsets[:sample]) * args.commits / sample
+    logger.info("%d commits; per-commit datetime baseline: %.2fs (extrapolated from %d)",
+                args.commits, baseline, sample)
+
+    logger.info("%-16s %10s %10s %10s", 'step', 'author', 'utc', '+0530')
+    modes = (TZ_AUTHOR, TZ_UTC, 330)
+    rows = {'from_epochs': [timed(CommitStats.from_epochs, timestamps, offsets, tz) for tz in modes]}
+    for scheme in BUCKET_SCHEMES:
+        rows[scheme] = [timed(bucket_counts, timestamps, offsets, scheme, tz) for tz in modes]
+    rows['rolling 28d'] = [
+        timed(lambda tz: rolling_counts(epoch_days(local_seconds(timestamps, offsets, tz)), 28), tz)
+        for tz in modes
+    ]
+    for step, seconds in rows.items():
+        logger.info("%-16s %9.0fms %9.0fms %9.0fms", step, *(s * 1000 for s in seconds))
+
+    stats = CommitStats.from_epochs(timestamps, offsets)
+    logger.info("from_epochs speedup over baseline: %.0fx", baseline / rows['from_epochs'][0])
+    logger.info("schemes from cached day x hour stats (%d days): %.1f ms", len(stats.days),
+                timed(lambda: [stats.buckets(scheme) for scheme in BUCKET_SCHEMES]) * 1000)
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
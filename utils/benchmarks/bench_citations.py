@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Benchmark and sanity-check the citation verifier against local stand-in hosts.
+
+Starts several local HTTP servers (one per simulated host) that serve fast,
+slow, redirecting, failing, HEAD-rejecting and connection-dropping
+endpoints. The script checks the same URL set with one-at-a-time
+``urlopen`` (the old behaviour) and with ``LinkChecker``, then reports the
+timings, connections opened, peak per-host concurrency and any status
+mismatches. It then repeats the check through a link cache: a warm run
+(everything fresh, no requests expected) and a stale run (TTL 0, so links
+with validators are revalidated conditionally).
+
+Usage:
+    python bench_citations.py --links 60 --hosts 3
+"""
+import argparse
+import importlib.util
+import logging
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+logger = logging.getLogger(__name__)
+
+SCRIPT = Path(__file__).parent.parent / 'scripts' / 'verify-citations.py'
+SLOW_SECONDS = 0.3
+
+# Endpoint -> whether the verifier should report it as valid
+ENDPOINTS = {
+    '/ok': True,
+    '/etag': True,
+    '/slow': True,
+    '/redirect': True,
+    '/nohead': True,
+    '/missing': False,
+    '/fail': False,
+    '/loop': False,
+    '/drop': False,
+}
+
+
+def load_verifier():
+    """Import verify-citations.py, whose name is not a valid module name."""
+    spec = importlib.util.spec_from_file_location('verify_citations', SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Threaded server that records connection and concurrency counts."""
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.not_modified = 0
+        self.active = 0
+        self.peak_active = 0
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves the simulated endpoints over keep-alive HTTP/1.1."""
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes = b'', headers: dict | None = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _serve(self) -> None:
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.requests += 1
+            server.peak_active = max(server.peak_active, server.active)
+        try:
+            path = self.path.split('?', 1)[0]
+            if path == '/ok':
+                self._send(200, b'ok')
+            elif path == '/etag':
+                if self.headers.get('If-None-Match') == '"v1"':
+                    with server.lock:
+                        server.not_modified += 1
+                    self._send(304)
+                else:
+                    self._send(200, b'tagged', headers={'ETag': '"v1"'})
+            elif path == '/slow':
+                time.sleep(SLOW_SECONDS)
+                self._send(200, b'slow')
+            elif path == '/redirect':
+                self._send(302, headers={'Location': '/ok'})
+            elif path == '/loop':
+                self._send(302, headers={'Location': '/loop'})
+            elif path == '/nohead':
+                self._send(405 if self.command == 'HEAD' else 200, b'get only')
+            elif path == '/fail':
+                self._send(500, b'error')
+            elif path == '/drop':
+                self.close_connection = True
+            else:
+                self._send(404, b'missing')
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    do_GET = _serve
+    do_HEAD = _serve
+
+
+def sequential_check(url: str, timeout: float) -> bool:
+    """Check a URL the way the original script did: one urlopen per URL."""
+    try:
+        urlopen(Request(url, headers={'User-Agent': 'bench'}), timeout=timeout)
+        return True
+    except (HTTPError, URLError, OSError, ValueError):
+        return False
+    except Exception:
+        return False
+
+
+def main() -> int:
+    """Run the sequential vs concurrent comparison."""
+    parser = argparse.ArgumentParser(description='Benchmark the citation verifier on local hosts')
+    parser.add_argument('--links', type=int, default=60, help='Number of URLs to check')
+    parser.add_argument('--hosts', type=int, default=3, help='Number of simulated hosts')
+    parser.add_argument('--workers', type=int, default=16, help='LinkChecker max_workers')
+    parser.add_argument('--per-host', type=int, default=4, help='LinkChecker per_host')
+    args = parser.parse_args()
+
+    verifier = load_verifier()
+    servers = [StandInServer() for _ in range(args.hosts)]
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    endpoints = list(ENDPOINTS)
+    urls = {}
+    for i in range(args.links):
+        server = servers[i % len(servers)]
+        endpoint = endpoints[i % len(endpoints)]
+        urls[f"http://127.0.0.1:{server.server_port}{endpoint}?i={i}"] = ENDPOINTS[endpoint]
+
+    start = time.perf_counter()
+    for url in urls:
+        sequential_check(url, verifier.DEFAULT_TIMEOUT)
+    sequential_seconds = time.perf_counter() - start
+    sequential_connections = sum(s.connections for s in servers)
+
+    def timed_run(cache=None):
+        for server in servers:
+            server.connections = server.requests = server.not_modified = server.peak_active = 0
+        start = time.perf_counter()
+        with verifier.LinkChecker(args.workers, args.per_host, cache=cache) as checker:
+            statuses = checker.check_many(urls)
+        return statuses, time.perf_counter() - start
+
+    statuses, concurrent_seconds = timed_run()
+
+    logger.info("%d URLs across %d hosts", len(urls), len(servers))
+    logger.info("sequential urlopen: %6.2fs, %d connections", sequential_seconds, sequential_connections)
+    logger.info(
+        "LinkChecker:        %6.2fs, %d connections, peak per-host concurrency %d (limit %d)",
+        concurrent_seconds, sum(s.connections for s in servers),
+        max(s.peak_active for s in servers), args.per_host
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with verifier.LinkCache(Path(tmp) / 'links.sqlite3') as cache:
+            timed_run(cache)
+            warm_statuses, warm_seconds = timed_run(cache)
+            logger.info(
+                "cached (warm):      %6.2fs, %d requests",
+                warm_seconds, sum(s.requests for s in servers)
+            )
+            cache.success_ttl = cache.failure_ttl = 0
+            stale_statuses, stale_seconds = timed_run(cache)
+            logger.info(
+                "cached (stale):     %6.2fs, %d requests, %d answered 304 Not Modified",
+                stale_seconds, sum(s.requests for s in servers), sum(s.not_modified for s in servers)
+            )
+
+    mismatches = [
+        (url, result[url].message)
+        for result in (statuses, warm_statuses, stale_statuses)
+        for url, expected in urls.items() if result[url].valid != expected
+    ]
+    for url, message in mismatches:
+        logger.error("Unexpected status for %s: %s", url, message)
+    for server in servers:
+        server.shutdown()
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
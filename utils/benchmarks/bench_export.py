@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark exporting one chart in several output profiles.
+
+Builds an hour-of-day bar chart, then repeatedly exports it in the chosen
+profiles two ways: one ``savefig(bbox_inches='tight')`` per profile (each
+re-measures the figure with an extra draw), and ``export_figure``, which
+measures once and shares the crop. Also reports the encoded size of each
+profile. Output goes to in-memory buffers; the chart cache is not involved.
+
+Usage:
+    python bench_export.py --repeat 9 --profiles thumbnail web print svg webp
+"""
+import argparse
+import io
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'plotting'))
+
+logger = logging.getLogger(__name__)
+from plot_commits_by_hour import FIGSIZE, HOUR_LABELS
+from plot_utils import OUTPUT_PROFILES, BarChartTemplate, export_figure, resolve_profiles
+
+
+def export_separately(fig, profiles) -> list[io.BytesIO]:
+    """Save once per profile, letting matplotlib compute the tight box each time."""
+    buffers = []
+    for profile in profiles:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=profile.format, dpi=profile.dpi, bbox_inches='tight')
+        buffers.append(buffer)
+    return buffers
+
+
+def export_shared(fig, profiles) -> list[io.BytesIO]:
+    """Save every profile through ``export_figure`` with one shared tight box."""
+    buffers = [io.BytesIO() for _ in profiles]
+    export_figure(fig, list(zip(buffers, profiles)))
+    return buffers
+
+
+def main() -> int:
+    """Time both export strategies, alternating runs to even out noise."""
+    parser = argparse.ArgumentParser(description='Benchmark multi-profile chart export')
+    parser.add_argument('--repeat', type=int, default=9, help='Timed runs per strategy (median is reported)')
+    parser.add_argument('--profiles', nargs='+', default=list(OUTPUT_PROFILES),
+                        choices=list(OUTPUT_PROFILES), help='Profiles to export')
+    args = parser.parse_args()
+
+    logging.getLogger('matplotlib').setLevel(logging.WARNING)
+    names, profiles = zip(*resolve_profiles(args.profiles))
+    fig = BarChartTemplate(HOUR_LABELS, 'Hour of Day (0-23)', 'Number of Commits', FIGSIZE).update(
+        [(h * 37) % 101 for h in range(24)], 'Git Commits by Hour of Day'
+    ).fig
+
+    timings = {export_separately: [], export_shared: []}
+    for _ in range(args.repeat):
+        for strategy, runs in timings.items():
+            start = time.perf_counter()
+            buffers = strategy(fig, profiles)
+            runs.append(time.perf_counter() - start)
+
+    for name, profile, buffer in zip(names, profiles, buffers):
+        logger.info("%-10s %-4s %4d dpi %8.1f KiB", name, profile.format, profile.dpi, len(buffer.getvalue()) / 1024)
+    separate = statistics.median(timings[export_separately])
+    shared = statistics.median(timings[export_shared])
+    logger.info("tight box per save:   %7.1f ms", separate * 1000)
+    logger.info("shared tight box:     %7.1f ms", shared * 1000)
+    logger.info("speedup: %.2fx", separate / shared)
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
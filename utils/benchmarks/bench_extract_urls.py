@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Micro-benchmark URL extraction on synthetic markdown documents.
+
+Builds documents with an increasing number of unique links in every
+supported form (inline, image, reference definition, HTML href, bare) and
+times ``extract_urls`` against the previous per-line, two-regex extractor.
+A linear extractor keeps a roughly constant cost per link as the document
+grows; the previous one grows with the number of links already found.
+
+Usage:
+    python bench_extract_urls.py --sizes 1000 2500 5000 10000
+"""
+import argparse
+import importlib.util
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SCRIPT = Path(__file__).parent.parent / 'scripts' / 'verify-citations.py'
+
+LINK_FORMS = (
+    'See [source {i}](https://example.com/doc/{i}) for details.',
+    '![figure {i}](https://img.example.org/{i}.png)',
+    '[ref-{i}]: https://ref.example.net/paper/{i} "Paper {i}"',
+    '<a href="https://html.example.com/page/{i}">page {i}</a>',
+    'Bare link https://bare.example.io/item/{i}, inline in prose.',
+)
+
+
+def load_verifier():
+    """Import verify-citations.py, whose name is not a valid module name."""
+    spec = importlib.util.spec_from_file_location('verify_citations', SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_extract_urls(markdown_content: str) -> list[tuple[str, int]]:
+    """The previous extractor: two regexes per line and a list-scan dedup."""
+    urls = []
+    for i, line in enumerate(markdown_content.split('\n'), 1):
+        for pattern in (r'\[.*?\]\((https?://[^\)]+)\)', r'(https?://[^\s\)]+)'):
+            for match in re.finditer(pattern, line):
+                url = match.group(1)
+                if url not in [u[0] for u in urls]:
+                    urls.append((url, i))
+    return urls
+
+
+def make_document(links: int) -> str:
+    """Return a markdown document with ``links`` unique URLs, one per line."""
+    return '\n'.join(LINK_FORMS[i % len(LINK_FORMS)].format(i=i) for i in range(links))
+
+
+def best_of(fn, document: str, repeat: int) -> tuple[float, int]:
+    """Return (best wall time, URLs found) over ``repeat`` runs."""
+    best, found = float('inf'), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        found = len(fn(document))
+        best = min(best, time.perf_counter() - start)
+    return best, found
+
+
+def main() -> int:
+    """Time both extractors across document sizes."""
+    parser = argparse.ArgumentParser(description='Benchmark markdown URL extraction')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 2500, 5000, 10000],
+                        help='Number of links per synthetic document')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is kept)')
+    parser.add_argument('--skip-legacy', action='store_true', help='Only time the current extractor')
+    args = parser.parse_args()
+
+    verifier = load_verifier()
+    logger.info("%8s %14s %14s %14s %14s", 'links', 'extract (ms)', 'us/link', 'legacy (ms)', 'us/link')
+    failed = False
+    for size in args.sizes:
+        document = make_document(size)
+        seconds, found = best_of(verifier.extract_urls, document, args.repeat)
+        if found != size:
+            logger.error("extract_urls found %d of %d URLs", found, size)
+            failed = True
+        row = [f"{size:8d}", f"{seconds * 1e3:14.2f}", f"{seconds / size * 1e6:14.2f}"]
+        if not args.skip_legacy:
+            legacy_seconds, _ = best_of(legacy_extract_urls, document, 1)
+            row += [f"{legacy_seconds * 1e3:14.2f}", f"{legacy_seconds / size * 1e6:14.2f}"]
+        logger.info(' '.join(row))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
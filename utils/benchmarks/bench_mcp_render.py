@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark MCP chart latency: subprocess plot scripts vs in-process rendering.
+
+The old ``_generate_chart`` spawned a fresh interpreter per call, paying the
+matplotlib cold import every time. This compares that against calling
+``charts.render_chart`` in a warm process, as the server's workers do.
+
+Usage:
+    python bench_mcp_render.py --repo /path/to/repo --iterations 10
+"""
+import argparse
+import logging
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+UTILS_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(UTILS_DIR / 'analysis'))
+sys.path.insert(0, str(UTILS_DIR / 'plotting'))
+
+logger = logging.getLogger(__name__)
+from commit_stats import aggregate_repo, write_count_files
+
+# Chart type -> (plot script, count file it reads)
+SUBPROCESS_CHARTS = {
+    "commits_by_hour": ("plot_commits_by_hour.py", "commit_counts.txt"),
+    "commits_by_day": ("plot_pie_day.py", "commit_counts_day.txt"),
+    "commits_by_month": ("plot_pie_month.py", "commit_counts_month.txt"),
+}
+
+
+def _time_calls(fn, iterations: int) -> list[float]:
+    """Return wall-clock seconds for each of ``iterations`` calls to ``fn``."""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _summarize(label: str, timings: list[float]) -> None:
+    """Log mean/median/min latency in milliseconds."""
+    logger.info(
+        "%-28s mean %8.1f ms  median %8.1f ms  min %8.1f ms",
+        label, statistics.mean(timings) * 1000,
+        statistics.median(timings) * 1000, min(timings) * 1000
+    )
+
+
+def main() -> int:
+    """Run the subprocess vs in-process latency comparison."""
+    parser = argparse.ArgumentParser(description='Benchmark MCP chart render latency')
+    parser.add_argument('--repo', default='.', help='Repository to aggregate (default: .)')
+    parser.add_argument('--iterations', type=int, default=5, help='Calls per chart type')
+    args = parser.parse_args()
+    for noisy in ('plot_utils', 'matplotlib'):
+        logging.getLogger(noisy).setLevel(logging.WARNING)
+
+    stats = aggregate_repo(args.repo)
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        write_count_files(stats, workdir)
+
+        for chart_type, (script, count_file) in SUBPROCESS_CHARTS.items():
+            output_file = workdir / f"{chart_type}_subprocess.png"
+            cmd = [
+                sys.executable, str(UTILS_DIR / 'plotting' / script),
+                f"--input={workdir / count_file}", f"--output={output_file}", "--title=Benchmark"
+            ]
+            _summarize(
+                f"{chart_type} subprocess",
+                _time_calls(lambda: subprocess.run(cmd, check=True), args.iterations)
+            )
+
+        # Import once, as the long-lived server workers do
+        from charts import chart_counts, render_chart
+        for chart_type in SUBPROCESS_CHARTS:
+            output_file = str(workdir / f"{chart_type}_inprocess.png")
+            counts = chart_counts(chart_type, stats)
+            _summarize(
+                f"{chart_type} in-process",
+                _time_calls(
+                    lambda: render_chart(chart_type, counts, output_file, "Benchmark"),
+                    args.iterations
+                )
+            )
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
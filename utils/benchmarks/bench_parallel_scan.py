@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Benchmark a serial history scan against range-partitioned parallel scans.
+
+Aggregates a synthetic repository (see synthetic_repo.py) or an existing
+one with ``aggregate_repo`` and then with ``aggregate_repo_parallel`` for
+each job count, checking that every parallel result matches the serial
+one exactly. Partitioning lists the first-parent chain, so it is timed
+separately, with and without a commit-graph file.
+
+Usage:
+    python bench_parallel_scan.py --size large --workdir /tmp/bench-repos
+    python bench_parallel_scan.py --repo /path/to/repo --jobs 2 4 8
+"""
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'analysis'))
+
+logger = logging.getLogger(__name__)
+from synthetic_repo import SIZES, generate_repo
+
+
+def _timed(fn, *args, **kwargs):
+    """Return (result, seconds) for one call of ``fn``."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main() -> int:
+    """Time the serial scan, then each job count, and verify the results match."""
+    parser = argparse.ArgumentParser(description='Benchmark parallel single-repository history scans')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--repo', help='Benchmark an existing repository instead of a synthetic one')
+    source.add_argument('--size', choices=list(SIZES), help='Synthetic repository preset')
+    source.add_argument('--commits', type=int, default=SIZES['large'], help='Synthetic repository size')
+    parser.add_argument('--workdir', help='Keep generated repositories here and reuse them across runs')
+    parser.add_argument('--jobs', type=int, nargs='+', help='Job counts to time (default: 2, 4, ... up to CPU count)')
+    parser.add_argument('--commit-graph', action='store_true',
+                        help='Write a commit-graph file before timing (git commit-graph write)')
+    args = parser.parse_args()
+
+    from commit_stats import aggregate_repo, aggregate_repo_parallel
+    from git_log import partition_revisions
+
+    cpus = os.cpu_count() or 1
+    jobs_list = args.jobs or [n for n in (2, 4, 8, 16) if n <= max(cpus, 2)]
+
+    with tempfile.TemporaryDirectory(prefix='bench-parallel-') as tmp:
+        if args.repo:
+            repo = Path(args.repo).resolve()
+        else:
+            commits = SIZES[args.size] if args.size else args.commits
+            repo = Path(args.workdir or tmp) / f'synthetic-{commits}-a8'
+            if not (repo / '.git').exists():
+                start = time.perf_counter()
+                generate_repo(repo, commits)
+                logger.info("Generated %d commits in %.1fs", commits, time.perf_counter() - start)
+        if args.commit_graph:
+            subprocess.run(['git', '-C', str(repo), 'commit-graph', 'write', '--reachable'], check=True)
+
+        _, seconds = _timed(partition_revisions, str(repo), max(jobs_list))
+        logger.info("Partitioned into %d ranges in %.2fs", max(jobs_list), seconds)
+
+        serial, serial_s = _timed(aggregate_repo, str(repo))
+        logger.info("%d commits, %d CPUs", serial.total_commits, cpus)
+        logger.info("%-8s %10s %9s %11s", 'jobs', 'wall', 'speedup', 'efficiency')
+        logger.info("%-8s %9.2fs %8.2fx %10.0f%%", 'serial', serial_s, 1.0, 100.0)
+        for jobs in jobs_list:
+            stats, seconds = _timed(aggregate_repo_parallel, str(repo), jobs)
+            if not (np.array_equal(stats.days, serial.days)
+                    and np.array_equal(stats.day_hour, serial.day_hour)):
+                logger.error("%d jobs: result differs from the serial scan", jobs)
+                return 1
+            speedup = serial_s / seconds
+            logger.info("%-8d %9.2fs %8.2fx %10.0f%%", jobs, seconds, speedup, speedup / jobs * 100)
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark cold-start time of each command-line entry point.
+
+Runs every entry point with ``--help`` under ``python -X importtime`` and
+reports the best wall time, the total import time, the number of modules
+imported and whether matplotlib or wordcloud were loaded (they should only
+load when a figure is rendered). A bare ``import matplotlib.pyplot`` run is
+included as a reference.
+
+Usage:
+    python bench_startup.py --repeat 5 --json startup.json
+"""
+import argparse
+import json
+import logging
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+UTILS_DIR = Path(__file__).parent.parent
+
+# Name -> command arguments after ``python -X importtime``
+ENTRY_POINTS = {
+    'plot_repo': [str(UTILS_DIR / 'plotting' / 'plot_repo.py'), '--help'],
+    'plot_commits_by_hour': [str(UTILS_DIR / 'plotting' / 'plot_commits_by_hour.py'), '--help'],
+    'plot_pie_day': [str(UTILS_DIR / 'plotting' / 'plot_pie_day.py'), '--help'],
+    'plot_pie_month': [str(UTILS_DIR / 'plotting' / 'plot_pie_month.py'), '--help'],
+    'plot_avg_commits': [str(UTILS_DIR / 'plotting' / 'plot_avg_commits.py'), '--help'],
+    'generate_wordcloud': [str(UTILS_DIR / 'plotting' / 'generate_wordcloud.py'), '--help'],
+    'commit_stats': [str(UTILS_DIR / 'analysis' / 'commit_stats.py'), '--help'],
+    'stats_cache': [str(UTILS_DIR / 'analysis' / 'stats_cache.py'), '--help'],
+    'fleet': [str(UTILS_DIR / 'analysis' / 'fleet.py'), '--help'],
+    'verify_citations': [str(UTILS_DIR / 'scripts' / 'verify-citations.py'), '--help'],
+    'mcp_server (import)': ['-c', f'import sys; sys.path.insert(0, {str(UTILS_DIR)!r}); import mcp_server'],
+    'reference: pyplot': ['-c', 'import matplotlib.pyplot'],
+}
+HEAVY_MODULES = ('matplotlib', 'wordcloud')
+
+
+def measure(args: list[str]) -> dict:
+    """Run one entry point under ``-X importtime`` and summarize its imports."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', *args], capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(self_us)
+    return {
+        'wall_ms': round(wall * 1000, 1),
+        'import_ms': round(sum(modules.values()) / 1000, 1),
+        'modules': len(modules),
+        'heavy': sorted({name for name in modules if name.split('.')[0] in HEAVY_MODULES and '.' not in name}),
+        'returncode': result.returncode,
+    }
+
+
+def main() -> int:
+    """Measure every entry point and print a table."""
+    parser = argparse.ArgumentParser(description='Benchmark CLI cold-start time')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per entry point (best is kept)')
+    parser.add_argument('--json', help='Also write the results to this JSON file')
+    args = parser.parse_args()
+
+    results = {}
+    logger.info("%-22s %10s %11s %8s  %s", 'entry point', 'wall (ms)', 'import (ms)', 'modules', 'heavy imports')
+    for name, command in ENTRY_POINTS.items():
+        runs = [measure(command) for _ in range(args.repeat)]
+        best = min(runs, key=lambda run: run['wall_ms'])
+        results[name] = best
+        logger.info(
+            "%-22s %10.1f %11.1f %8d  %s", name, best['wall_ms'], best['import_ms'],
+            best['modules'], ', '.join(best['heavy']) or '-'
+        )
+        if best['returncode'] != 0:
+            logger.warning("%s exited with status %d", name, best['returncode'])
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Benchmark queries on the columnar commit store against ``git log`` scans.
+
+Builds the store for a synthetic repository (see synthetic_repo.py) or an
+existing one, then runs each query in a fresh process and reports its
+wall time and the peak RSS it added over the interpreter's baseline. The
+store queries open the memory-mapped columns from scratch every time, as
+a new analysis run would.
+
+Usage:
+    python bench_store.py --size large
+    python bench_store.py --repo /path/to/repo
+"""
+import argparse
+import logging
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'analysis'))
+
+logger = logging.getLogger(__name__)
+from synthetic_repo import SIZES, generate_repo
+
+# ru_maxrss is in KiB on Linux
+RSS_UNIT = 1024
+
+
+def _query(name: str, repo: str, store_path: str) -> tuple[float, int]:
+    """Run one query; return (seconds, peak RSS added in bytes)."""
+    import numpy as np
+    from commit_stats import aggregate_repo_messages
+    from commit_store import CommitStore
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    if name == 'git_log_scan':
+        aggregate_repo_messages(repo)
+    else:
+        store = CommitStore(store_path)
+        if name == 'store_stats':
+            store.stats()
+        elif name == 'store_date_range':
+            middle = int(np.median(store.timestamps[::max(1, len(store) // 1000)]))
+            store.stats(store.select(since=middle, until=middle + 365 * 86400))
+        elif name == 'store_per_author':
+            store.author_counts()
+        elif name == 'store_per_weekday':
+            store.stats(store.select(authors=store.authors[:1])).by_weekday
+        elif name == 'store_subjects':
+            store.subjects_text()
+    seconds = time.perf_counter() - start
+    return seconds, (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline) * RSS_UNIT
+
+
+QUERIES = (
+    'git_log_scan', 'store_stats', 'store_date_range', 'store_per_author',
+    'store_per_weekday', 'store_subjects',
+)
+
+
+def main() -> int:
+    """Build the store and time each query in a fresh process."""
+    parser = argparse.ArgumentParser(description='Benchmark the columnar commit store')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--repo', help='Benchmark an existing repository instead of a synthetic one')
+    source.add_argument('--size', choices=list(SIZES), help='Synthetic repository preset')
+    source.add_argument('--commits', type=int, default=SIZES['medium'], help='Synthetic repository size')
+    parser.add_argument('--workdir', help='Keep generated repositories here and reuse them across runs')
+    args = parser.parse_args()
+
+    from commit_store import build_store
+    from stats_cache import get_head_sha
+
+    with tempfile.TemporaryDirectory(prefix='bench-store-') as tmp:
+        if args.repo:
+            repo = Path(args.repo).resolve()
+        else:
+            commits = SIZES[args.size] if args.size else args.commits
+            repo = Path(args.workdir or tmp) / f'synthetic-{commits}-a8'
+            if not (repo / '.git').exists():
+                generate_repo(repo, commits)
+
+        store_path = Path(tmp) / 'store'
+        start = time.perf_counter()
+        build_store(str(repo), store_path, get_head_sha(str(repo)))
+        size = sum(f.stat().st_size for f in store_path.iterdir())
+        logger.info("Built store in %.2fs (%.1f MB)", time.perf_counter() - start, size / 1e6)
+
+        logger.info("%-20s %10s %14s", 'query', 'wall', 'peak RSS added')
+        context = multiprocessing.get_context('spawn')
+        for name in QUERIES:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                seconds, rss = pool.submit(_query, name, str(repo), str(store_path)).result()
+            logger.info("%-20s %8.1fms %12.1f MB", name, seconds * 1000, rss / 1e6)
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
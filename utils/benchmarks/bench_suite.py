@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""End-to-end benchmark suite for the analysis and plotting paths.
+
+Runs every stage against a synthetic repository (see synthetic_repo.py)
+or an existing one, records wall times to a JSON results file and
+compares them with a baseline from an earlier run, flagging stages whose
+median got slower than ``--threshold``.
+
+Stages: log extraction, aggregation (with and without commit messages),
+``read_count_file`` on the three count files, each chart render, the
+word cloud and an MCP tool round-trip (skipped if the ``mcp`` package is
+missing; like the tool itself, it writes its chart into the repository
+directory). The chart cache is pointed at an empty directory with a zero
+byte budget so every render really renders.
+
+Usage:
+    python bench_suite.py --size medium --output bench.json
+    python bench_suite.py --size medium --baseline bench.json --output bench-new.json
+    python bench_suite.py --repo /path/to/repo --repeat 5
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+
+UTILS_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(UTILS_DIR / 'analysis'))
+sys.path.insert(0, str(UTILS_DIR / 'plotting'))
+sys.path.insert(0, str(UTILS_DIR))
+
+logger = logging.getLogger(__name__)
+from synthetic_repo import SIZES, generate_repo
+
+RESULTS_VERSION = 1
+DEFAULT_THRESHOLD = 0.15
+# Changes smaller than this are timer noise, whatever the ratio
+MIN_DELTA_SECONDS = 0.005
+COUNT_FILES = (
+    # (file, size, index min, index max, index offset) as read by the plot scripts
+    ('commit_counts.txt', 24, 0, 23, 0),
+    ('commit_counts_day.txt', 7, 0, 6, 0),
+    ('commit_counts_month.txt', 12, 1, 12, 1),
+)
+
+
+def time_stage(fn: Callable[[], object], repeat: int) -> dict:
+    """Run ``fn`` ``repeat`` times and summarize the wall times in seconds."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - start)
+    return {
+        'median_s': statistics.median(runs),
+        'min_s': min(runs),
+        'runs': [round(run, 6) for run in runs],
+    }
+
+
+def build_stages(repo: Path, workdir: Path) -> tuple[dict[str, Callable[[], object]], int]:
+    """Return the benchmark stages, in run order, for ``repo``.
+
+    Aggregation runs once up front so the render stages have data; the
+    timed aggregation stages repeat it.
+
+    Returns:
+        Tuple of (stage name -> callable, number of commits in ``repo``).
+    """
+    from charts import batch_jobs, run_job
+    from commit_stats import aggregate_repo, aggregate_repo_messages, write_count_files
+    from git_log import iter_commits
+    from plot_utils import read_count_file
+
+    stats, messages = aggregate_repo_messages(str(repo))
+    count_dir = workdir / 'counts'
+    write_count_files(stats, str(count_dir))
+
+    stages: dict[str, Callable[[], object]] = {
+        'log_extraction': lambda: sum(1 for _ in iter_commits(str(repo))),
+        'aggregation': lambda: aggregate_repo(str(repo)),
+        'aggregation_messages': lambda: aggregate_repo_messages(str(repo)),
+        'read_count_file': lambda: [
+            read_count_file(str(count_dir / name), *layout) for name, *layout in COUNT_FILES
+        ],
+    }
+    chart_dir = workdir / 'charts'
+    chart_dir.mkdir(exist_ok=True)
+    for job in batch_jobs(stats, 'bench', str(chart_dir), messages):
+        name = Path(job.output_file).stem.removesuffix('_bench')
+        stages[f'render_{name}'] = lambda job=job: run_job(job)
+
+    try:
+        import mcp_server
+    except ImportError:
+        logger.warning("mcp is not installed; skipping the MCP round-trip stage")
+    else:
+        stages['mcp_round_trip'] = lambda: _mcp_round_trip(mcp_server, repo)
+    return stages, stats.total_commits
+
+
+def _mcp_round_trip(mcp_server, repo: Path) -> None:
+    """Call the hour-chart tool the way an MCP client would, from inside ``repo``."""
+    cwd = os.getcwd()
+    os.chdir(repo)
+    try:
+        result = asyncio.run(mcp_server.mcp.call_tool('generate_hour_bar_chart', {}))
+    finally:
+        os.chdir(cwd)
+    content = result[0] if isinstance(result, tuple) else result
+    text = content[0].text
+    if text.startswith('Error'):
+        raise RuntimeError(text)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Log each stage against ``baseline`` and return the names that regressed.
+
+    A stage regresses when its median is more than ``threshold`` (a
+    fraction) and ``MIN_DELTA_SECONDS`` slower than the baseline median.
+    """
+    if results['repo']['commits'] != baseline.get('repo', {}).get('commits'):
+        logger.warning(
+            "Baseline was measured on %s commits, this run on %d; timings are not comparable",
+            baseline.get('repo', {}).get('commits'), results['repo']['commits']
+        )
+    regressions = []
+    logger.info("%-28s %12s %12s %9s", 'stage', 'baseline', 'current', 'change')
+    for name, current in results['stages'].items():
+        previous = baseline.get('stages', {}).get(name)
+        if previous is None:
+            logger.info("%-28s %12s %10.1fms %9s", name, '-', current['median_s'] * 1000, 'new')
+            continue
+        before, after = previous['median_s'], current['median_s']
+        change = after / before - 1 if before else 0.0
+        regressed = change > threshold and after - before > MIN_DELTA_SECONDS
+        logger.info(
+            "%-28s %10.1fms %10.1fms %+8.1f%%%s", name, before * 1000, after * 1000,
+            change * 100, '  REGRESSION' if regressed else ''
+        )
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> int:
+    """Run the suite, write results and compare with a baseline."""
+    parser = argparse.ArgumentParser(description='Benchmark the analysis and plotting paths')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--repo', help='Benchmark an existing repository instead of a synthetic one')
+    source.add_argument('--size', choices=list(SIZES), help='Synthetic repository preset')
+    source.add_argument('--commits', type=int, default=SIZES['small'], help='Synthetic repository size')
+    parser.add_argument('--authors', type=int, default=8, help='Authors in the synthetic repository')
+    parser.add_argument('--workdir', help='Keep generated repositories here and reuse them across runs')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per stage (median is compared)')
+    parser.add_argument('--stages', nargs='+', help='Only run stages with these names')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--baseline', help='Compare with results from an earlier run')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Fractional slowdown that counts as a regression (default: 0.15)')
+    args = parser.parse_args()
+
+    for noisy in ('plot_utils', 'generate_wordcloud', 'stats_cache', 'matplotlib'):
+        logging.getLogger(noisy).setLevel(logging.WARNING)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    with tempfile.TemporaryDirectory(prefix='bench-suite-') as tmp:
+        workdir = Path(tmp)
+        # Every render must miss: empty cache directory, nothing retained
+        os.environ['GIT_CHARTS_CACHE_DIR'] = str(workdir / 'chart-cache')
+        os.environ['GIT_CHARTS_CACHE_MAX_BYTES'] = '0'
+
+        if args.repo:
+            repo = Path(args.repo).resolve()
+        else:
+            commits = SIZES[args.size] if args.size else args.commits
+            repo = Path(args.workdir or workdir) / f'synthetic-{commits}-a{args.authors}'
+            if not (repo / '.git').exists():
+                start = time.perf_counter()
+                generate_repo(repo, commits, args.authors)
+                logger.info("Generated %d commits in %.1fs", commits, time.perf_counter() - start)
+
+        stages, commits = build_stages(repo, workdir)
+        if args.stages:
+            stages = {name: fn for name, fn in stages.items() if name in args.stages}
+        results = {
+            'version': RESULTS_VERSION,
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'machine': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpus': os.cpu_count(),
+            },
+            'repo': {
+                'path': str(repo),
+                'synthetic': not args.repo,
+                'commits': commits,
+            },
+            'stages': {},
+        }
+        for name, fn in stages.items():
+            results['stages'][name] = summary = time_stage(fn, args.repeat)
+            logger.info("%-28s median %10.1f ms  min %10.1f ms", name, summary['median_s'] * 1000, summary['min_s'] * 1000)
+
+        executor = getattr(sys.modules.get('mcp_server'), '_executor', None)
+        if executor is not None:
+            executor.shutdown()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        logger.info("Results written to %s", args.output)
+    if baseline is not None and compare(results, baseline, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Benchmark rendering many hour charts with and without a figure template.
+
+Renders ``--charts`` hour-of-day bar charts from random counts, first by
+building a fresh figure per chart (``create_bar_chart`` + ``save_chart``),
+then by updating one ``BarChartTemplate``. Output goes to in-memory
+buffers so disk speed does not blur the comparison; the chart cache is
+not involved.
+
+Usage:
+    python bench_templates.py --charts 500 --dpi 100
+"""
+import argparse
+import io
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'plotting'))
+
+logger = logging.getLogger(__name__)
+from plot_commits_by_hour import FIGSIZE, HOUR_LABELS
+from plot_utils import BarChartTemplate, create_bar_chart, save_chart
+
+XLABEL = 'Hour of Day (0-23)'
+YLABEL = 'Number of Commits'
+
+
+def render_fresh(all_counts: np.ndarray, dpi: int) -> float:
+    """Build, save and close a new figure per chart; return seconds."""
+    start = time.perf_counter()
+    for i, counts in enumerate(all_counts):
+        create_bar_chart(HOUR_LABELS, counts, XLABEL, YLABEL, f'Repo {i}', FIGSIZE)
+        save_chart(io.BytesIO(), dpi)
+    return time.perf_counter() - start
+
+
+def render_template(all_counts: np.ndarray, dpi: int) -> float:
+    """Update and save one template per chart; return seconds (including setup)."""
+    start = time.perf_counter()
+    template = BarChartTemplate(HOUR_LABELS, XLABEL, YLABEL, FIGSIZE)
+    for i, counts in enumerate(all_counts):
+        template.update(counts, f'Repo {i}').save(io.BytesIO(), dpi)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    """Time both rendering strategies."""
+    parser = argparse.ArgumentParser(description='Benchmark figure templates')
+    parser.add_argument('--charts', type=int, default=500, help='Number of hour charts to render')
+    parser.add_argument('--dpi', type=int, default=100, help='Output resolution')
+    args = parser.parse_args()
+
+    # Quiet per-chart "Chart saved" and categorical-axis messages
+    logging.getLogger('plot_utils').setLevel(logging.WARNING)
+    logging.getLogger('matplotlib').setLevel(logging.WARNING)
+    rng = np.random.default_rng(0)
+    all_counts = rng.integers(0, 10 ** rng.integers(1, 5, args.charts)[:, None], (args.charts, 24))
+
+    fresh = render_fresh(all_counts, args.dpi)
+    templated = render_template(all_counts, args.dpi)
+    logger.info("%d hour charts at %d dpi", args.charts, args.dpi)
+    logger.info("fresh figure per chart: %6.2fs (%5.1f ms/chart)", fresh, fresh / args.charts * 1000)
+    logger.info("reused template:        %6.2fs (%5.1f ms/chart)", templated, templated / args.charts * 1000)
+    logger.info("speedup: %.2fx", fresh / templated)
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Benchmark word-cloud token counting across worker counts.
+
+Writes a synthetic commit-message corpus, counts it with the streaming
+single-process tokenizer, then with ``count_words_parallel`` at each
+worker count. Reports speedup and parallel efficiency, checks that every
+run produces identical counts, and times an incremental update after
+appending new messages.
+
+Usage:
+    python bench_wordcount.py --megabytes 200 --workers 1 2 4 8 16 32
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'plotting'))
+
+logger = logging.getLogger(__name__)
+from generate_wordcloud import count_words_in_file, count_words_parallel, update_counts
+
+VOCABULARY = (
+    'Fix flaky cache test in chart renderer for month pie', 'feat(mcp): add async render pool',
+    'Refactor commit aggregation into single pass', 'docs: update README.md with usage',
+    'Bump numpy to 2.1 and pin matplotlib backend', 'chore: remove unused helpers from plot_utils.py',
+    'Handle rewritten history in incremental stats cache', 'perf: reuse keep-alive connections',
+    'Merge pull request #123 from feature/wordcloud-streaming', 'See https://example.com/issue/42 for details',
+)
+
+
+def write_corpus(path: Path, megabytes: int, seed: int = 0) -> None:
+    """Write roughly ``megabytes`` MB of synthetic commit messages."""
+    rng = random.Random(seed)
+    target = megabytes * 1024 * 1024
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        while written < target:
+            lines = [f"{rng.choice(VOCABULARY)} {rng.randrange(10_000)}\n" for _ in range(10_000)]
+            block = ''.join(lines)
+            f.write(block)
+            written += len(block)
+
+
+def main() -> int:
+    """Time counting at each worker count and an incremental append."""
+    parser = argparse.ArgumentParser(description='Benchmark parallel word counting')
+    parser.add_argument('--megabytes', type=int, default=64, help='Synthetic corpus size')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1],
+                        help='Worker counts to time')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = Path(tmp) / 'commit_messages.txt'
+        write_corpus(corpus, args.megabytes)
+
+        start = time.perf_counter()
+        baseline = count_words_in_file(str(corpus))
+        serial_seconds = time.perf_counter() - start
+        logger.info("%d MB corpus, %d distinct tokens, %d CPUs", args.megabytes, len(baseline), os.cpu_count())
+        logger.info("%-12s %8.2fs", 'streaming', serial_seconds)
+
+        mismatched = False
+        for workers in sorted(set(args.workers)):
+            start = time.perf_counter()
+            counts = count_words_parallel(str(corpus), workers)
+            seconds = time.perf_counter() - start
+            speedup = serial_seconds / seconds
+            logger.info(
+                "%-12s %8.2fs  speedup %5.2fx  efficiency %3.0f%%",
+                f"{workers} workers", seconds, speedup, 100 * speedup / workers
+            )
+            if counts != baseline:
+                logger.error("Counts with %d workers differ from the streaming count", workers)
+                mismatched = True
+
+        counts_file = Path(tmp) / 'word_counts.json'
+        workers = max(args.workers)
+        update_counts(str(corpus), str(counts_file), workers)
+        write_corpus(Path(tmp) / 'new.txt', 1, seed=1)
+        with open(corpus, 'a', encoding='utf-8') as f:
+            f.write((Path(tmp) / 'new.txt').read_text(encoding='utf-8'))
+        start = time.perf_counter()
+        counts = update_counts(str(corpus), str(counts_file), workers)
+        logger.info("%-12s %8.2fs  (1 MB appended)", 'incremental', time.perf_counter() - start)
+        if counts != count_words_in_file(str(corpus)):
+            logger.error("Incremental counts differ from a full recount")
+            mismatched = True
+
+    return 1 if mismatched else 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
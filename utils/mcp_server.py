@@ -1,54 +1,144 @@
 """MCP server for generating git commit visualization charts.
 
 Provides tools for generating bar and pie charts showing commit distributions
-by hour, day of week, and month for the current git repository.
+by hour, day of week, and month for the current git repository. Charts
+can also be returned inline as images instead of being written to files.
+
+Rendering runs in a bounded pool of worker processes (matplotlib is not
+thread-safe) so the event loop stays free and concurrent requests render in
+parallel. Workers are long-lived and keep matplotlib warm between calls.
+
+Every tool call is traced (see ``telemetry``): each stage gets a span with
+wall and CPU time, peak RSS and bytes written, including the draw and
+encode spans inside the render workers. The ``stats`` tool reports rolling
+p50/p95 wall times per tool and stage.
+
+Environment:
+    GIT_CHARTS_MAX_WORKERS: Maximum concurrent renders (default: min(4, CPUs))
+    GIT_CHARTS_TIMEOUT: Per-request timeout in seconds (default: 60)
+    GIT_CHARTS_SPANS_FILE, GIT_CHARTS_OTLP_FILE, GIT_CHARTS_STATS_WINDOW:
+        Span export and statistics (see ``telemetry``)
 """
-import subprocess
-from mcp.server.fastmcp import FastMCP
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / 'analysis'))
+sys.path.insert(0, str(Path(__file__).parent / 'plotting'))
+
+from mcp.server.fastmcp import FastMCP, Image
+from mcp.server.fastmcp.exceptions import ToolError
+from charts import batch_jobs, chart_counts, fetch_cached, render_chart, render_chart_bytes, run_job
+from plot_utils import OUTPUT_PROFILES, resolve_profiles
+from commit_stats import aggregate_repo_messages
 from repo_utils import get_repo_name
+from stats_cache import load_stats
+from telemetry import adopt, current_parent, get_stats, run_traced, span, trace
+
+MAX_WORKERS = int(os.environ.get("GIT_CHARTS_MAX_WORKERS", min(4, os.cpu_count() or 1)))
+REQUEST_TIMEOUT = float(os.environ.get("GIT_CHARTS_TIMEOUT", 60))
 
 mcp = FastMCP("git_commit_charts")
 
+CHART_TITLES = {
+    "commits_by_hour": "Git Commits by Hour of Day for {repo_name}",
+    "commits_by_day": "Commits by Day of Week for {repo_name}",
+    "commits_by_month": "Commits by Month for {repo_name}",
+}
+# Image format -> MIME subtype where they differ
+MIME_SUBTYPES = {"svg": "svg+xml"}
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Return the shared render pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        # spawn, not fork: the event loop's helper threads may hold locks at fork time
+        _executor = ProcessPoolExecutor(
+            max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+async def _in_thread(stage: str, fn: Callable, *args):
+    """Run a blocking call in a thread inside a span named ``stage``."""
+    with span(stage):
+        return await asyncio.to_thread(fn, *args)
 
-def _generate_chart(
+
+async def _in_pool(stage: str, fn: Callable, *args):
+    """Run ``fn`` in the render pool inside a span named ``stage``.
+
+    The worker's own spans join the trace. The ``dispatch_s`` attribute is
+    the time not spent in the worker: queueing, pickling and, for a fresh
+    worker, process start-up.
+    """
+    with span(stage) as pooled:
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        result, records = await loop.run_in_executor(
+            _get_executor(), run_traced, current_parent(), "worker", fn, *args
+        )
+        pooled.set(dispatch_s=time.perf_counter() - start - adopt(records))
+    return result
+
+
+async def _generate_chart(
+    tool: str,
     chart_type: str,
-    data_script: str,
-    plot_script: str,
     title_template: str
 ) -> str:
     """
     Common helper for generating charts.
 
+    Git calls run in a thread and rendering in the process pool, all under
+    a single ``REQUEST_TIMEOUT``. Renders still queued when the request
+    times out or is cancelled are dropped from the pool.
+
     Args:
-        chart_type: Type of chart (e.g., "hour bar chart", "day pie chart")
-        data_script: Shell script to collect data
-        plot_script: Python script to generate the plot
+        tool: Tool name the call is traced under
+        chart_type: Type of chart, a key into ``charts.CHARTS``
         title_template: Title template with {repo_name} placeholder
 
     Returns:
         Success message with output file path or error message
     """
-    try:
-        repo_name = get_repo_name()
-        if not repo_name:
-            return "Error: Could not determine repository name"
+    with trace(tool, chart_type=chart_type) as root:
+        try:
+            async with asyncio.timeout(REQUEST_TIMEOUT):
+                repo_name = await _in_thread("get_repo_name", get_repo_name)
+                if not repo_name:
+                    root.fail("Could not determine repository name")
+                    return "Error: Could not determine repository name"
 
-        # Run data collection script
-        subprocess.run([data_script], check=True)
+                # Refresh cached stats (only commits since the last call are scanned)
+                stats = await _in_thread("load_stats", load_stats)
 
-        # Generate output filename and title
-        output_file = f"{chart_type.replace(' ', '_')}_{repo_name}.png"
-        title = title_template.format(repo_name=repo_name)
+                # Generate output filename and title
+                output_file = f"{chart_type.replace(' ', '_')}_{repo_name}.png"
+                title = title_template.format(repo_name=repo_name)
 
-        # Run plotting script
-        subprocess.run(
-            ["/opt/homebrew/bin/python3", plot_script, f"--output={output_file}", f"--title={title}"],
-            check=True
-        )
+                # Identical charts for the same repo state are served from the cache
+                counts = chart_counts(chart_type, stats)
+                hit = await _in_thread("fetch_cached", fetch_cached, chart_type, counts, title, output_file)
+                root.set(cache_hit=hit)
+                if not hit:
+                    await _in_pool("render", render_chart, chart_type, counts, output_file, title)
 
-        return f"{chart_type.capitalize()} generated at {output_file}"
-    except Exception as e:
-        return f"Error generating {chart_type}: {str(e)}"
+            return f"{chart_type.capitalize()} generated at {output_file}"
+        except TimeoutError as e:
+            root.fail(e)
+            return f"Error generating {chart_type}: timed out after {REQUEST_TIMEOUT:g}s"
+        except Exception as e:
+            root.fail(e)
+            return f"Error generating {chart_type}: {str(e)}"
 
 
 @mcp.tool()
@@ -58,11 +148,10 @@ async def generate_hour_bar_chart() -> str:
     Returns:
         Success message with output file path or error message.
     """
-    return _generate_chart(
+    return await _generate_chart(
+        tool="generate_hour_bar_chart",
         chart_type="commits_by_hour",
-        data_script="./commits_by_hour.sh",
-        plot_script="plot_commits_by_hour.py",
-        title_template="Git Commits by Hour of Day for {repo_name}"
+        title_template=CHART_TITLES["commits_by_hour"]
     )
 
 
@@ -73,11 +162,10 @@ async def generate_day_pie_chart() -> str:
     Returns:
         Success message with output file path or error message.
     """
-    return _generate_chart(
+    return await _generate_chart(
+        tool="generate_day_pie_chart",
         chart_type="commits_by_day",
-        data_script="./commits_by_day_of_week.sh",
-        plot_script="plot_pie_day.py",
-        title_template="Commits by Day of Week for {repo_name}"
+        title_template=CHART_TITLES["commits_by_day"]
     )
 
 
@@ -88,12 +176,91 @@ async def generate_month_pie_chart() -> str:
     Returns:
         Success message with output file path or error message.
     """
-    return _generate_chart(
+    return await _generate_chart(
+        tool="generate_month_pie_chart",
         chart_type="commits_by_month",
-        data_script="./commits_by_month.sh",
-        plot_script="plot_pie_month.py",
-        title_template="Commits by Month for {repo_name}"
+        title_template=CHART_TITLES["commits_by_month"]
     )
 
+
+@mcp.tool()
+async def generate_all_charts() -> str:
+    """Generate every chart and the commit word cloud in one batch.
+
+    The history is aggregated once and the charts render in parallel in
+    the worker pool.
+
+    Returns:
+        Success message listing the output files or error message.
+    """
+    with trace("generate_all_charts") as root:
+        try:
+            async with asyncio.timeout(REQUEST_TIMEOUT):
+                repo_name = await _in_thread("get_repo_name", get_repo_name)
+                if not repo_name:
+                    root.fail("Could not determine repository name")
+                    return "Error: Could not determine repository name"
+
+                stats, messages = await _in_thread("aggregate", aggregate_repo_messages)
+                outputs = await asyncio.gather(*(
+                    _in_pool("render", run_job, job)
+                    for job in batch_jobs(stats, repo_name, output_dir='.', messages=messages)
+                ))
+
+            return "All charts generated: " + ", ".join(path for paths in outputs for path in paths)
+        except TimeoutError as e:
+            root.fail(e)
+            return f"Error generating all charts: timed out after {REQUEST_TIMEOUT:g}s"
+        except Exception as e:
+            root.fail(e)
+            return f"Error generating all charts: {str(e)}"
+
+
+@mcp.tool()
+async def get_chart_image(chart_type: str = "commits_by_hour", profile: str = "web") -> Image:
+    """Render a chart and return it inline instead of writing a file.
+
+    Args:
+        chart_type: One of "commits_by_hour", "commits_by_day", "commits_by_month"
+        profile: Output profile: "thumbnail", "web" or "print" (PNG), "svg" or "webp"
+
+    Returns:
+        The encoded chart image.
+    """
+    if chart_type not in CHART_TITLES:
+        raise ToolError(f"Unknown chart type {chart_type!r} (choose from {', '.join(CHART_TITLES)})")
+    try:
+        resolved = resolve_profiles([profile])
+    except ValueError:
+        raise ToolError(f"Unknown profile {profile!r} (choose from {', '.join(OUTPUT_PROFILES)})")
+    if not resolved:
+        raise ToolError(f"{profile} output is not available (Pillow without WebP support)")
+    with trace("get_chart_image", chart_type=chart_type, profile=profile):
+        try:
+            async with asyncio.timeout(REQUEST_TIMEOUT):
+                repo_name = await _in_thread("get_repo_name", get_repo_name)
+                if not repo_name:
+                    raise ToolError("Could not determine repository name")
+                stats = await _in_thread("load_stats", load_stats)
+                data = await _in_pool(
+                    "render", render_chart_bytes, chart_type, chart_counts(chart_type, stats),
+                    CHART_TITLES[chart_type].format(repo_name=repo_name), profile
+                )
+        except TimeoutError:
+            raise ToolError(f"Rendering {chart_type} timed out after {REQUEST_TIMEOUT:g}s")
+    image_format = OUTPUT_PROFILES[profile].format
+    return Image(data=data, format=MIME_SUBTYPES.get(image_format, image_format))
+
+
+@mcp.tool(name="stats")
+async def tool_stats() -> str:
+    """Report rolling p50/p95 wall times per tool and per pipeline stage.
+
+    Returns:
+        One line per tool with call and error counts, then one per stage.
+    """
+    return get_stats().report()
+
+
 if __name__ == "__main__":
-    mcp.run()
\ No newline at end of file
+    mcp.run()
@@ -0,0 +1,148 @@
+"""Content-addressed cache of rendered charts with LRU eviction.
+
+Charts are keyed by (chart type, data, title, dpi, figsize), so identical
+requests for the same repository state reuse the PNG instead of
+re-rasterizing it. Entries are plain files named by key; a hit refreshes the
+file's mtime and eviction removes the least recently used files until the
+cache fits its byte budget. Writes are atomic, so the cache can be shared
+between processes (plot_repo.py, the plot_* scripts and the MCP workers).
+
+Environment:
+    GIT_CHARTS_CACHE_DIR: Cache directory (default: ~/.cache/git-commit-viz/charts)
+    GIT_CHARTS_CACHE_MAX_BYTES: Byte budget (default: 256 MiB)
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'git-commit-viz' / 'charts'
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Bump when rendering code changes so stale images are not served
+CACHE_VERSION = 1
+
+
+def chart_key(
+    chart_type: str,
+    data,
+    title: str,
+    dpi: int,
+    figsize: tuple[float, float],
+    suffix: str = '.png'
+) -> str:
+    """Return the content address for a rendered chart.
+
+    Args:
+        chart_type: Chart type name (e.g. "commits_by_hour")
+        data: JSON-serializable chart data; NumPy arrays and scalars are allowed
+        title: Chart title
+        dpi: Output resolution
+        figsize: Figure size (width, height)
+        suffix: File extension of the rendered output
+    """
+    payload = json.dumps(
+        [CACHE_VERSION, chart_type, data, title, dpi, list(figsize), suffix],
+        default=lambda o: o.tolist()
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest() + suffix
+
+
+class ChartCache:
+    """Directory of rendered charts evicted by total size, least recently used first."""
+
+    def __init__(self, cache_dir: str | Path | None = None, max_bytes: int | None = None) -> None:
+        self.cache_dir = Path(cache_dir or os.environ.get('GIT_CHARTS_CACHE_DIR') or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes if max_bytes is not None else int(
+            os.environ.get('GIT_CHARTS_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+        )
+
+    def get_path(self, key: str) -> Path | None:
+        """Return the cached file for ``key`` and mark it recently used."""
+        path = self.cache_dir / key
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def get_bytes(self, key: str) -> bytes | None:
+        """Return the cached contents for ``key``, or None on a miss."""
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:  # evicted by another process
+            return None
+
+    def fetch(self, key: str, output_file: str | Path) -> bool:
+        """Copy the cached chart for ``key`` to ``output_file``.
+
+        Returns:
+            True on a cache hit, False otherwise.
+        """
+        path = self.get_path(key)
+        if path is None:
+            return False
+        try:
+            shutil.copyfile(path, output_file)
+        except FileNotFoundError:  # evicted by another process
+            return False
+        return True
+
+    def put_bytes(self, key: str, data: bytes) -> Path:
+        """Store ``data`` under ``key`` and evict entries over budget."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.cache_dir / key)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.evict()
+        return self.cache_dir / key
+
+    def put_file(self, key: str, source: str | Path) -> Path:
+        """Store a copy of ``source`` under ``key`` and evict entries over budget."""
+        return self.put_bytes(key, Path(source).read_bytes())
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits ``max_bytes``."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.tmp') or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            logger.debug("Evicted %s from chart cache", path)
+
+
+_default_cache: ChartCache | None = None
+
+
+def get_chart_cache() -> ChartCache:
+    """Return the process-wide cache configured from the environment."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ChartCache()
+    return _default_cache
@@ -0,0 +1,228 @@
+"""Registry of chart types renderable from aggregated ``CommitStats``.
+
+Kept free of server state so ``render_chart`` and ``run_job`` can be pickled
+by reference and run inside worker processes.
+"""
+import io
+import multiprocessing
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+import plot_commits_by_hour
+import plot_pie_day
+import plot_pie_day_month
+import plot_pie_month
+from plot_avg_commits import plot_bar_chart
+from plot_utils import Target, profile_outputs
+from chart_cache import chart_key, get_chart_cache
+from constants import SAVE_DPI_HIGH
+
+
+class ChartSpec(NamedTuple):
+    """How to render one chart type.
+
+    Attributes:
+        plot_fn: Plot function accepting ``output_file``, ``title`` and counts
+        counts_kwarg: Keyword through which ``plot_fn`` takes pre-aggregated counts
+        stats_attr: ``CommitStats`` attribute holding those counts
+        figsize: Figure size the plot function renders at (part of the cache key)
+    """
+    plot_fn: Callable[..., None]
+    counts_kwarg: str
+    stats_attr: str
+    figsize: tuple[float, float]
+
+
+CHARTS = {
+    plot_commits_by_hour.CHART_TYPE: ChartSpec(
+        plot_commits_by_hour.plot_commits_by_hour, "hour_counts", "by_hour",
+        plot_commits_by_hour.FIGSIZE
+    ),
+    plot_pie_day.CHART_TYPE: ChartSpec(
+        plot_pie_day.plot_pie_day, "day_counts", "by_weekday", plot_pie_day.FIGSIZE
+    ),
+    plot_pie_month.CHART_TYPE: ChartSpec(
+        plot_pie_month.plot_pie_month, "month_counts", "by_month", plot_pie_month.FIGSIZE
+    ),
+}
+
+
+def chart_counts(chart_type: str, stats) -> Sequence[int]:
+    """Return the counts ``chart_type`` is drawn from.
+
+    Args:
+        chart_type: Key into ``CHARTS``
+        stats: Aggregated ``CommitStats``
+    """
+    return getattr(stats, CHARTS[chart_type].stats_attr)
+
+
+def fetch_cached(
+    chart_type: str,
+    counts: Sequence[int],
+    title: str,
+    output_file: str | Path
+) -> bool:
+    """Copy a previously rendered chart to ``output_file`` without rendering.
+
+    Returns:
+        True if the chart cache held an identical chart, False otherwise.
+    """
+    key = chart_key(chart_type, counts, title, SAVE_DPI_HIGH, CHARTS[chart_type].figsize)
+    return get_chart_cache().fetch(key, output_file)
+
+
+def render_chart(
+    chart_type: str,
+    counts: Sequence[int],
+    output_file: Target,
+    title: str,
+    profiles: Sequence[str] | None = None
+) -> None:
+    """Render a chart from pre-aggregated counts.
+
+    Args:
+        chart_type: Key into ``CHARTS``
+        counts: Counts returned by ``chart_counts``
+        output_file: Path to save the chart, or a binary file object
+        title: Chart title
+        profiles: Output profile names (see ``plot_utils.OUTPUT_PROFILES``)
+    """
+    spec = CHARTS[chart_type]
+    spec.plot_fn(output_file=output_file, title=title, profiles=profiles, **{spec.counts_kwarg: counts})
+
+
+def render_chart_bytes(
+    chart_type: str,
+    counts: Sequence[int],
+    title: str,
+    profile: str = 'web'
+) -> bytes:
+    """Render a chart in memory and return the encoded image.
+
+    Goes through the chart cache like ``render_chart``, but nothing is
+    written outside it.
+
+    Args:
+        chart_type: Key into ``CHARTS``
+        counts: Counts returned by ``chart_counts``
+        title: Chart title
+        profile: Output profile name (see ``plot_utils.OUTPUT_PROFILES``)
+    """
+    buffer = io.BytesIO()
+    render_chart(chart_type, counts, buffer, title, profiles=[profile])
+    return buffer.getvalue()
+
+
+class RenderJob(NamedTuple):
+    """One chart in a batch render.
+
+    Attributes:
+        fn: Plot function to call
+        kwargs: Keyword arguments for ``fn``
+        output_file: Path the chart is written to
+    """
+    fn: Callable[..., None]
+    kwargs: dict[str, Any]
+    output_file: str
+
+
+def batch_jobs(
+    stats,
+    repo_name: str,
+    output_dir: str = 'images',
+    messages: str | None = None,
+    profiles: Sequence[str] | None = None
+) -> list[RenderJob]:
+    """Build the render jobs for every chart of a repository.
+
+    Args:
+        stats: Aggregated ``CommitStats``
+        repo_name: Repository name used in titles and filenames
+        output_dir: Directory for the rendered charts
+        messages: Commit message text for the word cloud; omitted if None
+        profiles: Output profile names for the charts; the word cloud is
+            always a single PNG
+    """
+    out = Path(output_dir)
+    categories, days = stats.bucket_distribution()
+    jobs = [
+        RenderJob(plot_commits_by_hour.plot_commits_by_hour, {
+            'title': f'Git Commits by Hour of Day for {repo_name}',
+            'hour_counts': stats.by_hour,
+        }, str(out / f'commits_by_hour_{repo_name}.png')),
+        RenderJob(plot_pie_day.plot_pie_day, {
+            'title': f'Commits by Day of Week for {repo_name}',
+            'day_counts': stats.by_weekday,
+        }, str(out / f'commits_by_day_{repo_name}.png')),
+        RenderJob(plot_pie_month.plot_pie_month, {
+            'title': f'Commits by Month for {repo_name}',
+            'month_counts': stats.by_month,
+        }, str(out / f'commits_by_month_{repo_name}.png')),
+        RenderJob(plot_pie_day_month.plot_pie_day_month, {
+            'title': f'Commits by Day of Week and Month for {repo_name}',
+            'day_counts': stats.by_weekday,
+            'month_counts': stats.by_month,
+        }, str(out / f'commits_by_day_month_{repo_name}.png')),
+        RenderJob(plot_bar_chart, {
+            'categories': categories,
+            'days': days,
+        }, str(out / f'average_commits_{repo_name}.png')),
+    ]
+    if profiles is not None:
+        jobs = [job._replace(kwargs={**job.kwargs, 'profiles': profiles}) for job in jobs]
+    if messages is not None:
+        # Imported here so chart-only callers don't need wordcloud installed
+        from generate_wordcloud import generate_wordcloud
+        jobs.append(RenderJob(
+            generate_wordcloud, {'text': messages},
+            str(out / f'commit_wordcloud_{repo_name}.png')
+        ))
+    return jobs
+
+
+def run_job(job: RenderJob) -> list[str]:
+    """Render one batch job and return its output paths."""
+    job.fn(output_file=job.output_file, **job.kwargs)
+    profiles = job.kwargs.get('profiles')
+    if profiles is None:
+        return [job.output_file]
+    return [str(target) for target, _ in profile_outputs(job.output_file, profiles)]
+
+
+def render_all(
+    stats,
+    repo_name: str,
+    output_dir: str = 'images',
+    messages: str | None = None,
+    parallel: bool = False,
+    max_workers: int | None = None,
+    profiles: Sequence[str] | None = None
+) -> list[str]:
+    """Render every chart from one aggregation.
+
+    Sequential mode renders in this process with a single matplotlib
+    session; parallel mode spreads the charts across worker processes.
+
+    Args:
+        stats: Aggregated ``CommitStats``
+        repo_name: Repository name used in titles and filenames
+        output_dir: Directory for the rendered charts
+        messages: Commit message text for the word cloud; omitted if None
+        parallel: Render charts concurrently in a process pool
+        max_workers: Pool size for parallel mode (default: CPU count)
+        profiles: Output profile names for the charts (see ``batch_jobs``)
+
+    Returns:
+        Paths of the rendered charts.
+    """
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    jobs = batch_jobs(stats, repo_name, output_dir, messages, profiles)
+    if not parallel:
+        return [path for job in jobs for path in run_job(job)]
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')
+    ) as pool:
+        return [path for paths in pool.map(run_job, jobs) for path in paths]
@@ -1,13 +1,30 @@
 #!/usr/bin/env python3
-"""Generate a word cloud from commit messages."""
+"""Generate a word cloud from commit messages.
 
+Messages are tokenized one line at a time with a single precompiled
+pattern and counted, and the word cloud is drawn from those frequencies,
+so memory grows with the vocabulary rather than the corpus.
+
+Large inputs can be split into newline-aligned byte ranges and counted in
+a process pool. Counts persist to a JSON file together with how much of the
+input they cover, so later runs only count what was appended since.
+
+Usage:
+    python generate_wordcloud.py commit_messages.txt --workers 32 --counts word_counts.json
+"""
+
+import argparse
+import hashlib
+import json
 import logging
+import os
 import re
 import sys
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
+from typing import TYPE_CHECKING, Iterable
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'config'))
 
@@ -16,6 +33,10 @@ from constants import (
     WORDCLOUD_WIDTH, WORDCLOUD_HEIGHT, WORDCLOUD_MAX_FONT_SIZE, WORDCLOUD_PREFER_HORIZONTAL,
     FIGURE_WIDTH_LARGE, FIGURE_HEIGHT, SAVE_DPI_STANDARD
 )
+from plot_utils import get_pyplot
+
+if TYPE_CHECKING:
+    from wordcloud import WordCloud
 
 # Stopwords to exclude from word cloud
 STOPWORDS = {
@@ -35,40 +56,226 @@ STOPWORDS = {
 }
 
 
-def _clean_commit_text(text: str) -> str:
-    """Clean commit message text for word cloud generation."""
-    # Remove conventional commit prefixes
-    text = re.sub(r'\b(fix|feat|docs|style|refactor|chore|test|perf|ci|build)\b', '', text, flags=re.IGNORECASE)
-    # Remove scope parentheses content but keep the word
-    text = re.sub(r'\(([^)]+)\):', r'\1', text)
-    # Remove URLs
-    text = re.sub(r'https?://\S+', '', text)
-    # Remove file paths
-    text = re.sub(r'[\w/]+\.(js|ts|tsx|jsx|scss|css|html|md|json|yml|yaml|py|sh)', '', text)
-    # Remove numbers
-    text = re.sub(r'\b\d+\b', '', text)
-    # Remove special characters but keep spaces
-    return re.sub(r'[^\w\s]', ' ', text)
-
-
-def _create_wordcloud(text: str) -> WordCloud:
-    """Create a WordCloud object from cleaned text."""
+# Ranges are capped at this size so each worker's buffer stays small
+CHUNK_BYTES = 8 * 1024 * 1024
+# Bytes before the counted offset that must be unchanged for an incremental update
+FINGERPRINT_BYTES = 4096
+COUNTS_VERSION = 2
+
+# Conventional commit types, dropped wherever they appear
+COMMIT_TYPES = {'fix', 'feat', 'docs', 'style', 'refactor', 'chore', 'test', 'perf', 'ci', 'build'}
+
+# One pass per line: URLs and file paths are matched whole so they can be
+# skipped; everything else that is a word becomes a token. Words are
+# matched like WordCloud.generate does: at least two characters, with
+# apostrophes kept inside contractions
+TOKEN_PATTERN = re.compile(
+    r'https?://\S+'
+    r'|[\w/]+\.(?:js|ts|tsx|jsx|scss|css|html|md|json|yml|yaml|py|sh)\b'
+    r"|(?P<word>\w[\w']+)"
+)
+
+
+def count_words(lines: Iterable[str], counts: Counter | None = None) -> Counter:
+    """Count word tokens in commit message lines.
+
+    Tokens keep their original case so the most common spelling can be
+    shown. A trailing possessive ``'s`` is stripped, and stopwords, commit
+    types and bare numbers are skipped.
+
+    Args:
+        lines: Commit message lines (any iterable, e.g. an open file)
+        counts: Counter to accumulate into (default: a new one)
+
+    Returns:
+        The updated counter.
+    """
+    counts = Counter() if counts is None else counts
+    skip = STOPWORDS | COMMIT_TYPES
+    for line in lines:
+        for match in TOKEN_PATTERN.finditer(line):
+            word = match.group('word')
+            if word and word[-2:].lower() == "'s":
+                word = word[:-2]
+            if word and not word.isdigit() and word.lower() not in skip:
+                counts[word] += 1
+    return counts
+
+
+def count_words_in_file(input_file: str) -> Counter:
+    """Stream ``input_file`` line by line and count its word tokens."""
+    with open(input_file, 'r', encoding='utf-8', errors='replace') as f:
+        return count_words(f)
+
+
+def chunk_ranges(input_file: str, chunks: int, start: int = 0) -> list[tuple[int, int]]:
+    """Split ``input_file`` from ``start`` to EOF into newline-aligned byte ranges.
+
+    Args:
+        input_file: Path to the text file
+        chunks: Minimum number of ranges; more are used so none exceeds ``CHUNK_BYTES``
+        start: Byte offset to start from (must be at a line boundary)
+
+    Returns:
+        Contiguous (start, end) ranges covering the rest of the file.
+    """
+    size = os.path.getsize(input_file)
+    if size <= start:
+        return []
+    chunks = max(chunks, -(-(size - start) // CHUNK_BYTES))
+    step = -(-(size - start) // chunks)
+    bounds = [start]
+    with open(input_file, 'rb') as f:
+        while bounds[-1] + step < size:
+            # Move each boundary forward to just after the next newline
+            f.seek(bounds[-1] + step)
+            f.readline()
+            if f.tell() >= size:
+                break
+            bounds.append(f.tell())
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def count_words_in_range(input_file: str, start: int, end: int) -> Counter:
+    """Count word tokens in bytes ``[start, end)`` of ``input_file``."""
+    with open(input_file, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return count_words(data.decode('utf-8', errors='replace').splitlines())
+
+
+def count_words_parallel(input_file: str, max_workers: int | None = None, start: int = 0) -> Counter:
+    """Count word tokens from ``start`` to EOF in a process pool.
+
+    Args:
+        input_file: Path to the text file
+        max_workers: Pool size (default: CPU count)
+        start: Byte offset to start from (must be at a line boundary)
+
+    Returns:
+        The merged counts of every range.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    # A few ranges per worker evens out lines of uneven density
+    ranges = chunk_ranges(input_file, workers * 4, start)
+    counts = Counter()
+    if workers == 1 or len(ranges) <= 1:
+        for range_start, range_end in ranges:
+            counts.update(count_words_in_range(input_file, range_start, range_end))
+        return counts
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for partial in pool.map(
+            count_words_in_range, [input_file] * len(ranges), *zip(*ranges)
+        ):
+            counts.update(partial)
+    return counts
+
+
+def _fingerprint(input_file: str, offset: int) -> str:
+    """Hash the bytes just before ``offset`` to detect a rewritten input."""
+    with open(input_file, 'rb') as f:
+        f.seek(max(0, offset - FINGERPRINT_BYTES))
+        return hashlib.sha256(f.read(min(offset, FINGERPRINT_BYTES))).hexdigest()
+
+
+def load_counts(counts_file: str) -> tuple[Counter, int, str] | None:
+    """Read persisted counts.
+
+    Returns:
+        (counts, bytes of input covered, fingerprint), or None if the file
+        is missing, unreadable or from another version.
+    """
+    try:
+        with open(counts_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('version') != COUNTS_VERSION:
+        return None
+    return Counter(data['counts']), data['offset'], data['fingerprint']
+
+
+def save_counts(counts_file: str, counts: Counter, offset: int, fingerprint: str) -> None:
+    """Atomically write counts and the input position they cover."""
+    path = Path(counts_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.json.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': COUNTS_VERSION, 'offset': offset,
+                'fingerprint': fingerprint, 'counts': counts
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def update_counts(input_file: str, counts_file: str, max_workers: int | None = None) -> Counter:
+    """Bring persisted counts up to date with ``input_file`` and save them.
+
+    When the input only grew (new commit messages appended), just the new
+    bytes are counted and merged; otherwise the whole file is recounted.
+    """
+    size = os.path.getsize(input_file)
+    cached = load_counts(counts_file)
+    counts, offset = Counter(), 0
+    if cached is not None:
+        cached_counts, cached_offset, fingerprint = cached
+        if cached_offset <= size and _fingerprint(input_file, cached_offset) == fingerprint:
+            counts, offset = cached_counts, cached_offset
+        else:
+            logger.info("%s changed since %s was written; recounting", input_file, counts_file)
+
+    if offset < size:
+        counts.update(count_words_parallel(input_file, max_workers, start=offset))
+        save_counts(counts_file, counts, size, _fingerprint(input_file, size))
+    return counts
+
+
+def word_frequencies(counts: Counter) -> dict[str, int]:
+    """Fold token counts the way ``WordCloud.generate`` does.
+
+    Case variants are merged under their most common spelling, and plurals
+    ending in a single 's' are merged into their singular when it occurs.
+    """
+    variants: dict[str, Counter] = {}
+    for word, count in counts.items():
+        variants.setdefault(word.lower(), Counter())[word] = count
+
+    frequencies = {}
+    for lower, spellings in variants.items():
+        frequencies[lower] = (spellings.most_common(1)[0][0], sum(spellings.values()))
+    for lower in list(frequencies):
+        if lower.endswith('s') and not lower.endswith('ss') and lower[:-1] in frequencies:
+            singular, count = frequencies[lower[:-1]]
+            frequencies[lower[:-1]] = (singular, count + frequencies.pop(lower)[1])
+    return dict(frequencies.values())
+
+
+def _create_wordcloud(frequencies: dict[str, int]) -> 'WordCloud':
+    """Create a WordCloud object from word frequencies."""
+    # Imported here so counting (and pool workers) never load wordcloud
+    from wordcloud import WordCloud
+
     return WordCloud(
         width=WORDCLOUD_WIDTH,
         height=WORDCLOUD_HEIGHT,
         background_color='white',
         colormap='viridis',
         max_words=100,
-        stopwords=STOPWORDS,
         min_font_size=10,
         max_font_size=WORDCLOUD_MAX_FONT_SIZE,
         relative_scaling=0.5,
         prefer_horizontal=WORDCLOUD_PREFER_HORIZONTAL
-    ).generate(text)
+    ).generate_from_frequencies(frequencies)
 
 
-def _save_wordcloud(wordcloud: WordCloud, output_file: str) -> None:
+def _save_wordcloud(wordcloud: 'WordCloud', output_file: str) -> None:
     """Save word cloud image to file."""
+    plt = get_pyplot()
     plt.figure(figsize=(FIGURE_WIDTH_LARGE, FIGURE_HEIGHT))
     plt.imshow(wordcloud, interpolation='bilinear')
     plt.axis('off')
@@ -80,15 +287,41 @@ def _save_wordcloud(wordcloud: WordCloud, output_file: str) -> None:
 
 def generate_wordcloud(
     input_file: str = 'commit_messages.txt',
-    output_file: str = 'images/commit_wordcloud.png'
+    output_file: str = 'images/commit_wordcloud.png',
+    text: str | None = None,
+    counts: Counter | None = None
 ) -> None:
-    """Generate a word cloud from commit messages."""
-    with open(input_file, 'r') as f:
-        text = f.read()
+    """Generate a word cloud from commit messages.
+
+    Precomputed token ``counts`` or commit message ``text`` already in
+    memory skip reading ``input_file``; otherwise the file is streamed
+    line by line.
+    """
+    if counts is None and text is not None:
+        counts = count_words(text.splitlines())
+    elif counts is None:
+        counts = count_words_in_file(input_file)
 
-    cleaned_text = _clean_commit_text(text)
-    wordcloud = _create_wordcloud(cleaned_text)
+    wordcloud = _create_wordcloud(word_frequencies(counts))
     _save_wordcloud(wordcloud, output_file)
 
+def main() -> int:
+    """Count words, optionally in parallel and incrementally, and render the cloud."""
+    parser = argparse.ArgumentParser(description='Generate a word cloud from commit messages')
+    parser.add_argument('input_file', nargs='?', default='commit_messages.txt', help='Commit messages, one or more lines each')
+    parser.add_argument('--output', default='images/commit_wordcloud.png', help='Output image path')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes for counting (default: 1)')
+    parser.add_argument('--counts', help='Persisted word counts to update incrementally and render from')
+    args = parser.parse_args()
+
+    if args.counts:
+        counts = update_counts(args.input_file, args.counts, args.workers)
+    else:
+        counts = count_words_parallel(args.input_file, args.workers)
+    generate_wordcloud(args.input_file, args.output, counts=counts)
+    return 0
+
+
 if __name__ == '__main__':
-    generate_wordcloud()
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
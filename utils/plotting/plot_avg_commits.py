@@ -4,15 +4,18 @@ import argparse
 import logging
 import re
 import sys
+from collections.abc import Sequence
 from pathlib import Path
 
-import matplotlib.pyplot as plt
-
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'config'))
 
 logger = logging.getLogger(__name__)
-from constants import FIGURE_WIDTH_STANDARD, FIGURE_HEIGHT, SAVE_DPI_HIGH, XLABEL_ROTATION
+from constants import FIGURE_WIDTH_STANDARD, FIGURE_HEIGHT, XLABEL_ROTATION
+from plot_utils import get_pyplot, render_cached
 
+CHART_TYPE = 'average_commits'
+FIGSIZE = (FIGURE_WIDTH_STANDARD, FIGURE_HEIGHT)
+CHART_TITLE = 'Distribution of Daily Commit Counts'
 COMMIT_PATTERN = re.compile(r'Commits (\d+)-(\d+): (\d+) days')
 
 
@@ -70,24 +73,37 @@ def parse_results(file_path: str) -> tuple[list[str] | None, list[int] | None]:
         return None, None
     return categories, days
 
-def plot_bar_chart(categories: list[str], days: list[int], output_file: str) -> None:
+def _draw_distribution(categories: list[str], days: list[int]) -> None:
+    """Draw the commit count distribution bars on a new figure."""
+    plt = get_pyplot()
+    plt.figure(figsize=FIGSIZE)
+    plt.bar(categories, days, color='skyblue', edgecolor='black')
+    plt.xlabel('Commits per Day')
+    plt.ylabel('Number of Days')
+    plt.title(CHART_TITLE)
+    plt.xticks(rotation=XLABEL_ROTATION, ha='right')
+    plt.tight_layout()
+
+
+def plot_bar_chart(
+    categories: list[str],
+    days: list[int],
+    output_file: str,
+    profiles: Sequence[str] | None = None
+) -> None:
     """Create a bar chart of commit count distribution.
 
     Args:
         categories: X-axis category labels (commit ranges).
         days: Y-axis values (number of days for each category).
         output_file: Path to save the output PNG.
+        profiles: Output profile names (see ``plot_utils.OUTPUT_PROFILES``).
     """
-    plt.figure(figsize=(FIGURE_WIDTH_STANDARD, FIGURE_HEIGHT))
-    plt.bar(categories, days, color='skyblue', edgecolor='black')
-    plt.xlabel('Commits per Day')
-    plt.ylabel('Number of Days')
-    plt.title('Distribution of Daily Commit Counts')
-    plt.xticks(rotation=XLABEL_ROTATION, ha='right')
-    plt.tight_layout()
-    plt.savefig(output_file, dpi=SAVE_DPI_HIGH)
-    plt.close()
-    logger.info("Bar chart saved as %s", output_file)
+    render_cached(
+        CHART_TYPE, [categories, days], CHART_TITLE, FIGSIZE, output_file,
+        lambda: _draw_distribution(categories, days),
+        profiles=profiles
+    )
 
 def main():
     """Parse arguments and generate commit distribution bar chart."""
@@ -0,0 +1,155 @@
+"""Plot line churn per author and per top-level directory.
+
+Streams ``git log --numstat`` once (see analysis/churn.py) and renders
+three charts: lines added/removed by the top authors, the same for the
+top directories, and an author x directory heatmap of lines changed.
+"""
+import argparse
+import logging
+import subprocess
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'analysis'))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'config'))
+
+logger = logging.getLogger(__name__)
+from churn import ChurnStats, aggregate_churn
+from constants import (
+    CHURN_ADDED_COLOR, CHURN_REMOVED_COLOR, CHURN_TOP_N, FIGURE_WIDTH_LARGE, FIGURE_WIDTH_STANDARD,
+    FIGURE_HEIGHT
+)
+from plot_utils import OUTPUT_PROFILES, create_heatmap, create_stacked_bar_chart, render_cached
+from repo_utils import get_repo_name
+from time_buckets import TZ_AUTHOR, parse_time_zone
+
+BAR_FIGSIZE = (FIGURE_WIDTH_STANDARD, FIGURE_HEIGHT)
+HEATMAP_FIGSIZE = (FIGURE_WIDTH_LARGE, FIGURE_HEIGHT)
+
+
+def plot_churn_bars(
+    labels: Sequence[str],
+    added: Sequence[int],
+    removed: Sequence[int],
+    output_file: str,
+    title: str,
+    chart_type: str = 'churn_by_author',
+    profiles: Sequence[str] | None = None
+) -> None:
+    """Plot lines added and removed as stacked horizontal bars, one per label.
+
+    Args:
+        labels: Authors or directories, largest first
+        added: Lines added per label
+        removed: Lines removed per label
+        output_file: Path to save the chart
+        title: Chart title
+        chart_type: Chart type name used in the cache key
+        profiles: Output profile names (see ``plot_utils.OUTPUT_PROFILES``)
+    """
+    render_cached(
+        chart_type, [list(labels), added, removed], title, BAR_FIGSIZE, output_file,
+        lambda: create_stacked_bar_chart(
+            labels, {'Added': added, 'Removed': removed},
+            colors=(CHURN_ADDED_COLOR, CHURN_REMOVED_COLOR),
+            xlabel='Lines Changed', title=title, figsize=BAR_FIGSIZE
+        ),
+        profiles=profiles
+    )
+
+
+def plot_churn_heatmap(
+    stats: ChurnStats,
+    output_file: str,
+    title: str,
+    top: int = CHURN_TOP_N,
+    profiles: Sequence[str] | None = None
+) -> None:
+    """Plot lines changed (added + removed) per top author and top directory.
+
+    Args:
+        stats: Aggregated churn
+        output_file: Path to save the chart
+        title: Chart title
+        top: Number of authors and of directories shown
+        profiles: Output profile names (see ``plot_utils.OUTPUT_PROFILES``)
+    """
+    authors, directories = stats.top('authors', top), stats.top('directories', top)
+    matrix = stats.churn.sum(axis=0)[authors][:, directories]
+    row_labels = [stats.authors[i] for i in authors]
+    col_labels = [stats.directories[i] for i in directories]
+    render_cached(
+        'churn_heatmap', [row_labels, col_labels, matrix], title, HEATMAP_FIGSIZE, output_file,
+        lambda: create_heatmap(
+            matrix, row_labels, col_labels, colorbar_label='Lines Changed',
+            title=title, figsize=HEATMAP_FIGSIZE
+        ),
+        profiles=profiles
+    )
+
+
+def plot_all_churn(
+    stats: ChurnStats,
+    repo_name: str,
+    output_dir: str = 'images',
+    top: int = CHURN_TOP_N,
+    profiles: Sequence[str] | None = None
+) -> list[str]:
+    """Render the author, directory and heatmap churn charts.
+
+    Returns:
+        Paths of the primary output files.
+    """
+    out = Path(output_dir)
+    outputs = []
+    for axis, label, names, totals in (
+        ('authors', 'author', stats.authors, stats.by_author),
+        ('directories', 'directory', stats.directories, stats.by_directory),
+    ):
+        chart_type = f'churn_by_{label}'
+        indices = stats.top(axis, top)
+        output_file = str(out / f'{chart_type}_{repo_name}.png')
+        plot_churn_bars(
+            [names[i] for i in indices], totals[indices, 0], totals[indices, 1], output_file,
+            f'Lines Changed by {label.capitalize()} for {repo_name}', chart_type, profiles
+        )
+        outputs.append(output_file)
+    output_file = str(out / f'churn_heatmap_{repo_name}.png')
+    plot_churn_heatmap(stats, output_file, f'Lines Changed by Author and Directory for {repo_name}', top, profiles)
+    outputs.append(output_file)
+    return outputs
+
+
+def main() -> int:
+    """Aggregate churn for a repository and render the churn charts."""
+    parser = argparse.ArgumentParser(description='Plot line churn per author and directory')
+    parser.add_argument('--repo', default='.', help='Path to the git repository (default: .)')
+    parser.add_argument('--output-dir', default='images', help='Directory for the charts')
+    parser.add_argument('--top', type=int, default=CHURN_TOP_N, help='Authors and directories shown')
+    parser.add_argument('--renames', action='store_true',
+                        help='Detect renames (slower); otherwise a move counts as delete plus add')
+    parser.add_argument('--tz', type=parse_time_zone, default=TZ_AUTHOR,
+                        help="Time zone to count months in: 'author' (default), 'utc' or +HHMM")
+    parser.add_argument('--profiles', nargs='+', choices=list(OUTPUT_PROFILES),
+                        help='Output profiles to export from each figure (default: print PNG)')
+    args = parser.parse_args()
+
+    try:
+        stats = aggregate_churn(args.repo, renames=args.renames, tz=args.tz)
+    except subprocess.CalledProcessError as e:
+        logger.error("git log failed: %s", (e.stderr or '').strip())
+        return 1
+    if not stats.authors:
+        logger.error("No file changes found")
+        return 1
+
+    Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    repo_name = get_repo_name(args.repo) or 'Repository'
+    plot_all_churn(stats, repo_name, args.output_dir, args.top, args.profiles)
+    return 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(main())
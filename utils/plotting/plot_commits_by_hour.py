@@ -2,19 +2,26 @@
 import argparse
 import logging
 import sys
+from collections.abc import Sequence
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'config'))
 
 logger = logging.getLogger(__name__)
 from constants import HOURS_IN_DAY, HOUR_INDEX_MIN, HOUR_INDEX_MAX, FIGURE_WIDTH_STANDARD, FIGURE_HEIGHT
-from plot_utils import read_count_file, create_bar_chart, save_chart
+from plot_utils import BarChartTemplate, get_template, read_count_file, render_cached
+
+CHART_TYPE = 'commits_by_hour'
+FIGSIZE = (FIGURE_WIDTH_STANDARD, FIGURE_HEIGHT)
+HOUR_LABELS = [f"{h:02d}" for h in range(HOURS_IN_DAY)]
 
 
 def plot_commits_by_hour(
     input_file: str = 'commit_counts.txt',
     output_file: str = 'images/commits_by_hour.png',
-    title: str = 'Git Commits by Hour of Day'
+    title: str = 'Git Commits by Hour of Day',
+    hour_counts: Sequence[int] | None = None,
+    profiles: Sequence[str] | None = None
 ) -> None:
     """Generate a bar graph of commit counts by hour.
 
@@ -22,24 +29,30 @@ def plot_commits_by_hour(
         input_file: Path to the input file with hour and count data.
         output_file: Path to save the output PNG.
         title: Title of the plot.
+        hour_counts: Pre-aggregated counts (e.g. ``CommitStats.by_hour``);
+            when given, ``input_file`` is not read.
+        profiles: Output profile names (see ``plot_utils.OUTPUT_PROFILES``);
+            default is a single print-resolution PNG.
     """
-    try:
-        hour_counts = read_count_file(
-            input_file, HOURS_IN_DAY, HOUR_INDEX_MIN, HOUR_INDEX_MAX
-        )
-    except FileNotFoundError:
-        logger.error("File not found: %s", input_file)
-        return
-
-    hours = [f"{h:02d}" for h in range(HOURS_IN_DAY)]
-    create_bar_chart(
-        hours, hour_counts,
-        xlabel='Hour of Day (0-23)',
-        ylabel='Number of Commits',
-        title=title,
-        figsize=(FIGURE_WIDTH_STANDARD, FIGURE_HEIGHT)
+    if hour_counts is None:
+        try:
+            hour_counts = read_count_file(
+                input_file, HOURS_IN_DAY, HOUR_INDEX_MIN, HOUR_INDEX_MAX
+            )
+        except FileNotFoundError:
+            logger.error("File not found: %s", input_file)
+            return
+
+    render_cached(
+        CHART_TYPE, hour_counts, title, FIGSIZE, output_file,
+        lambda: get_template(
+            BarChartTemplate, HOUR_LABELS,
+            xlabel='Hour of Day (0-23)',
+            ylabel='Number of Commits',
+            figsize=FIGSIZE
+        ).update(hour_counts, title),
+        profiles=profiles
     )
-    save_chart(output_file)
 
 
 if __name__ == '__main__':
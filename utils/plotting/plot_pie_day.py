@@ -2,35 +2,47 @@
 import argparse
 import logging
 import sys
+from collections.abc import Sequence
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'config'))
 
 logger = logging.getLogger(__name__)
 from constants import DAYS_IN_WEEK, DAY_INDEX_MIN, DAY_INDEX_MAX, FIGURE_SIZE_SQUARE
-from plot_utils import read_count_file, create_pie_chart, save_chart
+from plot_utils import PieChartTemplate, get_template, read_count_file, render_cached
 
+CHART_TYPE = 'commits_by_day'
+FIGSIZE = (FIGURE_SIZE_SQUARE, FIGURE_SIZE_SQUARE)
 DAY_LABELS = ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat']
 
 
 def plot_pie_day(
     input_file: str = 'commit_counts_day.txt',
     output_file: str = 'images/commits_by_day.png',
-    title: str = 'Commits by Day of Week'
+    title: str = 'Commits by Day of Week',
+    day_counts: Sequence[int] | None = None,
+    profiles: Sequence[str] | None = None
 ) -> None:
-    """Generate a pie chart of commit counts by day of week."""
-    try:
-        day_counts = read_count_file(
-            input_file, DAYS_IN_WEEK, DAY_INDEX_MIN, DAY_INDEX_MAX
-        )
-    except FileNotFoundError:
-        logger.error("File not found: %s", input_file)
-        return
-
-    create_pie_chart(
-        day_counts, DAY_LABELS, title, (FIGURE_SIZE_SQUARE, FIGURE_SIZE_SQUARE)
+    """Generate a pie chart of commit counts by day of week.
+
+    Pre-aggregated ``day_counts`` (e.g. ``CommitStats.by_weekday``) skip
+    reading ``input_file``. ``profiles`` selects the output formats and
+    resolutions (see ``plot_utils.OUTPUT_PROFILES``).
+    """
+    if day_counts is None:
+        try:
+            day_counts = read_count_file(
+                input_file, DAYS_IN_WEEK, DAY_INDEX_MIN, DAY_INDEX_MAX
+            )
+        except FileNotFoundError:
+            logger.error("File not found: %s", input_file)
+            return
+
+    render_cached(
+        CHART_TYPE, day_counts, title, FIGSIZE, output_file,
+        lambda: get_template(PieChartTemplate, DAY_LABELS, FIGSIZE).update(day_counts, title),
+        profiles=profiles
     )
-    save_chart(output_file)
 
 
 if __name__ == '__main__':
@@ -1,10 +1,9 @@
 """Plot commits by day and month combined - DRY refactored."""
 import logging
 import sys
+from collections.abc import Sequence
 from pathlib import Path
 
-import matplotlib.pyplot as plt
-
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'config'))
 
 logger = logging.getLogger(__name__)
@@ -13,46 +12,77 @@ from constants import (
     MONTHS_IN_YEAR, MONTH_INDEX_MIN, MONTH_INDEX_MAX,
     FIGURE_WIDTH_LARGE, FIGURE_HEIGHT, PIE_START_ANGLE
 )
-from plot_utils import read_count_file, save_chart
+from plot_utils import ChartTemplate, PieArtists, get_template, read_count_file, render_cached
 
+CHART_TYPE = 'commits_by_day_month'
+FIGSIZE = (FIGURE_WIDTH_LARGE, FIGURE_HEIGHT)
 DAY_LABELS = ['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat']
 MONTH_LABELS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
                 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
 
 
+class DayMonthTemplate(ChartTemplate):
+    """Day and month pie charts side by side, reused across renders."""
+
+    def __init__(self):
+        super().__init__(FIGSIZE, ncols=2)
+        ax1, ax2 = self.axes
+        self.day_pie = PieArtists(ax1, DAY_LABELS, PIE_START_ANGLE)
+        ax1.set_title('Commits by Day of Week')
+        self.month_pie = PieArtists(ax2, MONTH_LABELS, PIE_START_ANGLE)
+        ax2.set_title('Commits by Month')
+
+    def update(
+        self,
+        day_counts: Sequence[int],
+        month_counts: Sequence[int],
+        title: str
+    ) -> 'DayMonthTemplate':
+        """Set both pies' wedge sizes and the figure title."""
+        self.day_pie.update(day_counts)
+        self.month_pie.update(month_counts)
+        self.fig.suptitle(title)
+        return self
+
+
 def plot_pie_day_month(
     day_file: str = 'commit_counts_day.txt',
     month_file: str = 'commit_counts_month.txt',
     output_file: str = 'images/commits_by_day_month.png',
-    title: str = 'Commits by Day of Week and Month'
+    title: str = 'Commits by Day of Week and Month',
+    day_counts: Sequence[int] | None = None,
+    month_counts: Sequence[int] | None = None,
+    profiles: Sequence[str] | None = None
 ) -> None:
-    """Generate two pie charts: commits by day and by month."""
-    try:
-        day_counts = read_count_file(
-            day_file, DAYS_IN_WEEK, DAY_INDEX_MIN, DAY_INDEX_MAX
-        )
-    except FileNotFoundError:
-        logger.error("File not found: %s", day_file)
-        return
-
-    try:
-        month_counts = read_count_file(
-            month_file, MONTHS_IN_YEAR, MONTH_INDEX_MIN, MONTH_INDEX_MAX, index_offset=1
-        )
-    except FileNotFoundError:
-        logger.error("File not found: %s", month_file)
-        return
-
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(FIGURE_WIDTH_LARGE, FIGURE_HEIGHT))
-    fig.suptitle(title)
-
-    ax1.pie(day_counts, labels=DAY_LABELS, autopct='%1.1f%%', startangle=PIE_START_ANGLE)
-    ax1.set_title('Commits by Day of Week')
-
-    ax2.pie(month_counts, labels=MONTH_LABELS, autopct='%1.1f%%', startangle=PIE_START_ANGLE)
-    ax2.set_title('Commits by Month')
-
-    save_chart(output_file)
+    """Generate two pie charts: commits by day and by month.
+
+    Pre-aggregated ``day_counts``/``month_counts`` skip reading the
+    corresponding count file. ``profiles`` selects the output formats and
+    resolutions (see ``plot_utils.OUTPUT_PROFILES``).
+    """
+    if day_counts is None:
+        try:
+            day_counts = read_count_file(
+                day_file, DAYS_IN_WEEK, DAY_INDEX_MIN, DAY_INDEX_MAX
+            )
+        except FileNotFoundError:
+            logger.error("File not found: %s", day_file)
+            return
+
+    if month_counts is None:
+        try:
+            month_counts = read_count_file(
+                month_file, MONTHS_IN_YEAR, MONTH_INDEX_MIN, MONTH_INDEX_MAX, index_offset=1
+            )
+        except FileNotFoundError:
+            logger.error("File not found: %s", month_file)
+            return
+
+    render_cached(
+        CHART_TYPE, [day_counts, month_counts], title, FIGSIZE, output_file,
+        lambda: get_template(DayMonthTemplate).update(day_counts, month_counts, title),
+        profiles=profiles
+    )
 
 
 if __name__ == '__main__':
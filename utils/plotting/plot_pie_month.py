@@ -2,14 +2,17 @@
 import argparse
 import logging
 import sys
+from collections.abc import Sequence
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'config'))
 
 logger = logging.getLogger(__name__)
 from constants import MONTHS_IN_YEAR, MONTH_INDEX_MIN, MONTH_INDEX_MAX, FIGURE_SIZE_SQUARE
-from plot_utils import read_count_file, create_pie_chart, save_chart
+from plot_utils import PieChartTemplate, get_template, read_count_file, render_cached
 
+CHART_TYPE = 'commits_by_month'
+FIGSIZE = (FIGURE_SIZE_SQUARE, FIGURE_SIZE_SQUARE)
 MONTH_LABELS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
                 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
 
@@ -17,21 +20,30 @@ MONTH_LABELS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
 def plot_pie_month(
     input_file: str = 'commit_counts_month.txt',
     output_file: str = 'images/commits_by_month.png',
-    title: str = 'Commits by Month'
+    title: str = 'Commits by Month',
+    month_counts: Sequence[int] | None = None,
+    profiles: Sequence[str] | None = None
 ) -> None:
-    """Generate a pie chart of commit counts by month."""
-    try:
-        month_counts = read_count_file(
-            input_file, MONTHS_IN_YEAR, MONTH_INDEX_MIN, MONTH_INDEX_MAX, index_offset=1
-        )
-    except FileNotFoundError:
-        logger.error("File not found: %s", input_file)
-        return
-
-    create_pie_chart(
-        month_counts, MONTH_LABELS, title, (FIGURE_SIZE_SQUARE, FIGURE_SIZE_SQUARE)
+    """Generate a pie chart of commit counts by month.
+
+    Pre-aggregated ``month_counts`` (e.g. ``CommitStats.by_month``) skip
+    reading ``input_file``. ``profiles`` selects the output formats and
+    resolutions (see ``plot_utils.OUTPUT_PROFILES``).
+    """
+    if month_counts is None:
+        try:
+            month_counts = read_count_file(
+                input_file, MONTHS_IN_YEAR, MONTH_INDEX_MIN, MONTH_INDEX_MAX, index_offset=1
+            )
+        except FileNotFoundError:
+            logger.error("File not found: %s", input_file)
+            return
+
+    render_cached(
+        CHART_TYPE, month_counts, title, FIGSIZE, output_file,
+        lambda: get_template(PieChartTemplate, MONTH_LABELS, FIGSIZE).update(month_counts, title),
+        profiles=profiles
     )
-    save_chart(output_file)
 
 
 if __name__ == '__main__':
@@ -1,18 +1,29 @@
 """Generate repository-specific charts with customized titles and filenames.
 
 Wrapper script that creates charts with repository name in title and output
-filename based on the current git repository name.
+filename based on the current git repository name. ``--all`` renders every
+chart (and the word cloud) from a single pass over the history. ``--store``
+reads the memory-mapped commit store instead of scanning ``git log``
+(only new commits are added to it), and allows filtering by date and author.
 """
 import argparse
+import logging
+import subprocess
 import sys
 from pathlib import Path
 
 # Add analysis directory to path for repo_utils
 sys.path.insert(0, str(Path(__file__).parent.parent / 'analysis'))
 
+logger = logging.getLogger(__name__)
+from charts import render_all
+from commit_stats import aggregate_log_file, aggregate_repo, aggregate_repo_messages
+from commit_store import load_store, parse_date
 from plot_commits_by_hour import plot_commits_by_hour
 from plot_pie_day_month import plot_pie_day_month
+from plot_utils import OUTPUT_PROFILES
 from repo_utils import get_repo_name
+from time_buckets import TZ_AUTHOR, parse_time_zone
 
 
 def main():
@@ -26,22 +37,96 @@ def main():
         default='hour',
         help='Chart type: "hour" for bar chart by hour, "pie" for day/month pie charts'
     )
+    parser.add_argument(
+        '--all', action='store_true',
+        help='Render every chart and the word cloud from one aggregation'
+    )
+    parser.add_argument(
+        '--parallel', action='store_true',
+        help='With --all, spread the renders across CPU cores'
+    )
+    parser.add_argument(
+        '--workers', type=int,
+        help='Worker processes for --parallel (default: CPU count)'
+    )
+    parser.add_argument(
+        '--profiles', nargs='+', choices=list(OUTPUT_PROFILES),
+        help='Output profiles to export from each figure, e.g. "web thumbnail svg"; '
+             'the first is written to the usual filename (default: print PNG)'
+    )
+    parser.add_argument(
+        '--tz', type=parse_time_zone, default=TZ_AUTHOR,
+        help="Time zone to count hours and days in: 'author' (default), 'utc' or +HHMM"
+    )
+    parser.add_argument(
+        '--log',
+        help='Read a legacy git log dump instead of streaming from git'
+    )
+    parser.add_argument(
+        '--store', action='store_true',
+        help='Read commits from the columnar commit store (updated incrementally)'
+    )
+    parser.add_argument(
+        '--since', type=parse_date,
+        help='With --store, only count commits at or after this ISO 8601 date'
+    )
+    parser.add_argument(
+        '--until', type=parse_date,
+        help='With --store, only count commits before this ISO 8601 date'
+    )
+    parser.add_argument(
+        '--author', action='append', default=[],
+        help='With --store, only count commits by this author (repeatable)'
+    )
     args = parser.parse_args()
+    if not args.store and (args.since is not None or args.until is not None or args.author):
+        parser.error('--since, --until and --author require --store')
+
+    messages = None
+    try:
+        if args.log:
+            stats = aggregate_log_file(args.log, args.tz)
+        elif args.store:
+            store = load_store()
+            mask = None
+            if args.since is not None or args.until is not None or args.author:
+                mask = store.select(args.since, args.until, args.author)
+            stats = store.stats(mask, args.tz)
+            if args.all:
+                messages = store.subjects_text(mask)
+        elif args.all:
+            stats, messages = aggregate_repo_messages(tz=args.tz)
+        else:
+            stats = aggregate_repo(tz=args.tz)
+    except FileNotFoundError:
+        logger.error("File not found: %s", args.log)
+        return
+    except subprocess.CalledProcessError as e:
+        logger.error("git log failed: %s", (e.stderr or '').strip())
+        return
 
     repo_name = get_repo_name() or "Repository"
 
-    if args.chart_type == 'hour':
+    if args.all:
+        outputs = render_all(
+            stats, repo_name, messages=messages,
+            parallel=args.parallel, max_workers=args.workers, profiles=args.profiles
+        )
+        logger.info("Rendered %d charts", len(outputs))
+    elif args.chart_type == 'hour':
         plot_commits_by_hour(
-            input_file='commit_counts.txt',
             output_file=f'images/commits_by_hour_{repo_name}.png',
-            title=f'Git Commits by Hour of Day for {repo_name}'
+            title=f'Git Commits by Hour of Day for {repo_name}',
+            hour_counts=stats.by_hour,
+            profiles=args.profiles
         )
     else:  # pie
         plot_pie_day_month(
-            day_file='commit_counts_day.txt',
-            month_file='commit_counts_month.txt',
             output_file=f'images/commits_by_day_month_{repo_name}.png',
-            title=f'Commits by Day of Week and Month for {repo_name}'
+            title=f'Commits by Day of Week and Month for {repo_name}',
+            day_counts=stats.by_weekday,
+            month_counts=stats.by_month,
+            profiles=args.profiles
         )
 
 
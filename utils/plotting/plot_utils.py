@@ -1,14 +1,73 @@
 """Shared plotting utilities - DRY refactored from individual plot modules."""
 import logging
+import math
+import os
 import sys
+from collections.abc import Sequence
 from pathlib import Path
-
-import matplotlib.pyplot as plt
+from typing import IO, TYPE_CHECKING, Callable, NamedTuple
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'config'))
 
 logger = logging.getLogger(__name__)
-from constants import PIE_START_ANGLE, SAVE_DPI_HIGH, GRID_ALPHA
+from constants import PIE_START_ANGLE, SAVE_DPI_HIGH, SAVE_DPI_THUMBNAIL, SAVE_DPI_WEB, GRID_ALPHA, HEATMAP_CMAP, XLABEL_ROTATION
+from chart_cache import chart_key, get_chart_cache
+from telemetry import span
+
+if TYPE_CHECKING:
+    import numpy as np
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
+
+# Pie geometry used by Axes.pie, mirrored when templates move labels
+PIE_LABEL_DISTANCE = 1.1
+PIE_PCT_DISTANCE = 0.6
+PIE_AUTOPCT = '%1.1f%%'
+# Headroom above the tallest bar, matching matplotlib's default axes margin
+BAR_TOP_MARGIN = 1.05
+
+
+class OutputProfile(NamedTuple):
+    """How a chart is encoded when exported.
+
+    Attributes:
+        format: Image format passed to ``savefig`` (also the file extension)
+        dpi: Resolution; for SVG it only scales embedded raster images
+    """
+    format: str
+    dpi: int
+
+
+OUTPUT_PROFILES = {
+    'thumbnail': OutputProfile('png', SAVE_DPI_THUMBNAIL),
+    'web': OutputProfile('png', SAVE_DPI_WEB),
+    'print': OutputProfile('png', SAVE_DPI_HIGH),
+    'svg': OutputProfile('svg', SAVE_DPI_WEB),
+    'webp': OutputProfile('webp', SAVE_DPI_WEB),
+}
+
+# A chart export target: a path, or a binary file object such as io.BytesIO
+Target = str | Path | IO[bytes]
+
+_pyplot = None
+_templates: dict = {}
+_webp_supported: bool | None = None
+
+
+def get_pyplot():
+    """Return ``matplotlib.pyplot``, importing it on first use.
+
+    Deferring the import keeps ``--help``, cache hits and error paths from
+    paying for matplotlib. The non-interactive Agg backend is pinned so no
+    GUI toolkit is probed or loaded.
+    """
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot
+        _pyplot = matplotlib.pyplot
+    return _pyplot
 
 
 def _parse_count_line(line: str) -> tuple[int, int] | None:
@@ -65,18 +124,208 @@ def save_chart(output_file: str, dpi: int = SAVE_DPI_HIGH) -> None:
         output_file: Path to save the figure
         dpi: Resolution for saved image
     """
+    plt = get_pyplot()
     plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
     plt.close()
     logger.info("Chart saved as %s", output_file)
 
 
+def webp_supported() -> bool:
+    """Return True if Pillow was built with WebP encoding."""
+    global _webp_supported
+    if _webp_supported is None:
+        try:
+            from PIL import features
+            _webp_supported = bool(features.check('webp'))
+        except ImportError:
+            _webp_supported = False
+    return _webp_supported
+
+
+def resolve_profiles(names: Sequence[str]) -> list[tuple[str, OutputProfile]]:
+    """Look up profile names, dropping WebP when Pillow cannot encode it.
+
+    Raises:
+        ValueError: If a name is not in ``OUTPUT_PROFILES``
+    """
+    resolved = []
+    for name in dict.fromkeys(names):
+        if name not in OUTPUT_PROFILES:
+            raise ValueError(
+                f"Unknown output profile {name!r} (choose from {', '.join(OUTPUT_PROFILES)})"
+            )
+        profile = OUTPUT_PROFILES[name]
+        if profile.format == 'webp' and not webp_supported():
+            logger.warning("Skipping %s profile: Pillow has no WebP support", name)
+            continue
+        resolved.append((name, profile))
+    return resolved
+
+
+def profile_path(output_file: str | Path, name: str, primary: bool = False) -> str:
+    """Return where profile ``name`` of ``output_file`` is written.
+
+    The primary (first requested) profile keeps ``output_file``, only
+    swapping the extension if the format differs. Other profiles go next to
+    it: ``chart.svg`` for format-named profiles, ``chart.thumbnail.png``
+    otherwise.
+    """
+    path = Path(output_file)
+    suffix = '.' + OUTPUT_PROFILES[name].format
+    if primary:
+        return str(path if path.suffix == suffix else path.with_suffix(suffix))
+    if name == OUTPUT_PROFILES[name].format:
+        return str(path.with_suffix(suffix))
+    return str(path.with_name(f'{path.stem}.{name}{suffix}'))
+
+
+def profile_outputs(
+    output_file: Target,
+    profiles: Sequence[str]
+) -> list[tuple[Target, OutputProfile]]:
+    """Pair every usable profile with the target it is written to.
+
+    Raises:
+        ValueError: If a file object is given other than one usable profile
+    """
+    resolved = resolve_profiles(profiles)
+    if not isinstance(output_file, (str, Path)):
+        if len(resolved) != 1:
+            raise ValueError("A file object needs exactly one usable output profile")
+        return [(output_file, profile) for _, profile in resolved]
+    return [
+        (profile_path(output_file, name, primary=i == 0), profile)
+        for i, (name, profile) in enumerate(resolved)
+    ]
+
+
+def export_figure(fig: 'Figure', outputs: Sequence[tuple[Target, OutputProfile]]) -> None:
+    """Save ``fig`` once per output profile, cropped to its tight bounding box.
+
+    ``bbox_inches='tight'`` makes every ``savefig`` call draw the whole
+    figure an extra time just to measure it. With several outputs the box
+    is measured once and the same crop is passed to each save.
+
+    Args:
+        fig: Figure to export
+        outputs: (target, profile) pairs; targets may be paths or binary
+            file objects
+    """
+    if len(outputs) == 1:
+        bbox = 'tight'
+    else:
+        from matplotlib import rcParams
+
+        # Measure at the highest resolution, where text extents are most
+        # exact, so that output matches a standalone tight save
+        dpi = fig.dpi
+        fig.dpi = max(profile.dpi for _, profile in outputs)
+        try:
+            fig.draw_without_rendering()
+            bbox = fig.get_tightbbox().padded(rcParams['savefig.pad_inches'])
+        finally:
+            fig.dpi = dpi
+    for target, profile in outputs:
+        with span('encode', format=profile.format, dpi=profile.dpi) as encode:
+            fig.savefig(target, format=profile.format, dpi=profile.dpi, bbox_inches=bbox)
+            encode.add_bytes(_size(target))
+        if isinstance(target, (str, Path)):
+            logger.info("Chart saved as %s", target)
+
+
+def _size(target: Target) -> int:
+    """Bytes written to a freshly saved target."""
+    if isinstance(target, (str, Path)):
+        return os.path.getsize(target)
+    return target.tell()
+
+
+def _restore(cache, key: str, target: Target) -> bool:
+    """Copy a cached chart to ``target``, returning False on a miss."""
+    if isinstance(target, (str, Path)):
+        return cache.fetch(key, target)
+    data = cache.get_bytes(key)
+    if data is None:
+        return False
+    target.write(data)
+    return True
+
+
+def _store(cache, key: str, target: Target) -> None:
+    """Add a freshly exported chart to the cache."""
+    try:
+        if isinstance(target, (str, Path)):
+            cache.put_file(key, target)
+        else:
+            cache.put_bytes(key, target.getvalue())
+    except OSError as e:
+        logger.warning("Could not cache chart %s: %s", target, e)
+
+
+def render_cached(
+    chart_type: str,
+    data,
+    title: str,
+    figsize: tuple[float, float],
+    output_file: Target,
+    draw: Callable[[], object],
+    dpi: int = SAVE_DPI_HIGH,
+    profiles: Sequence[str] | None = None
+) -> None:
+    """Save a chart, reusing previously rendered images when possible.
+
+    Each output is cached separately, so only the profiles missing from
+    the cache are drawn, and they are all exported from one figure.
+
+    Args:
+        chart_type: Chart type name used in the cache key
+        data: Data the chart is drawn from (see ``chart_cache.chart_key``)
+        title: Chart title
+        figsize: Figure size (width, height)
+        output_file: Path to save the figure, or a binary file object
+            (e.g. ``io.BytesIO``) for callers that do not need a file
+        draw: Callable that builds the figure on a cache miss; if it returns
+            a ``ChartTemplate``, that template's figure is saved and kept
+            instead of pyplot's current figure
+        dpi: Resolution for saved image when ``profiles`` is not given
+        profiles: ``OUTPUT_PROFILES`` names to export; the first is written
+            to ``output_file`` and the rest beside it (see ``profile_path``)
+    """
+    if profiles is None:
+        outputs = [(output_file, OutputProfile('png', dpi))]
+    else:
+        outputs = profile_outputs(output_file, profiles)
+
+    cache = get_chart_cache()
+    missing = []
+    for target, profile in outputs:
+        key = chart_key(chart_type, data, title, profile.dpi, figsize, suffix='.' + profile.format)
+        if _restore(cache, key, target):
+            logger.info("Chart restored from cache as %s", target)
+        else:
+            missing.append((target, profile, key))
+    if not missing:
+        return
+
+    with span('draw', chart_type=chart_type):
+        drawn = draw()
+    if isinstance(drawn, ChartTemplate):
+        export_figure(drawn.fig, [(target, profile) for target, profile, _ in missing])
+    else:
+        plt = get_pyplot()
+        export_figure(plt.gcf(), [(target, profile) for target, profile, _ in missing])
+        plt.close()
+    for target, _, key in missing:
+        _store(cache, key, target)
+
+
 def create_pie_chart(
     counts: list[int],
     labels: list[str],
     title: str,
     figsize: tuple[float, float],
     start_angle: int = PIE_START_ANGLE
-) -> plt.Axes:
+) -> 'Axes':
     """Create a pie chart with the given data.
 
     Args:
@@ -89,7 +338,7 @@ def create_pie_chart(
     Returns:
         The matplotlib Axes object
     """
-    fig, ax = plt.subplots(figsize=figsize)
+    fig, ax = get_pyplot().subplots(figsize=figsize)
     ax.pie(counts, labels=labels, autopct='%1.1f%%', startangle=start_angle)
     ax.set_title(title)
     return ax
@@ -105,7 +354,7 @@ def create_bar_chart(
     color: str = '#4e79a7',
     edgecolor: str = '#2e4977',
     show_grid: bool = True
-) -> plt.Axes:
+) -> 'Axes':
     """Create a bar chart with the given data.
 
     Args:
@@ -122,6 +371,7 @@ def create_bar_chart(
     Returns:
         The matplotlib Axes object
     """
+    plt = get_pyplot()
     fig, ax = plt.subplots(figsize=figsize)
     ax.bar(x_values, y_values, color=color, edgecolor=edgecolor, linewidth=1)
     ax.set_xlabel(xlabel)
@@ -131,3 +381,220 @@ def create_bar_chart(
         ax.grid(True, axis='y', linestyle='--', alpha=GRID_ALPHA)
     plt.tight_layout()
     return ax
+
+
+def create_stacked_bar_chart(
+    labels: Sequence[str],
+    series: dict[str, Sequence[int]],
+    colors: Sequence[str],
+    xlabel: str,
+    title: str,
+    figsize: tuple[float, float]
+) -> 'Axes':
+    """Create a horizontal bar chart with one stacked segment per series.
+
+    Bars run top to bottom in ``labels`` order, so long names such as
+    authors or paths stay readable.
+
+    Args:
+        labels: Bar labels
+        series: Segment name (shown in the legend) -> value per label
+        colors: Fill color per series
+        xlabel: X-axis label
+        title: Chart title
+        figsize: Figure size (width, height)
+
+    Returns:
+        The matplotlib Axes object
+    """
+    plt = get_pyplot()
+    fig, ax = plt.subplots(figsize=figsize)
+    left = [0] * len(labels)
+    for (name, values), color in zip(series.items(), colors):
+        ax.barh(list(labels), list(values), left=left, color=color, label=name)
+        left = [start + value for start, value in zip(left, values)]
+    ax.invert_yaxis()
+    ax.set_xlabel(xlabel)
+    ax.set_title(title)
+    ax.grid(True, axis='x', linestyle='--', alpha=GRID_ALPHA)
+    ax.set_axisbelow(True)
+    ax.legend(loc='lower right')
+    _tight_layout(fig)
+    return ax
+
+
+def create_heatmap(
+    matrix: 'np.ndarray',
+    row_labels: Sequence[str],
+    col_labels: Sequence[str],
+    colorbar_label: str,
+    title: str,
+    figsize: tuple[float, float],
+    cmap: str = HEATMAP_CMAP,
+    log_scale: bool = True
+) -> 'Axes':
+    """Create a heatmap of a 2-D matrix with labelled rows and columns.
+
+    Args:
+        matrix: Values with shape (len(row_labels), len(col_labels))
+        row_labels: Y-axis labels, top to bottom
+        col_labels: X-axis labels, left to right
+        colorbar_label: Label of the color scale
+        title: Chart title
+        figsize: Figure size (width, height)
+        cmap: Matplotlib colormap name
+        log_scale: Use a logarithmic color scale (zero cells stay blank),
+            so a few very large cells do not wash out the rest
+
+    Returns:
+        The matplotlib Axes object
+    """
+    plt = get_pyplot()
+    import numpy as np
+    from matplotlib.colors import LogNorm
+
+    fig, ax = plt.subplots(figsize=figsize)
+    matrix = np.asarray(matrix)
+    norm = None
+    if log_scale and (matrix > 0).any():
+        matrix = np.ma.masked_less_equal(matrix, 0)
+        norm = LogNorm(vmin=matrix.min(), vmax=max(matrix.max(), matrix.min() + 1))
+    image = ax.imshow(matrix, cmap=cmap, norm=norm, aspect='auto', interpolation='nearest')
+    ax.set_xticks(range(len(col_labels)), labels=list(col_labels), rotation=XLABEL_ROTATION, ha='right')
+    ax.set_yticks(range(len(row_labels)), labels=list(row_labels))
+    ax.set_title(title)
+    fig.colorbar(image, ax=ax, label=colorbar_label)
+    _tight_layout(fig)
+    return ax
+
+
+def _tight_layout(fig: 'Figure') -> None:
+    """Apply a tight layout once without leaving a layout engine attached.
+
+    ``Figure.tight_layout`` leaves a placeholder engine behind that makes
+    every later save draw the figure twice.
+    """
+    from matplotlib.layout_engine import TightLayoutEngine
+
+    TightLayoutEngine().execute(fig)
+
+
+class ChartTemplate:
+    """A figure built once and redrawn with new data for every chart.
+
+    Building axes, ticks, labels and grids dominates the cost of a small
+    chart, and it is identical across repositories. Templates construct
+    that skeleton once and ``update`` only changes the data-dependent
+    artists. Figures are created outside pyplot so ``plt.close()`` calls
+    elsewhere never close them.
+    """
+
+    def __init__(self, figsize: tuple[float, float], ncols: int = 1):
+        get_pyplot()  # pins the Agg backend
+        from matplotlib.figure import Figure
+
+        self.fig = Figure(figsize=figsize)
+        self.axes = self.fig.subplots(1, ncols, squeeze=False)[0]
+
+    def save(self, output_file: str, dpi: int = SAVE_DPI_HIGH) -> None:
+        """Save the current state of the figure, keeping it for reuse."""
+        self.fig.savefig(output_file, dpi=dpi, bbox_inches='tight')
+        logger.info("Chart saved as %s", output_file)
+
+
+class BarChartTemplate(ChartTemplate):
+    """Reusable bar chart; see ``create_bar_chart`` for the arguments."""
+
+    def __init__(
+        self,
+        x_values: Sequence,
+        xlabel: str,
+        ylabel: str,
+        figsize: tuple[float, float],
+        color: str = '#4e79a7',
+        edgecolor: str = '#2e4977',
+        show_grid: bool = True
+    ):
+        super().__init__(figsize)
+        self.ax = self.axes[0]
+        self.bars = self.ax.bar(
+            list(x_values), [0] * len(x_values), color=color, edgecolor=edgecolor, linewidth=1
+        )
+        self.ax.set_xlabel(xlabel)
+        self.ax.set_ylabel(ylabel)
+        if show_grid:
+            self.ax.grid(True, axis='y', linestyle='--', alpha=GRID_ALPHA)
+
+    def update(self, y_values: Sequence[int], title: str) -> 'BarChartTemplate':
+        """Set the bar heights and title."""
+        for bar, height in zip(self.bars, y_values):
+            bar.set_height(height)
+        top = max(y_values, default=0)
+        self.ax.set_ylim(0, top * BAR_TOP_MARGIN if top > 0 else 1)
+        self.ax.set_title(title)
+        # Tick label widths change with the data, so the layout is redone
+        _tight_layout(self.fig)
+        return self
+
+
+class PieArtists:
+    """The wedges and labels of one pie, updatable in place."""
+
+    def __init__(self, ax: 'Axes', labels: Sequence[str], start_angle: int = PIE_START_ANGLE):
+        self.start_angle = start_angle
+        self.wedges, self.labels, self.pcts = ax.pie(
+            [1] * len(labels), labels=list(labels), autopct=PIE_AUTOPCT, startangle=start_angle,
+            labeldistance=PIE_LABEL_DISTANCE, pctdistance=PIE_PCT_DISTANCE
+        )
+
+    def update(self, counts: Sequence[int]) -> None:
+        """Resize the wedges to ``counts`` and move their labels like ``Axes.pie``."""
+        total = sum(counts)
+        theta1 = self.start_angle / 360
+        for wedge, label, pct, count in zip(self.wedges, self.labels, self.pcts, counts):
+            frac = count / total if total else 0
+            theta2 = theta1 + frac
+            wedge.set_theta1(360 * theta1)
+            wedge.set_theta2(360 * theta2)
+            thetam = math.pi * (theta1 + theta2)
+            x, y = math.cos(thetam), math.sin(thetam)
+            label.set_position((PIE_LABEL_DISTANCE * x, PIE_LABEL_DISTANCE * y))
+            label.set_horizontalalignment('left' if x > 0 else 'right')
+            pct.set_position((PIE_PCT_DISTANCE * x, PIE_PCT_DISTANCE * y))
+            pct.set_text(PIE_AUTOPCT % (100 * frac))
+            theta1 = theta2
+
+
+class PieChartTemplate(ChartTemplate):
+    """Reusable pie chart; see ``create_pie_chart`` for the arguments."""
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        figsize: tuple[float, float],
+        start_angle: int = PIE_START_ANGLE
+    ):
+        super().__init__(figsize)
+        self.ax = self.axes[0]
+        self.pie = PieArtists(self.ax, labels, start_angle)
+
+    def update(self, counts: Sequence[int], title: str) -> 'PieChartTemplate':
+        """Set the wedge sizes and title."""
+        self.pie.update(counts)
+        self.ax.set_title(title)
+        return self
+
+
+def get_template(template_cls: type, *args, **kwargs) -> ChartTemplate:
+    """Return the process-wide template built from these arguments, creating it once.
+
+    Args:
+        template_cls: ``ChartTemplate`` subclass
+        *args: Constructor arguments; together with ``kwargs`` they form the key
+        **kwargs: Constructor keyword arguments
+    """
+    key = (template_cls, repr(args), repr(sorted(kwargs.items())))
+    template = _templates.get(key)
+    if template is None:
+        template = _templates[key] = template_cls(*args, **kwargs)
+    return template
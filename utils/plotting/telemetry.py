@@ -0,0 +1,384 @@
+"""Per-stage spans for the chart pipeline.
+
+A trace is opened per MCP tool call with ``trace``; code running inside it
+opens child spans with ``span``. Each span records wall time, CPU time of
+this process and of reaped child processes (git), peak RSS of the process
+and bytes written. Outside a trace ``span`` is a no-op, so the plot
+scripts can be instrumented without cost when run on their own.
+
+Work sent to the render pool is wrapped in ``run_traced``, which opens a
+span in the worker and returns the worker's spans with the result; the
+server adds them to its trace with ``adopt``. Finished traces go to the
+configured exporters and to rolling per-tool statistics.
+
+CPU time is process-wide, so spans of concurrent requests in the server
+overlap; worker spans are exact because a worker renders one job at a time.
+
+Environment:
+    GIT_CHARTS_SPANS_FILE: Write spans to this JSON Lines file, one span
+        per line (default: disabled). Nothing rotates it, so point it at a
+        file that is rotated externally on long-running servers
+    GIT_CHARTS_OTLP_FILE: Also write traces as OTLP/JSON, one
+        ExportTraceServiceRequest per line (default: disabled)
+    GIT_CHARTS_STATS_WINDOW: Calls per tool kept for percentiles (default: 200)
+"""
+import json
+import logging
+import math
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATS_WINDOW = 200
+SERVICE_NAME = 'git_commit_charts'
+# ru_maxrss is in KiB on Linux and bytes on macOS
+_RSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+_current: ContextVar['Span | None'] = ContextVar('current_span', default=None)
+_collected: ContextVar[list | None] = ContextVar('collected_spans', default=None)
+_exporters: list | None = None
+_stats: 'ToolStats | None' = None
+_worker_runs = 0
+
+
+def _child_cpu() -> float:
+    """CPU seconds used by reaped child processes."""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _peak_rss() -> int:
+    """Peak resident set size of this process in bytes."""
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT
+
+
+class Span:
+    """One timed stage. Use ``span``/``trace`` rather than creating spans directly."""
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, **attributes) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.bytes = 0
+        self.error: str | None = None
+        self._start_ns = time.time_ns()
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        self._child_cpu = _child_cpu()
+
+    def set(self, **attributes) -> None:
+        """Attach attributes (strings, numbers or booleans)."""
+        self.attributes.update(attributes)
+
+    def add_bytes(self, count: int) -> None:
+        """Count bytes written during the span."""
+        self.bytes += count
+
+    def fail(self, error: BaseException | str) -> None:
+        """Mark the span as failed, e.g. for an error that is reported, not raised."""
+        self.error = error if isinstance(error, str) else f"{type(error).__name__}: {error}"
+
+    def finish(self) -> dict:
+        """Stop the clocks and return the span as a JSON-serializable record."""
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_ns': self._start_ns,
+            'end_ns': time.time_ns(),
+            'wall_s': time.perf_counter() - self._wall,
+            'cpu_s': time.process_time() - self._cpu,
+            'child_cpu_s': _child_cpu() - self._child_cpu,
+            'peak_rss_bytes': _peak_rss(),
+            'bytes': self.bytes,
+            'pid': os.getpid(),
+            'status': 'error' if self.error else 'ok',
+            'error': self.error,
+            'attributes': self.attributes,
+        }
+
+
+class _NullSpan:
+    """Stand-in yielded by ``span`` outside a trace."""
+
+    def set(self, **attributes) -> None:
+        pass
+
+    def add_bytes(self, count: int) -> None:
+        pass
+
+    def fail(self, error: BaseException | str) -> None:
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+@contextmanager
+def _open(span_: Span, collected: list) -> Iterator[Span]:
+    """Make ``span_`` current while the block runs and collect it when done."""
+    span_token = _current.set(span_)
+    collected_token = _collected.set(collected)
+    try:
+        yield span_
+    except BaseException as e:
+        span_.fail(e)
+        raise
+    finally:
+        _current.reset(span_token)
+        _collected.reset(collected_token)
+        collected.append(span_.finish())
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Span | _NullSpan]:
+    """Time a stage as a child of the current span; a no-op outside a trace.
+
+    Exceptions propagate and mark the span as failed.
+    """
+    parent = _current.get()
+    if parent is None:
+        yield NULL_SPAN
+        return
+    with _open(Span(name, parent.trace_id, parent.span_id, **attributes), _collected.get()) as child:
+        yield child
+
+
+@contextmanager
+def trace(name: str, **attributes) -> Iterator[Span]:
+    """Open a root span, then export the whole trace and update ``get_stats()``.
+
+    Args:
+        name: Trace name, normally the MCP tool name
+        **attributes: Attributes of the root span
+    """
+    collected: list[dict] = []
+    try:
+        with _open(Span(name, secrets.token_hex(16), None, **attributes), collected) as root:
+            yield root
+    finally:
+        get_stats().add(collected)
+        for exporter in _get_exporters():
+            try:
+                exporter.export(collected)
+            except OSError as e:
+                logger.warning("Could not export spans to %s: %s", exporter.path, e)
+
+
+def current_parent() -> tuple[str, str] | None:
+    """Return (trace id, span id) of the current span for ``run_traced``, or None."""
+    parent = _current.get()
+    return None if parent is None else (parent.trace_id, parent.span_id)
+
+
+def run_traced(parent: tuple[str, str] | None, name: str, fn: Callable, *args, **kwargs):
+    """Call ``fn`` (typically in a worker process) inside a span under ``parent``.
+
+    Returns:
+        Tuple of (``fn``'s result, span records to pass to ``adopt``). The
+        span's ``cold_start`` attribute is true for a worker's first job,
+        which pays for imports such as matplotlib.
+    """
+    global _worker_runs
+    _worker_runs += 1
+    if parent is None:
+        return fn(*args, **kwargs), []
+    trace_id, parent_id = parent
+    collected: list[dict] = []
+    with _open(Span(name, trace_id, parent_id, cold_start=_worker_runs == 1), collected):
+        result = fn(*args, **kwargs)
+    return result, collected
+
+
+def adopt(records: list[dict]) -> float:
+    """Add span records returned by ``run_traced`` to the current trace.
+
+    Returns:
+        Wall seconds of the adopted top-level span, so callers can tell
+        dispatch overhead from work.
+    """
+    collected = _collected.get()
+    if collected is not None:
+        collected.extend(records)
+    return records[-1]['wall_s'] if records else 0.0
+
+
+class JsonlExporter:
+    """Append every span as one JSON object per line."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, records: list[dict]) -> None:
+        """Write one trace's spans."""
+        lines = ''.join(json.dumps(record) + '\n' for record in records)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+
+
+def _otlp_value(value) -> dict:
+    """Encode an attribute value as an OTLP ``AnyValue``."""
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _otlp_span(record: dict) -> dict:
+    """Convert a span record to an OTLP/JSON span."""
+    attributes = {
+        **record['attributes'],
+        'process.pid': record['pid'],
+        'cpu.seconds': record['cpu_s'],
+        'cpu.children.seconds': record['child_cpu_s'],
+        'process.memory.peak_rss': record['peak_rss_bytes'],
+        'io.bytes_written': record['bytes'],
+    }
+    otlp = {
+        'traceId': record['trace_id'],
+        'spanId': record['span_id'],
+        'name': record['name'],
+        'kind': 1,  # SPAN_KIND_INTERNAL
+        'startTimeUnixNano': str(record['start_ns']),
+        'endTimeUnixNano': str(record['end_ns']),
+        'attributes': [{'key': key, 'value': _otlp_value(value)} for key, value in attributes.items()],
+        # STATUS_CODE_OK = 1, STATUS_CODE_ERROR = 2
+        'status': {'code': 2, 'message': record['error']} if record['error'] else {'code': 1},
+    }
+    if record['parent_id']:
+        otlp['parentSpanId'] = record['parent_id']
+    return otlp
+
+
+class OtlpFileExporter(JsonlExporter):
+    """Write each trace as an OTLP/JSON ``ExportTraceServiceRequest`` line.
+
+    The format matches the OpenTelemetry Collector's file exporter, so the
+    file can be replayed into any OTLP-compatible backend.
+    """
+
+    def export(self, records: list[dict]) -> None:
+        """Write one trace as one request."""
+        request = {'resourceSpans': [{
+            'resource': {'attributes': [
+                {'key': 'service.name', 'value': {'stringValue': SERVICE_NAME}},
+            ]},
+            'scopeSpans': [{
+                'scope': {'name': __name__},
+                'spans': [_otlp_span(record) for record in records],
+            }],
+        }]}
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(request) + '\n')
+
+
+def configure(spans_file: str | Path | None = None, otlp_file: str | Path | None = None) -> None:
+    """Replace the exporters; None disables the corresponding file."""
+    global _exporters
+    _exporters = []
+    if spans_file:
+        _exporters.append(JsonlExporter(spans_file))
+    if otlp_file:
+        _exporters.append(OtlpFileExporter(otlp_file))
+
+
+def _get_exporters() -> list:
+    """Return the exporters, configuring them from the environment on first use."""
+    if _exporters is None:
+        configure(
+            os.environ.get('GIT_CHARTS_SPANS_FILE'),
+            os.environ.get('GIT_CHARTS_OTLP_FILE')
+        )
+    return _exporters
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    index = max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class ToolStats:
+    """Rolling wall-time windows per tool and per stage within each tool."""
+
+    def __init__(self, window: int = DEFAULT_STATS_WINDOW) -> None:
+        self.window = window
+        self._lock = threading.Lock()
+        self._walls: dict[tuple[str, str], deque] = defaultdict(lambda: deque(maxlen=self.window))
+        self._errors: dict[str, deque] = defaultdict(lambda: deque(maxlen=self.window))
+
+    def add(self, records: list[dict]) -> None:
+        """Record one finished trace (its root span is the last record)."""
+        if not records:
+            return
+        tool = records[-1]['name']
+        with self._lock:
+            for record in records:
+                self._walls[(tool, record['name'])].append(record['wall_s'])
+            self._errors[tool].append(records[-1]['status'] == 'error')
+
+    def summary(self) -> dict[str, dict]:
+        """Return {tool: {calls, errors, p50_ms, p95_ms, stages: {stage: {p50_ms, p95_ms}}}}."""
+        with self._lock:
+            walls = {key: sorted(values) for key, values in self._walls.items()}
+            errors = {tool: sum(flags) for tool, flags in self._errors.items()}
+        result: dict[str, dict] = {}
+        for (tool, stage), values in sorted(walls.items()):
+            entry = {'p50_ms': _percentile(values, 0.5) * 1000, 'p95_ms': _percentile(values, 0.95) * 1000}
+            if stage == tool:
+                result.setdefault(tool, {'stages': {}}).update(calls=len(values), errors=errors[tool], **entry)
+            else:
+                result.setdefault(tool, {'stages': {}})['stages'][stage] = entry
+        return result
+
+    def report(self) -> str:
+        """Format ``summary`` as a plain-text table."""
+        summary = self.summary()
+        if not summary:
+            return "No tool calls recorded yet"
+        lines = [f"Last {self.window} calls per tool (wall time, ms):"]
+        for tool, entry in summary.items():
+            lines.append(
+                f"{tool}: {entry.get('calls', 0)} calls, {entry.get('errors', 0)} errors, "
+                f"p50 {entry.get('p50_ms', 0):.1f}, p95 {entry.get('p95_ms', 0):.1f}"
+            )
+            for stage, timings in entry['stages'].items():
+                lines.append(f"  {stage}: p50 {timings['p50_ms']:.1f}, p95 {timings['p95_ms']:.1f}")
+        return '\n'.join(lines)
+
+
+def get_stats() -> ToolStats:
+    """Return the process-wide rolling statistics."""
+    global _stats
+    if _stats is None:
+        _stats = ToolStats(int(os.environ.get('GIT_CHARTS_STATS_WINDOW', DEFAULT_STATS_WINDOW)))
+    return _stats
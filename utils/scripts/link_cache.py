@@ -0,0 +1,116 @@
+"""
+Persistent link-status store for verify-citations.py.
+
+Each checked URL is recorded in SQLite with its outcome, the validators
+(ETag / Last-Modified) of the final response and when it was checked.
+Entries younger than their TTL are reused without touching the network;
+successes and failures have separate TTLs so broken links are retried
+sooner. Stale successes keep their validators so they can be revalidated
+with a conditional request.
+
+Environment:
+    CITATION_CACHE_PATH: Database location (default: ~/.cache/verify-citations/links.sqlite3)
+"""
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, NamedTuple, Tuple
+
+DEFAULT_CACHE_PATH = Path.home() / '.cache' / 'verify-citations' / 'links.sqlite3'
+DEFAULT_SUCCESS_TTL = 7 * 24 * 3600
+DEFAULT_FAILURE_TTL = 3600
+# Bump when the schema or the meaning of a stored status changes
+CACHE_VERSION = 1
+# Stay well below SQLite's bound-parameter limit
+QUERY_CHUNK = 500
+
+class LinkStatus(NamedTuple):
+    """
+    Outcome of checking one URL.
+    Only the fields up to ``checked_at`` are persisted; the transfer
+    metrics describe the run that produced the status.
+    """
+    valid: bool
+    message: str
+    status: int = 0
+    etag: str = ''
+    last_modified: str = ''
+    checked_at: float = 0.0
+    latency: float = 0.0
+    bytes: int = 0
+    retries: int = 0
+    cached: bool = False
+
+class LinkCache:
+    """SQLite-backed URL -> LinkStatus store with success and failure TTLs."""
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        success_ttl: float = DEFAULT_SUCCESS_TTL,
+        failure_ttl: float = DEFAULT_FAILURE_TTL
+    ):
+        self.path = Path(path or os.environ.get('CITATION_CACHE_PATH') or DEFAULT_CACHE_PATH)
+        self.success_ttl = success_ttl
+        self.failure_ttl = failure_ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path)
+        self._init_schema()
+
+    def __enter__(self) -> 'LinkCache':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+    def _init_schema(self) -> None:
+        """Create the table, discarding entries written by another schema version."""
+        (version,) = self._db.execute('PRAGMA user_version').fetchone()
+        if version != CACHE_VERSION:
+            with self._db:
+                self._db.execute('DROP TABLE IF EXISTS links')
+                self._db.execute(f'PRAGMA user_version = {CACHE_VERSION}')
+        with self._db:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS links ('
+                ' url TEXT PRIMARY KEY, valid INTEGER NOT NULL, message TEXT NOT NULL,'
+                ' status INTEGER NOT NULL, etag TEXT NOT NULL, last_modified TEXT NOT NULL,'
+                ' checked_at REAL NOT NULL)'
+            )
+
+    def get_many(self, urls: Iterable[str]) -> Dict[str, LinkStatus]:
+        """Return the stored status of every known URL, fresh or stale."""
+        urls = list(urls)
+        entries = {}
+        for i in range(0, len(urls), QUERY_CHUNK):
+            chunk = urls[i:i + QUERY_CHUNK]
+            rows = self._db.execute(
+                'SELECT url, valid, message, status, etag, last_modified, checked_at'
+                f' FROM links WHERE url IN ({",".join("?" * len(chunk))})',
+                chunk
+            )
+            for url, valid, *rest in rows:
+                entries[url] = LinkStatus(bool(valid), *rest, cached=True)
+        return entries
+
+    def is_fresh(self, entry: LinkStatus, now: float | None = None) -> bool:
+        """Return True if ``entry`` is younger than the TTL for its outcome."""
+        ttl = self.success_ttl if entry.valid else self.failure_ttl
+        return (now if now is not None else time.time()) - entry.checked_at < ttl
+
+    def put_many(self, entries: Iterable[Tuple[str, LinkStatus]]) -> None:
+        """Store the given statuses in one transaction."""
+        with self._db:
+            self._db.executemany(
+                'INSERT OR REPLACE INTO links'
+                ' (url, valid, message, status, etag, last_modified, checked_at)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+                ((url, int(s.valid), s.message, s.status, s.etag, s.last_modified, s.checked_at)
+                 for url, s in entries)
+            )
@@ -2,117 +2,625 @@
 """
 Verify citation links in Jekyll-formatted technical reports.
 Checks for valid HTTP/HTTPS responses and broken links.
+
+URLs are checked concurrently: a thread pool caps total in-flight requests,
+a per-host semaphore keeps us polite to any single server, and keep-alive
+connections are reused per host. Each URL is tried with HEAD first and
+falls back to GET when the server rejects or mishandles HEAD.
+
+With no file arguments the whole site is scanned: every markdown file in
+the content collections is indexed, each unique URL is verified once, and
+the results are fanned back out to every file and line that cites it.
+
+Statuses persist in a link cache (see link_cache.py), so repeat runs only
+request new links and links whose TTL has expired; stale links that
+returned ETag or Last-Modified are revalidated with a conditional request.
+
+With ``--since <rev>`` only URLs on lines added or modified since ``rev``
+(per ``git diff``) are checked, which keeps pre-commit runs fast.
 """
 
+import argparse
+import http.client
+import json
 import re
+import ssl
+import subprocess
 import sys
-from urllib.request import urlopen
-from urllib.error import URLError, HTTPError
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from email.message import Message
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+from urllib.parse import quote, urljoin, urlsplit
+from xml.etree import ElementTree
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from link_cache import DEFAULT_FAILURE_TTL, DEFAULT_SUCCESS_TTL, LinkCache, LinkStatus
+
+# Use a proper User-Agent to avoid bot-blocking (e.g. readthedocs.io)
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)',
+    'Accept': '*/*',
+}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 5
+# GET bodies are drained up to this size so the connection can be reused
+MAX_DRAIN_BYTES = 256 * 1024
+DEFAULT_WORKERS = 16
+DEFAULT_PER_HOST = 4
+DEFAULT_TIMEOUT = 5
+# One alternation scanned once over the whole document. At any position the
+# earliest-starting form wins, so a link target is never re-matched as a bare URL.
+# URLs may contain one level of balanced parentheses (Wikipedia-style).
+URL_PATTERN = re.compile(r"""
+    \]\(\s*<?(?P<inline>https?://(?:[^\s()<>]|\([^\s()<>]*\))+)     # [text](url), ![alt](url)
+  | ^[ \t]{0,3}\[[^\]\n]+\]:[ \t]*<?(?P<reference>https?://[^\s>]+)   # [id]: url
+  | \bhref\s*=\s*["'](?P<href>https?://[^"'\s]+)                     # <a href="url">
+  | (?P<plain>https?://(?:[^\s()<>\[\]"'`]|\([^\s()<>]*\))+)         # bare and <autolinked> URLs
+""", re.IGNORECASE | re.MULTILINE | re.VERBOSE)
+# Sentence punctuation that follows a bare URL rather than belonging to it
+TRAILING_PUNCTUATION = '.,;:!?*'
+# Slowest hosts listed in the summary record
+SLOW_HOSTS_REPORTED = 10
+# New-file side of a zero-context diff hunk header: @@ -a[,b] +c[,d] @@
+HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+# Jekyll collections scanned by default, relative to the site root
+SITE_COLLECTIONS = ('_reports', '_posts', '_projects', '_work')
+MARKDOWN_SUFFIXES = {'.md', '.markdown'}
+SITE_ROOT = Path(__file__).resolve().parent.parent.parent
 
 def extract_urls(markdown_content: str) -> List[Tuple[str, int]]:
-    """Extract all URLs from markdown content with line numbers."""
-    urls = []
-    for i, line in enumerate(markdown_content.split('\n'), 1):
-        # Match URLs in markdown links [text](url) and plain URLs
-        url_patterns = [
-            r'\[.*?\]\((https?://[^\)]+)\)',  # Markdown links
-            r'(https?://[^\s\)]+)',  # Plain URLs
-        ]
-        for pattern in url_patterns:
-            for match in re.finditer(pattern, line):
-                url = match.group(1)
-                if url not in [u[0] for u in urls]:  # Avoid duplicates
-                    urls.append((url, i))
-    return urls
-
-def verify_url(url: str, timeout: int = 5) -> Tuple[bool, str]:
     """
-    Verify that a URL is accessible.
+    Extract unique URLs from markdown content in a single pass.
+    Returns (url, line) pairs in order of first appearance.
+    """
+    urls: Dict[str, int] = {}
+    line_num, pos = 1, 0
+    for match in URL_PATTERN.finditer(markdown_content):
+        # Matches arrive in document order, so counting newlines since the previous one stays linear
+        line_num += markdown_content.count('\n', pos, match.start())
+        pos = match.start()
+        url = match.group(match.lastgroup)
+        if match.lastgroup == 'plain':
+            url = url.rstrip(TRAILING_PUNCTUATION)
+        urls.setdefault(url, line_num)
+    return list(urls.items())
+
+def _is_failure(status: int) -> bool:
+    """Return True for error statuses and redirects left unresolved."""
+    return status >= 400 or status in REDIRECT_STATUSES
+
+class LinkChecker:
+    """Concurrent URL verifier with per-host connection pools and limits."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_WORKERS,
+        per_host: int = DEFAULT_PER_HOST,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache: LinkCache | None = None
+    ):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.cache = cache
+        self._ssl_context = ssl.create_default_context()
+        self._lock = threading.Lock()
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = defaultdict(list)
+        self._host_slots: Dict[Tuple[str, str], threading.BoundedSemaphore] = {}
+
+    def __enter__(self) -> 'LinkChecker':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close all idle keep-alive connections."""
+        with self._lock:
+            for connections in self._idle.values():
+                for conn in connections:
+                    conn.close()
+            self._idle.clear()
+
+    @contextmanager
+    def _host_slot(self, key: Tuple[str, str]) -> Iterator[None]:
+        """Hold one of the ``per_host`` request slots for a host."""
+        with self._lock:
+            slot = self._host_slots.get(key)
+            if slot is None:
+                slot = self._host_slots[key] = threading.BoundedSemaphore(self.per_host)
+        with slot:
+            yield
+
+    def _acquire(self, key: Tuple[str, str]) -> Tuple[http.client.HTTPConnection, bool]:
+        """Return (connection, reused) for a host, preferring an idle one."""
+        with self._lock:
+            if self._idle[key]:
+                return self._idle[key].pop(), True
+        scheme, netloc = key
+        if scheme == 'https':
+            return http.client.HTTPSConnection(
+                netloc, timeout=self.timeout, context=self._ssl_context
+            ), False
+        return http.client.HTTPConnection(netloc, timeout=self.timeout), False
+
+    def _release(self, key: Tuple[str, str], conn: http.client.HTTPConnection) -> None:
+        """Return a connection to the idle pool for reuse."""
+        with self._lock:
+            self._idle[key].append(conn)
+
+    def _request(
+        self, method: str, url: str, headers: Dict[str, str], metrics: Counter
+    ) -> Tuple[int, str, Message]:
+        """Send one request over a pooled connection.
+
+        Time on the wire, body bytes read and reconnects are added to ``metrics``.
+
+        Returns:
+            Tuple of (status, reason, response headers).
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        target = quote(parts.path or '/', safe="/%:@!$&'()*+,;=~")
+        if parts.query:
+            target += '?' + parts.query
+
+        with self._host_slot(key):
+            while True:
+                conn, reused = self._acquire(key)
+                start = time.perf_counter()
+                try:
+                    conn.request(method, target, headers=headers)
+                    response = conn.getresponse()
+                    metrics['bytes'] += len(response.read(MAX_DRAIN_BYTES if method == 'GET' else None))
+                except (http.client.HTTPException, OSError):
+                    conn.close()
+                    if reused:
+                        # The server closed an idle keep-alive connection; retry on a fresh one
+                        metrics['retries'] += 1
+                        continue
+                    raise
+                finally:
+                    metrics['latency'] += time.perf_counter() - start
+                if response.isclosed() and not response.will_close:
+                    self._release(key, conn)
+                else:
+                    conn.close()
+                return response.status, response.reason, response.headers
+
+    def _fetch(
+        self, method: str, url: str, headers: Dict[str, str], metrics: Counter
+    ) -> Tuple[int, str, Message]:
+        """Request ``url``, following redirects."""
+        for _ in range(MAX_REDIRECTS + 1):
+            status, reason, response_headers = self._request(method, url, headers, metrics)
+            location = response_headers.get('Location')
+            if status not in REDIRECT_STATUSES or not location:
+                return status, reason, response_headers
+            url = urljoin(url, location)
+        return status, 'Too many redirects', response_headers
+
+    def check(self, url: str, previous: LinkStatus | None = None) -> LinkStatus:
+        """
+        Verify that a URL is accessible.
+        A previous success carrying validators is revalidated conditionally;
+        a 304 keeps its status. Latency is time spent on requests, excluding
+        waits for a host slot; a GET fallback counts as a retry.
+        """
+        headers = dict(REQUEST_HEADERS)
+        if previous is not None and previous.valid:
+            if previous.etag:
+                headers['If-None-Match'] = previous.etag
+            if previous.last_modified:
+                headers['If-Modified-Since'] = previous.last_modified
+        checked_at = time.time()
+        metrics: Counter = Counter()
+        try:
+            status, reason, response_headers = self._fetch('HEAD', url, headers, metrics)
+            if _is_failure(status):
+                # Many servers reject or mishandle HEAD; confirm with GET
+                metrics['retries'] += 1
+                status, reason, response_headers = self._fetch('GET', url, headers, metrics)
+        except (http.client.HTTPException, OSError) as e:
+            result = LinkStatus(False, f"✗ Connection error: {str(e)[:50]}")
+        except Exception as e:
+            result = LinkStatus(False, f"✗ Error: {str(e)[:50]}")
+        else:
+            if status == 304 and previous is not None:
+                result = previous
+            elif _is_failure(status):
+                result = LinkStatus(False, f"✗ HTTP {status} ({reason})", status)
+            else:
+                result = LinkStatus(
+                    True, f"✓ HTTP {status}", status,
+                    response_headers.get('ETag', ''), response_headers.get('Last-Modified', '')
+                )
+        return result._replace(
+            checked_at=checked_at, latency=metrics['latency'], bytes=metrics['bytes'],
+            retries=metrics['retries'], cached=False
+        )
+
+    def check_many(
+        self,
+        urls: Iterable[str],
+        on_result: Callable[[str, LinkStatus], None] | None = None
+    ) -> Dict[str, LinkStatus]:
+        """
+        Verify unique URLs concurrently and return their statuses.
+        With a cache, fresh entries are reused and only new or stale URLs
+        are requested; their results are written back in one transaction.
+        ``on_result`` is called in the calling thread as each status is
+        known: cache hits first, then requests in completion order.
+        """
+        unique = list(dict.fromkeys(urls))
+        cached = self.cache.get_many(unique) if self.cache else {}
+        now = time.time()
+        statuses = {
+            url: cached[url] for url in unique
+            if url in cached and self.cache.is_fresh(cached[url], now)
+        }
+        if on_result:
+            for url, status in statuses.items():
+                on_result(url, status)
+        pending = [url for url in unique if url not in statuses]
+        fetched = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self.check, url, cached.get(url)): url for url in pending}
+            for future in as_completed(futures):
+                url = futures[future]
+                fetched[url] = future.result()
+                if on_result:
+                    on_result(url, fetched[url])
+        if self.cache:
+            self.cache.put_many(fetched.items())
+        statuses.update(fetched)
+        return {url: statuses[url] for url in unique}
+
+def verify_url(url: str, timeout: int = DEFAULT_TIMEOUT) -> Tuple[bool, str]:
+    """
+    Verify that a single URL is accessible.
     Returns (is_valid, status_message)
     """
-    try:
-        # Use a proper User-Agent to avoid bot-blocking (e.g. readthedocs.io)
-        from urllib.request import Request
-        headers = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7)'}
-        req = Request(url, headers=headers)
-        response = urlopen(req, timeout=timeout)
-        status = response.status if hasattr(response, 'status') else 200
-        return True, f"✓ HTTP {status}"
-    except HTTPError as e:
-        return False, f"✗ HTTP {e.code} ({e.reason})"
-    except URLError as e:
-        return False, f"✗ Connection error: {str(e.reason)[:50]}"
-    except Exception as e:
-        return False, f"✗ Error: {str(e)[:50]}"
-
-def check_file(filepath: Path) -> Dict:
-    """Check all citations in a markdown file."""
-    if not filepath.exists():
-        return {'error': f"File not found: {filepath}"}
+    with LinkChecker(max_workers=1, timeout=timeout) as checker:
+        result = checker.check(url)
+    return result.valid, result.message
+
+def find_site_files(site_root: Path, collections: Iterable[str] = SITE_COLLECTIONS) -> List[Path]:
+    """Return the markdown files in the site's content collections, sorted."""
+    files = []
+    for collection in collections:
+        directory = site_root / collection
+        if directory.is_dir():
+            files.extend(
+                path for path in directory.rglob('*')
+                if path.suffix in MARKDOWN_SUFFIXES and path.is_file()
+            )
+    return sorted(files)
+
+def build_url_index(filepaths: Iterable[Path]) -> Tuple[Dict[str, List[Tuple[Path, int]]], Dict[Path, str]]:
+    """
+    Index every cited URL across files.
+    Returns (url -> [(file, line), ...] in citation order, file -> error for unreadable files)
+    """
+    index: Dict[str, List[Tuple[Path, int]]] = defaultdict(list)
+    errors: Dict[Path, str] = {}
+    for filepath in filepaths:
+        if not filepath.exists():
+            errors[filepath] = f"File not found: {filepath}"
+            continue
+        try:
+            content = filepath.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError) as e:
+            errors[filepath] = f"Could not read {filepath}: {e}"
+            continue
+        for url, line_num in extract_urls(content):
+            index[url].append((filepath, line_num))
+    return dict(index), errors
+
+def build_diff_index(
+    since: str,
+    site_root: Path,
+    pathspecs: Iterable[str] = SITE_COLLECTIONS
+) -> Tuple[List[Path], Dict[str, List[Tuple[Path, int]]]]:
+    """
+    Index the URLs on lines added or modified since ``since``.
+    Compares ``since`` with the working tree, so uncommitted edits count.
+    Returns (changed markdown files, url -> [(file, line), ...])
+    Raises subprocess.CalledProcessError if git fails (e.g. unknown revision).
+    """
+    diff = subprocess.run(
+        ['git', '-C', str(site_root), '-c', 'core.quotePath=off', 'diff', '--unified=0',
+         '--no-color', '--no-ext-diff', '--relative', '--diff-filter=d', since, '--', *pathspecs],
+        capture_output=True, text=True, encoding='utf-8', check=True
+    ).stdout
+
+    files: List[Path] = []
+    index: Dict[str, List[Tuple[Path, int]]] = defaultdict(list)
+    filepath: Path | None = None
+    block: List[str] = []
+    start = 0
+    # New-side lines left in the current hunk; while any are, a '+++ ' line is
+    # added text, not a file header
+    remaining = 0
 
-    content = filepath.read_text(encoding='utf-8')
-    urls = extract_urls(content)
+    def flush() -> None:
+        # Added lines of a zero-context hunk are contiguous in the new file
+        if filepath is not None and block:
+            for url, offset in extract_urls('\n'.join(block)):
+                index[url].append((filepath, start + offset - 1))
+        block.clear()
+
+    for line in diff.splitlines():
+        if remaining and line.startswith('+'):
+            block.append(line[1:])
+            remaining -= 1
+        elif line.startswith('+++ '):
+            flush()
+            # git appends a tab to paths containing spaces
+            path = line[4:].rstrip('\t').removeprefix('b/')
+            filepath = site_root / path if Path(path).suffix in MARKDOWN_SUFFIXES else None
+            if filepath is not None:
+                files.append(filepath)
+        elif line.startswith('@@'):
+            flush()
+            hunk = HUNK_HEADER.match(line)
+            start = int(hunk.group(1))
+            remaining = int(hunk.group(2) or 1)
+    flush()
+    return files, dict(index)
+
+def check_index(
+    filepaths: Iterable[Path],
+    index: Dict[str, List[Tuple[Path, int]]],
+    errors: Dict[Path, str] | None = None,
+    checker: LinkChecker | None = None,
+    on_result: Callable[[str, LinkStatus, List[Tuple[Path, int]]], None] | None = None
+) -> List[Dict]:
+    """
+    Verify every URL in a citation index once and fan the statuses out per file.
+    ``on_result(url, status, citations)`` streams each status as it is known.
+    Returns one result per file, in the order given.
+    """
+    filepaths = list(dict.fromkeys(filepaths))
+    errors = errors or {}
+    callback = (lambda url, status: on_result(url, status, index[url])) if on_result else None
+
+    if checker is None:
+        with LinkChecker() as own_checker:
+            statuses = own_checker.check_many(index, callback)
+    else:
+        statuses = checker.check_many(index, callback)
 
     results = {
-        'file': str(filepath),
-        'total_urls': len(urls),
-        'valid': 0,
-        'broken': 0,
-        'details': []
+        filepath: {'file': str(filepath), 'total_urls': 0, 'valid': 0, 'broken': 0, 'details': []}
+        for filepath in filepaths if filepath not in errors
     }
+    for url, citations in index.items():
+        status = statuses[url]
+        is_valid = status.valid
+        for filepath, line_num in citations:
+            result = results[filepath]
+            result['details'].append({
+                'url': url,
+                'line': line_num,
+                'status': status.message,
+                'valid': is_valid,
+                'latency_ms': round(status.latency * 1000, 1),
+                'cached': status.cached
+            })
+            result['total_urls'] += 1
+            result['valid' if is_valid else 'broken'] += 1
 
-    for url, line_num in urls:
-        is_valid, message = verify_url(url)
-        results['details'].append({
-            'url': url,
-            'line': line_num,
-            'status': message,
-            'valid': is_valid
-        })
-        if is_valid:
-            results['valid'] += 1
+    ordered = []
+    for filepath in filepaths:
+        if filepath in errors:
+            ordered.append({'error': errors[filepath]})
         else:
-            results['broken'] += 1
+            results[filepath]['details'].sort(key=lambda detail: detail['line'])
+            ordered.append(results[filepath])
+    return ordered
+
+def check_files(filepaths: Iterable[Path], checker: LinkChecker | None = None) -> List[Dict]:
+    """
+    Check all citations across several markdown files.
+    Each unique URL is requested once however many files cite it.
+    Returns one result per file, in the order given.
+    """
+    filepaths = list(dict.fromkeys(filepaths))
+    index, errors = build_url_index(filepaths)
+    return check_index(filepaths, index, errors, checker)
+
+def check_file(filepath: Path, checker: LinkChecker | None = None) -> Dict:
+    """Check all citations in a markdown file."""
+    return check_files([filepath], checker)[0]
 
-    return results
+def url_record(url: str, status: LinkStatus, citations: List[Tuple[Path, int]]) -> Dict:
+    """Return the JSON Lines record for one checked URL."""
+    return {
+        'type': 'url',
+        'url': url,
+        'valid': status.valid,
+        'status': status.status,
+        'message': status.message,
+        'latency_ms': round(status.latency * 1000, 1),
+        'bytes': status.bytes,
+        'retries': status.retries,
+        'cached': status.cached,
+        'citations': [{'file': str(filepath), 'line': line_num} for filepath, line_num in citations],
+    }
+
+def summary_record(results: List[Dict], statuses: Dict[str, LinkStatus], elapsed: float) -> Dict:
+    """Return the final summary record, including the hosts that took longest."""
+    hosts: Dict[str, Counter] = defaultdict(Counter)
+    for url, status in statuses.items():
+        if status.cached:
+            continue
+        host = hosts[urlsplit(url).netloc]
+        host['urls'] += 1
+        host['latency'] += status.latency
+        host['max_latency'] = max(host['max_latency'], status.latency)
+        host['bytes'] += status.bytes
+        host['retries'] += status.retries
+    slowest = sorted(hosts.items(), key=lambda item: item[1]['latency'], reverse=True)
+    return {
+        'type': 'summary',
+        'files': len(results),
+        'citations': sum(result.get('total_urls', 0) for result in results),
+        'unique_urls': len(statuses),
+        'cached': sum(status.cached for status in statuses.values()),
+        'valid': sum(result.get('valid', 0) for result in results),
+        'broken': sum(result.get('broken', 0) for result in results),
+        'errors': sum('error' in result for result in results),
+        'elapsed_seconds': round(elapsed, 3),
+        'slowest_hosts': [
+            {
+                'host': host,
+                'urls': totals['urls'],
+                'latency_ms': round(totals['latency'] * 1000, 1),
+                'max_latency_ms': round(totals['max_latency'] * 1000, 1),
+                'bytes': totals['bytes'],
+                'retries': totals['retries'],
+            }
+            for host, totals in slowest[:SLOW_HOSTS_REPORTED]
+        ],
+    }
+
+def write_junit_report(path: Path, filepaths: List[Path], results: List[Dict], summary: Dict) -> None:
+    """Write a JUnit XML report: one testsuite per file, one testcase per citation."""
+    root = ElementTree.Element(
+        'testsuites', name='citations', tests=str(summary['citations']),
+        failures=str(summary['broken']), errors=str(summary['errors']),
+        time=str(summary['elapsed_seconds'])
+    )
+    for filepath, result in zip(filepaths, results):
+        suite = ElementTree.SubElement(root, 'testsuite', name=str(filepath))
+        if 'error' in result:
+            suite.set('tests', '1')
+            suite.set('errors', '1')
+            case = ElementTree.SubElement(suite, 'testcase', classname=str(filepath), name='read')
+            ElementTree.SubElement(case, 'error', message=result['error'])
+            continue
+        suite.set('tests', str(result['total_urls']))
+        suite.set('failures', str(result['broken']))
+        for detail in result['details']:
+            case = ElementTree.SubElement(
+                suite, 'testcase', classname=str(filepath),
+                name=f"line {detail['line']}: {detail['url']}",
+                time=f"{detail['latency_ms'] / 1000:.3f}"
+            )
+            if not detail['valid']:
+                ElementTree.SubElement(case, 'failure', message=detail['status'])
+    ElementTree.indent(root)
+    ElementTree.ElementTree(root).write(path, encoding='utf-8', xml_declaration=True)
+
+def write_report(
+    path: Path,
+    filepaths: List[Path],
+    results: List[Dict],
+    index: Dict[str, List[Tuple[Path, int]]],
+    statuses: Dict[str, LinkStatus],
+    summary: Dict
+) -> None:
+    """Write a JUnit XML report for ``.xml`` paths, otherwise a JSON report."""
+    if path.suffix == '.xml':
+        write_junit_report(path, filepaths, results, summary)
+        return
+    report = {
+        'summary': summary,
+        'files': results,
+        'urls': [url_record(url, status, index[url]) for url, status in statuses.items()],
+    }
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
 
 def main():
     """Main entry point."""
-    reports_dir = Path('/Users/alyshialedlie/code/personal-site/_reports')
+    parser = argparse.ArgumentParser(description='Verify citation links in markdown reports.')
+    parser.add_argument('files', nargs='*', type=Path,
+                        help='Markdown files to check (default: every file in the site collections)')
+    parser.add_argument('--since', metavar='REV',
+                        help='Only check URLs on lines added or modified since this git revision')
+    parser.add_argument('--site-root', type=Path, default=SITE_ROOT,
+                        help='Jekyll site root containing the collections (default: this repository)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'Maximum concurrent requests (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--per-host', type=int, default=DEFAULT_PER_HOST,
+                        help=f'Maximum concurrent requests per host (default: {DEFAULT_PER_HOST})')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'Per-request timeout in seconds (default: {DEFAULT_TIMEOUT})')
+    parser.add_argument('--cache', type=Path,
+                        help='Link cache database (default: $CITATION_CACHE_PATH or ~/.cache/verify-citations/links.sqlite3)')
+    parser.add_argument('--no-cache', action='store_true', help='Check every link without reading or updating the cache')
+    parser.add_argument('--success-ttl', type=float, default=DEFAULT_SUCCESS_TTL / 3600,
+                        help=f'Hours before a working link is rechecked (default: {DEFAULT_SUCCESS_TTL // 3600})')
+    parser.add_argument('--failure-ttl', type=float, default=DEFAULT_FAILURE_TTL / 3600,
+                        help=f'Hours before a broken link is rechecked (default: {DEFAULT_FAILURE_TTL // 3600})')
+    parser.add_argument('--format', choices=('text', 'jsonl'), default='text',
+                        help='Output format; jsonl streams one record per URL as it completes, then a summary')
+    parser.add_argument('--report', type=Path,
+                        help='Also write a report file: JUnit XML if it ends in .xml, JSON otherwise')
+    args = parser.parse_args()
+    jsonl = args.format == 'jsonl'
+    started = time.perf_counter()
 
-    # Files to check
-    files_to_check = [
-        reports_dir / 'agentic-self-optimization-architecture.md',
-        reports_dir / 'self-optimizing-agentic-systems.md'
-    ]
+    if args.since:
+        pathspecs = [str(path.resolve()) for path in args.files] or SITE_COLLECTIONS
+        try:
+            files_to_check, index = build_diff_index(args.since, args.site_root, pathspecs)
+            errors = {}
+        except subprocess.CalledProcessError as e:
+            message = f"git diff against {args.since} failed: {e.stderr.strip()}"
+            print(json.dumps({'type': 'error', 'message': message}) if jsonl else f"ERROR: {message}")
+            return 1
+    else:
+        files_to_check = args.files or find_site_files(args.site_root)
+        index, errors = build_url_index(dict.fromkeys(files_to_check))
+
+    files_to_check = list(dict.fromkeys(files_to_check))
+    statuses: Dict[str, LinkStatus] = {}
+
+    def on_result(url: str, status: LinkStatus, citations: List[Tuple[Path, int]]) -> None:
+        statuses[url] = status
+        if jsonl:
+            print(json.dumps(url_record(url, status, citations), ensure_ascii=False), flush=True)
+
+    cache = None if args.no_cache else LinkCache(
+        args.cache, success_ttl=args.success_ttl * 3600, failure_ttl=args.failure_ttl * 3600
+    )
+    with LinkChecker(args.workers, args.per_host, args.timeout, cache) as checker:
+        results = check_index(files_to_check, index, errors, checker, on_result)
+    if cache:
+        cache.close()
 
-    all_results = []
-    total_valid = 0
-    total_broken = 0
+    summary = summary_record(results, statuses, time.perf_counter() - started)
+    if args.report:
+        write_report(args.report, files_to_check, results, index, statuses, summary)
+    if jsonl:
+        print(json.dumps(summary, ensure_ascii=False), flush=True)
+        return 1 if summary['broken'] > 0 else 0
 
     print("=" * 70)
     print("Citation Link Verification Report")
     print("=" * 70)
 
-    for filepath in files_to_check:
-        print(f"\nFile: {filepath.name}")
-        print("-" * 70)
-
-        result = check_file(filepath)
-
+    for filepath, result in zip(files_to_check, results):
         if 'error' in result:
+            print(f"\nFile: {filepath.name}")
+            print("-" * 70)
             print(f"  ERROR: {result['error']}")
             continue
-
-        print(f"  Total URLs: {result['total_urls']}")
-        print(f"  Valid: {result['valid']}")
-        print(f"  Broken: {result['broken']}")
-
-        all_results.append(result)
-        total_valid += result['valid']
-        total_broken += result['broken']
+        # In a whole-site scan only files with broken links are worth listing
+        if args.files or result['broken'] > 0:
+            print(f"\nFile: {filepath.name}")
+            print("-" * 70)
+            print(f"  Total URLs: {result['total_urls']}")
+            print(f"  Valid: {result['valid']}")
+            print(f"  Broken: {result['broken']}")
 
         if result['broken'] > 0:
             print("\n  Broken links:")
@@ -124,11 +632,15 @@ def main():
     print("\n" + "=" * 70)
     print("Summary")
     print("=" * 70)
-    print(f"Total URLs checked: {total_valid + total_broken}")
-    print(f"Valid: {total_valid}")
-    print(f"Broken: {total_broken}")
+    print(f"Files scanned: {summary['files']}")
+    print(f"Citations checked: {summary['citations']}")
+    print(f"Unique URLs: {summary['unique_urls']} ({summary['cached']} from cache)")
+    print(f"Valid: {summary['valid']}")
+    print(f"Broken: {summary['broken']}")
+    for host in summary['slowest_hosts'][:3]:
+        print(f"  Slow host: {host['host']} ({host['urls']} URLs, {host['latency_ms'] / 1000:.1f}s)")
 
-    if total_broken > 0:
+    if summary['broken'] > 0:
         print("\n⚠️  Some citations are broken. Fix before publishing.")
         return 1
     else: